@@ -0,0 +1,56 @@
+import heapq
+from Components import PositionComponent
+from Entities import Entity
+from Transforms import TransformStorage
+
+
+class BulletPool:
+
+    def __init__(self, transform_storage: TransformStorage):
+        self.__transform_storage = transform_storage
+        self.__free_bullets: list[Entity] = []
+        self.__live_bullets: dict[int, Entity] = {}
+        self.__expiry_queue: list[(float, int, Entity)] = []
+        self.__elapsed_time = 0.0
+
+    def get_live_number(self) -> int:
+        return len(self.__live_bullets)
+
+    def get_pooled_number(self) -> int:
+        return len(self.__free_bullets)
+
+    def acquire(self) -> Entity | None:
+        if not self.__free_bullets:
+            return None
+        bullet = self.__free_bullets.pop()
+        bullet.revive()
+        return bullet
+
+    def track(self, bullet: Entity, lifetime: float):
+        bullet_id = bullet.get_id()
+        self.__live_bullets[bullet_id] = bullet
+        heapq.heappush(self.__expiry_queue, (self.__elapsed_time + lifetime, bullet_id, bullet))
+
+    def release(self, bullet: Entity):
+        if self.__live_bullets.pop(bullet.get_id(), None) is None:
+            return
+        position_component = bullet.get_component(PositionComponent)
+        self.__transform_storage.release(position_component.get_slot())
+        if bullet.is_alive():
+            bullet.destroy()
+        self.__free_bullets.append(bullet)
+
+    def release_all(self):
+        for bullet in list(self.__live_bullets.values()):
+            self.release(bullet)
+        self.__expiry_queue.clear()
+
+    def update(self, scaled_time: float) -> list[Entity]:
+        self.__elapsed_time += scaled_time
+        expired_bullets = []
+        expiry_queue = self.__expiry_queue
+        while expiry_queue and expiry_queue[0][0] <= self.__elapsed_time:
+            expiry_time, bullet_id, bullet = heapq.heappop(expiry_queue)
+            if bullet_id in self.__live_bullets and bullet.get_id() == bullet_id:
+                expired_bullets.append(bullet)
+        return expired_bullets
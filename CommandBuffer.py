@@ -0,0 +1,72 @@
+from typing import Iterator, Callable
+from Entities import Entity
+
+
+class EntityCollection:
+
+    def __init__(self):
+        self.__entities: list[Entity] = []
+        self.__indices: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.__entities)
+
+    def __iter__(self) -> Iterator[Entity]:
+        return iter(self.__entities)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity.get_id() in self.__indices
+
+    def append(self, entity: Entity):
+        entity_id = entity.get_id()
+        if entity_id in self.__indices:
+            return
+        self.__indices[entity_id] = len(self.__entities)
+        self.__entities.append(entity)
+
+    def remove(self, entity: Entity):
+        index = self.__indices.pop(entity.get_id(), None)
+        if index is None:
+            return
+        last_entity = self.__entities.pop()
+        if index < len(self.__entities):
+            self.__entities[index] = last_entity
+            self.__indices[last_entity.get_id()] = index
+
+    def clear(self):
+        self.__entities.clear()
+        self.__indices.clear()
+
+
+class EntityCommandBuffer:
+
+    def __init__(self):
+        self.__spawns: list[(Entity, tuple[EntityCollection, ...])] = []
+        self.__despawns: dict[int, (Entity, tuple[EntityCollection, ...], Callable[[Entity], None] | None)] = {}
+
+    def get_commands_number(self) -> int:
+        return len(self.__spawns) + len(self.__despawns)
+
+    def spawn(self, entity: Entity, *collections: EntityCollection):
+        self.__spawns.append((entity, collections))
+
+    def despawn(self, entity: Entity, *collections: EntityCollection, release: Callable[[Entity], None] | None = Entity.destroy):
+        self.__despawns[entity.get_id()] = (entity, collections, release)
+
+    def apply(self):
+        for entity, collections in self.__spawns:
+            for collection in collections:
+                collection.append(entity)
+        for entity, collections, release in self.__despawns.values():
+            for collection in collections:
+                collection.remove(entity)
+            if release:
+                release(entity)
+        self.__spawns.clear()
+        self.__despawns.clear()
+
+    def discard(self):
+        for entity, collections in self.__spawns:
+            entity.destroy()
+        self.__spawns.clear()
+        self.__despawns.clear()
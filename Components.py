@@ -1,36 +1,80 @@
 import pygame
-import os
-import re
 from abc import ABC
 from Actions import Action
 from Weapons import Handgun, Shotgun, Rifle
+from Sprites import SpriteLoader
 
 
 class Component(ABC):
-    pass
+    __slots__ = ()
+
+    def get_component_type(self) -> type:
+        return self.__class__
+
+
+class EntityTypeFlags:
+    PLAYER = 1 << 0
+    CHARACTER = 1 << 1
+    BULLET = 1 << 2
+    WALL = 1 << 3
+    ENEMY = 1 << 4
+    INTERACTIVE_OBJECT = 1 << 5
+
+    @staticmethod
+    def get_collision_mask(type_flags: int) -> int:
+        collision_mask = 0
+        if type_flags & EntityTypeFlags.WALL:
+            collision_mask |= EntityTypeFlags.CHARACTER | EntityTypeFlags.BULLET
+        if type_flags & EntityTypeFlags.CHARACTER:
+            collision_mask |= EntityTypeFlags.CHARACTER | EntityTypeFlags.BULLET | EntityTypeFlags.WALL
+        if type_flags & EntityTypeFlags.BULLET:
+            collision_mask |= EntityTypeFlags.CHARACTER | EntityTypeFlags.WALL
+        if type_flags & EntityTypeFlags.PLAYER:
+            collision_mask |= EntityTypeFlags.INTERACTIVE_OBJECT
+        if type_flags & EntityTypeFlags.INTERACTIVE_OBJECT:
+            collision_mask |= EntityTypeFlags.PLAYER
+        return collision_mask
 
 
 class TypeComponent(Component):
+    __slots__ = ('__type_flags',)
 
     def __init__(self, is_player: bool, is_character: bool, is_bullet: bool, is_wall: bool, is_enemy: bool, is_interactive_object: bool = False):
-        self.__is_player = is_player
-        self.__is_character = is_character
-        self.__is_bullet = is_bullet
-        self.__is_wall = is_wall
-        self.__is_enemy = is_enemy
-        self.__is_interactive_object = is_interactive_object
+        type_flags = 0
+        if is_player:
+            type_flags |= EntityTypeFlags.PLAYER
+        if is_character:
+            type_flags |= EntityTypeFlags.CHARACTER
+        if is_bullet:
+            type_flags |= EntityTypeFlags.BULLET
+        if is_wall:
+            type_flags |= EntityTypeFlags.WALL
+        if is_enemy:
+            type_flags |= EntityTypeFlags.ENEMY
+        if is_interactive_object:
+            type_flags |= EntityTypeFlags.INTERACTIVE_OBJECT
+        self.__type_flags = type_flags
+
+    def get_type_flags(self) -> int:
+        return self.__type_flags
+
+    def has_type(self, type_mask: int) -> bool:
+        return self.__type_flags & type_mask != 0
 
     def check_interactive_condition(self):
-        return self.__is_interactive_object
+        return self.__type_flags & EntityTypeFlags.INTERACTIVE_OBJECT != 0
 
     def get_type(self) -> (bool, bool, bool):
-        return self.__is_character, self.__is_bullet, self.__is_wall
+        type_flags = self.__type_flags
+        return type_flags & EntityTypeFlags.CHARACTER != 0, type_flags & EntityTypeFlags.BULLET != 0, type_flags & EntityTypeFlags.WALL != 0
 
     def get_character_type(self) -> (bool, bool):
-        return self.__is_player, self.__is_enemy
+        type_flags = self.__type_flags
+        return type_flags & EntityTypeFlags.PLAYER != 0, type_flags & EntityTypeFlags.ENEMY != 0
 
 
 class MovingDistanceComponent(Component):
+    __slots__ = ('__moving_distance',)
 
     def __init__(self, distance: int):
         self.__moving_distance = distance
@@ -38,8 +82,12 @@ class MovingDistanceComponent(Component):
     def get_moving_distance(self) -> int:
         return self.__moving_distance
 
+    def set_moving_distance(self, distance: int):
+        self.__moving_distance = distance
+
 
 class PositionComponent(Component):
+    __slots__ = ('__x_position', '__y_position')
 
     def __init__(self, x_coordinate: float, y_coordinate: float):
         self.__x_position = x_coordinate
@@ -54,6 +102,7 @@ class PositionComponent(Component):
 
 
 class HealthComponent(Component):
+    __slots__ = ('__health', '__max_health', '__is_alive')
 
     def __init__(self, health: int):
         self.__health = health
@@ -84,6 +133,7 @@ class HealthComponent(Component):
 
 
 class DamageComponent(Component):
+    __slots__ = ('__damage',)
 
     def __init__(self, damage: int):
         self.__damage = damage
@@ -91,30 +141,25 @@ class DamageComponent(Component):
     def get_damage(self) -> int:
         return self.__damage
 
+    def set_damage(self, damage: int):
+        self.__damage = damage
+
 
 class AnimationComponent(Component):
+    __slots__ = ('__is_move_right', '__is_animating', '__frame_duration', '__time_accumulator', '__moving_right',
+                 '__moving_left', '__current_image_index', '__image_height', '__image_width', '__is_move_left')
 
-    def __init__(self, right_moving_folder_path: str, left_moving_folder_path: str):
+    def __init__(self, moving_right_frames: tuple[pygame.Surface, ...], moving_left_frames: tuple[pygame.Surface, ...]):
         self.__is_move_right = True
         self.__is_animating = False
         self.__frame_duration = 0.100
         self.__time_accumulator = 0.0
-        self.__moving_right = []
-        self.__moving_left = []
+        self.__moving_right = moving_right_frames
+        self.__moving_left = moving_left_frames
         self.__current_image_index = 0
-
-        self.__load_images(self.__moving_right, right_moving_folder_path)
-        self.__load_images(self.__moving_left, left_moving_folder_path)
         self.__image_height = self.__moving_right[0].get_height()
         self.__image_width = self.__moving_right[0].get_width()
 
-    def __load_images(self, lst: list, path: str):
-        for file_name in os.listdir(path):
-            file_path = os.path.join(path, file_name)
-            if os.path.isfile(file_path) and file_name.lower().endswith('.png'):
-                image = pygame.image.load(file_path).convert_alpha()
-                lst.append(image)
-
     def increase_image_index(self):
         current_image_index = self.__current_image_index
         new_image_index = (current_image_index + 1) % len(self.__moving_left)
@@ -161,15 +206,20 @@ class AnimationComponent(Component):
 
 
 class BulletImageComponent(Component):
+    __slots__ = ('__image',)
 
     def __init__(self, bullet_image_path: str, angel: float):
-        self.__image = pygame.transform.rotate(pygame.image.load(bullet_image_path).convert_alpha(), angel)
+        self.set_image(bullet_image_path, angel)
 
     def get_image(self) -> pygame.image:
         return self.__image
 
+    def set_image(self, bullet_image_path: str, angel: float):
+        self.__image = pygame.transform.rotate(SpriteLoader.load_image(bullet_image_path), angel)
+
 
 class BulletDirectionComponent(Component):
+    __slots__ = ('__x_direction', '__y_direction')
 
     def __init__(self, x_coord: float, y_coord: float):
         self.__x_direction = x_coord
@@ -178,8 +228,13 @@ class BulletDirectionComponent(Component):
     def get_direction(self) -> (float, float):
         return self.__x_direction, self.__y_direction
 
+    def set_direction(self, x_coord: float, y_coord: float):
+        self.__x_direction = x_coord
+        self.__y_direction = y_coord
+
 
 class SightComponent(Component):
+    __slots__ = ('__right', '__left')
 
     def __init__(self):
         self.__right = True
@@ -194,6 +249,7 @@ class SightComponent(Component):
 
 
 class WeaponComponent(Component):
+    __slots__ = ('__handgun', '__riffle', '__shotgun', '__weapon', '__parent', '__muzzle_offset')
 
     def __init__(self, weapons_list: list[bool]):
         self.__handgun, self.__riffle, self.__shotgun = weapons_list
@@ -203,6 +259,14 @@ class WeaponComponent(Component):
             self.__weapon = Rifle()
         elif self.__shotgun:
             self.__weapon = Shotgun()
+        self.__parent = None
+        self.__muzzle_offset = None
+
+    def attach_to(self, parent: PositionComponent):
+        parent_x, parent_y = parent.get_position()
+        muzzle_x, muzzle_y = self.__weapon.get_weapon_muzzle_coord()
+        self.__muzzle_offset = (muzzle_x - parent_x, muzzle_y - parent_y)
+        self.__parent = parent
 
     def get_damage(self) -> int:
         return self.__weapon.get_damage()
@@ -217,13 +281,23 @@ class WeaponComponent(Component):
         return self.__weapon.get_image(left, right)
 
     def get_weapon_muzzle_coord(self) -> (float, float):
+        if self.__parent:
+            parent_x, parent_y = self.__parent.get_position()
+            return parent_x + self.__muzzle_offset[0], parent_y + self.__muzzle_offset[1]
         return self.__weapon.get_weapon_muzzle_coord()
 
     def set_weapon_muzzle_coord(self, x_coord: float, y_coord: float):
-        self.__weapon.set_weapon_muzzle_coord(x_coord, y_coord)
+        if self.__parent:
+            parent_x, parent_y = self.__parent.get_position()
+            self.__muzzle_offset = (x_coord - parent_x, y_coord - parent_y)
+        else:
+            self.__weapon.set_weapon_muzzle_coord(x_coord, y_coord)
 
     def update_weapon_muzzle_coord(self, delta_x: float, delta_y: float):
-        self.__weapon.update_weapon_muzzle_coord(delta_x, delta_y)
+        if self.__parent:
+            self.__muzzle_offset = (self.__muzzle_offset[0] + delta_x, self.__muzzle_offset[1] + delta_y)
+        else:
+            self.__weapon.update_weapon_muzzle_coord(delta_x, delta_y)
 
     def get_angle(self) -> float:
         return self.__weapon.get_angle()
@@ -270,9 +344,21 @@ class WeaponComponent(Component):
     def switch_reload_condition(self):
         self.__weapon.switch_reload_condition()
 
+    def get_reload_time_accumulator(self) -> float:
+        return self.__weapon.get_reload_time_accumulator()
+
+    def set_reload_time_accumulator(self, time: float):
+        self.__weapon.set_reload_time_accumulator(time)
+
     def get_multiple_bullet_condition(self) -> bool:
         return self.__weapon.get_multiple_bullet_condition()
 
+    def get_bullet_lifetime(self) -> float:
+        return self.__weapon.get_bullet_lifetime()
+
+    def get_bullet_range(self) -> int:
+        return self.__weapon.get_bullet_range()
+
     def set_handgun_active(self):
         self.__handgun = True
         self.__riffle = False
@@ -296,6 +382,8 @@ class WeaponComponent(Component):
 
 
 class HitBoxComponent(Component):
+    __slots__ = ('__top_left', '__top_right', '__bottom_left', '__bottom_right', '__is_rotated', '__parent',
+                 '__offsets', '__resolved_position')
 
     def __init__(self, top_left: [float, float], top_right: [float, float], bottom_left: [float, float], bottom_right: [float, float], is_rotated: bool = False):
         self.__top_left = top_left
@@ -303,17 +391,44 @@ class HitBoxComponent(Component):
         self.__bottom_left = bottom_left
         self.__bottom_right = bottom_right
         self.__is_rotated = is_rotated
+        self.__parent = None
+        self.__offsets = None
+        self.__resolved_position = None
+
+    def attach_to(self, parent: PositionComponent):
+        parent_x, parent_y = parent.get_position()
+        corners = [self.__top_left, self.__top_right, self.__bottom_right, self.__bottom_left]
+        self.__offsets = [(corner_x - parent_x, corner_y - parent_y) for corner_x, corner_y in corners]
+        self.__parent = parent
+        self.__resolved_position = (parent_x, parent_y)
+
+    def resolve_coordinates(self):
+        if self.__parent:
+            parent_position = self.__parent.get_position()
+            if parent_position != self.__resolved_position:
+                parent_x, parent_y = parent_position
+                corners = [self.__top_left, self.__top_right, self.__bottom_right, self.__bottom_left]
+                for corner, (offset_x, offset_y) in zip(corners, self.__offsets):
+                    corner[0] = parent_x + offset_x
+                    corner[1] = parent_y + offset_y
+                self.__resolved_position = parent_position
 
     def get_rotation_condition(self) -> bool:
         return self.__is_rotated
 
     def get_hit_box(self) -> list[(float, float)]:
+        self.resolve_coordinates()
         return [self.__top_left, self.__top_right, self.__bottom_right, self.__bottom_left]
 
     def get_top_left(self) -> (float, float):
+        self.resolve_coordinates()
         return self.__top_left
 
     def update_coordinates(self, delta_x: float, delta_y: float):
+        if self.__parent:
+            self.__offsets = [(offset_x + delta_x, offset_y + delta_y) for offset_x, offset_y in self.__offsets]
+            self.__resolved_position = None
+            return
         self.__top_right[0] += delta_x
         self.__top_right[1] += delta_y
         self.__top_left[0] += delta_x
@@ -325,18 +440,48 @@ class HitBoxComponent(Component):
 
 
 class ActiveHandComponent(Component):
+    __slots__ = ('__right_active_hand_coord', '__left_active_hand_coord', '__parent', '__right_hand_offset',
+                 '__left_hand_offset', '__resolved_position')
 
     def __init__(self, left_hand: list[int, int], right_hand: list[int, int]):
         self.__right_active_hand_coord = right_hand
         self.__left_active_hand_coord = left_hand
+        self.__parent = None
+        self.__right_hand_offset = None
+        self.__left_hand_offset = None
+        self.__resolved_position = None
+
+    def attach_to(self, parent: PositionComponent):
+        parent_x, parent_y = parent.get_position()
+        self.__right_hand_offset = (self.__right_active_hand_coord[0] - parent_x, self.__right_active_hand_coord[1] - parent_y)
+        self.__left_hand_offset = (self.__left_active_hand_coord[0] - parent_x, self.__left_active_hand_coord[1] - parent_y)
+        self.__parent = parent
+        self.__resolved_position = (parent_x, parent_y)
+
+    def __resolve_coordinates(self):
+        if self.__parent:
+            parent_position = self.__parent.get_position()
+            if parent_position != self.__resolved_position:
+                parent_x, parent_y = parent_position
+                self.__right_active_hand_coord[0] = parent_x + self.__right_hand_offset[0]
+                self.__right_active_hand_coord[1] = parent_y + self.__right_hand_offset[1]
+                self.__left_active_hand_coord[0] = parent_x + self.__left_hand_offset[0]
+                self.__left_active_hand_coord[1] = parent_y + self.__left_hand_offset[1]
+                self.__resolved_position = parent_position
 
     def get_hand_coordinate(self, left: bool, right: bool) -> [float, float]:
+        self.__resolve_coordinates()
         if right:
             return self.__right_active_hand_coord
         elif left:
             return self.__left_active_hand_coord
 
     def update_coordinates(self, delta_x: float, delta_y: float):
+        if self.__parent:
+            self.__right_hand_offset = (self.__right_hand_offset[0] + delta_x, self.__right_hand_offset[1] + delta_y)
+            self.__left_hand_offset = (self.__left_hand_offset[0] + delta_x, self.__left_hand_offset[1] + delta_y)
+            self.__resolved_position = None
+            return
         self.__right_active_hand_coord[0] += delta_x
         self.__right_active_hand_coord[1] += delta_y
         self.__left_active_hand_coord[0] += delta_x
@@ -344,6 +489,7 @@ class ActiveHandComponent(Component):
 
 
 class CollisionComponent(Component):
+    __slots__ = ('__is_collided',)
 
     def __init__(self):
         self.__is_collided = False
@@ -354,8 +500,12 @@ class CollisionComponent(Component):
     def switch_collision_condition(self):
         self.__is_collided = not self.__is_collided
 
+    def set_collision_condition(self, condition: bool):
+        self.__is_collided = condition
+
 
 class BulletStatusComponent(Component):
+    __slots__ = ('__is_exists',)
 
     def __init__(self):
         self.__is_exists = True
@@ -366,29 +516,30 @@ class BulletStatusComponent(Component):
     def switch_bullet_status(self):
         self.__is_exists = not self.__is_exists
 
+    def set_bullet_status(self, condition: bool):
+        self.__is_exists = condition
+
 
 class BackgroundImageComponent(Component):
+    __slots__ = ('__image',)
 
     def __init__(self, path: str):
-        self.__image = pygame.image.load(path).convert_alpha()
+        self.__image = SpriteLoader.load_image(path)
 
     def get_image(self) -> pygame.image:
         return self.__image
 
 
 class EnemyConditionComponent(Component):
+    __slots__ = ('__is_angry', '__patrol_points', '__current_point', '__is_melee', '__anger_range', '__alert_range')
 
-    def __init__(self, patrol_points: list[(int, int)], is_melee: bool):
+    def __init__(self, patrol_points: list[(int, int)], is_melee: bool, anger_range: int, alert_range: int):
         self.__is_angry = False
         self.__patrol_points = patrol_points
         self.__current_point = 0
         self.__is_melee = is_melee
-        if is_melee:
-            self.__anger_range = 450
-            self.__alert_range = 150
-        else:
-            self.__anger_range = 400
-            self.__alert_range = 300
+        self.__anger_range = anger_range
+        self.__alert_range = alert_range
 
     def get_status(self) -> bool:
         return self.__is_angry
@@ -399,6 +550,9 @@ class EnemyConditionComponent(Component):
     def get_patrol_point(self) -> (int, int):
         return self.__patrol_points[self.__current_point]
 
+    def get_patrol_points(self) -> list[(int, int)]:
+        return self.__patrol_points
+
     def switch_to_next_point(self):
         current_point = self.__current_point
         next_point = (current_point + 1) % len(self.__patrol_points)
@@ -415,6 +569,7 @@ class EnemyConditionComponent(Component):
 
 
 class OwnDamageComponent(Component):
+    __slots__ = ('__owm_damage', '__is_exploded')
 
     def __init__(self):
         self.__owm_damage = 25
@@ -431,6 +586,7 @@ class OwnDamageComponent(Component):
 
 
 class BelongingComponent(Component):
+    __slots__ = ('__belong_to_player', '__belong_to_enemy')
 
     def __init__(self, belong_to_player: bool, belong_to_enemy: bool):
         self.__belong_to_player = belong_to_player
@@ -439,8 +595,13 @@ class BelongingComponent(Component):
     def get_belonging(self) -> (bool, bool):
         return self.__belong_to_player, self.__belong_to_enemy
 
+    def set_belonging(self, belong_to_player: bool, belong_to_enemy: bool):
+        self.__belong_to_player = belong_to_player
+        self.__belong_to_enemy = belong_to_enemy
+
 
 class EnemyActionQueueComponent(Component):
+    __slots__ = ('__queue_in', '__queue_out')
 
     def __init__(self):
         self.__queue_in = []
@@ -465,6 +626,7 @@ class EnemyActionQueueComponent(Component):
 
 
 class MenuEntityTypeComponent(Component):
+    __slots__ = ('__is_background', '__is_button')
 
     def __init__(self, is_background: bool, is_button: bool):
         self.__is_background = is_background
@@ -475,6 +637,7 @@ class MenuEntityTypeComponent(Component):
 
 
 class SingleImageComponent(Component):
+    __slots__ = ('__image',)
 
     def __init__(self, path: str, size: (int, int) = None):
         if not size:
@@ -487,28 +650,13 @@ class SingleImageComponent(Component):
 
 
 class SingeAnimationComponent(Component):
+    __slots__ = ('__images', '__animation_duration', '__time_accumulator', '__image_index')
 
-    def __init__(self, path: str, needed_size: (int, int) = None):
-        self.__images = []
+    def __init__(self, frames: tuple[pygame.Surface, ...]):
+        self.__images = frames
         self.__animation_duration = 0.030
         self.__time_accumulator = 0.0
         self.__image_index = 0
-        self.__load_images(path, needed_size)
-
-    def __load_images(self, path: str, needed_size: (int, int)):
-
-        def natural_sort_key(s, _nsre=re.compile('([0-9]+)')):
-            return [int(text) if text.isdigit() else text.lower() for text in re.split(_nsre, s)]
-
-        image_files = [file for file in os.listdir(path) if file.endswith('.png')]
-        image_files.sort(key=natural_sort_key)
-        for image_path in image_files:
-            final_path = f'{path}/{image_path}'
-            if needed_size:
-                image = pygame.transform.scale(pygame.image.load(final_path).convert_alpha(), needed_size)
-            else:
-                image = pygame.image.load(final_path).convert_alpha()
-            self.__images.append(image)
 
     def get_image(self) -> pygame.image:
         return self.__images[self.__image_index]
@@ -527,6 +675,7 @@ class SingeAnimationComponent(Component):
 
 
 class ActionComponent(Component):
+    __slots__ = ('__actions', '__is_ready')
 
     def __init__(self, actions: list, is_ready: bool = True):
         self.__actions = actions
@@ -544,6 +693,7 @@ class ActionComponent(Component):
 
 
 class AnimationConditionComponent(Component):
+    __slots__ = ('__has_animation',)
 
     def __init__(self, has_animation: bool):
         self.__has_animation = has_animation
@@ -553,6 +703,7 @@ class AnimationConditionComponent(Component):
 
 
 class MoneyCollectionComponent(Component):
+    __slots__ = ('__amount_of_money',)
 
     def __init__(self, money: int = 0):
         self.__amount_of_money = money
@@ -565,6 +716,7 @@ class MoneyCollectionComponent(Component):
 
 
 class ExistenceConditionComponent(Component):
+    __slots__ = ('__disappear_after_interation',)
 
     def __init__(self, disappear_after_interation: bool = False):
         self.__disappear_after_interation = disappear_after_interation
@@ -1,7 +1,10 @@
-from random import randint
+import numpy
+from random import Random
 from Entities import Entity
-from Components import PositionComponent, BackgroundImageComponent, HitBoxComponent, TypeComponent, CollisionComponent
+from Prefabs import PrefabLibrary
 from WorldInfo import WorldInfo
+from WorldStreaming import SleepingEnemy
+from Tracing import Tracer
 
 class Room:
 
@@ -19,9 +22,97 @@ class Room:
         return self.__center
 
 
+class DungeonLayout:
+
+    def __init__(self, world_map: numpy.ndarray, rooms: list[Room], wall_rectangles: list[(int, int, int, int)]):
+        self.__world_map = world_map
+        self.__rooms = rooms
+        self.__wall_rectangles = wall_rectangles
+
+    def get_world_map(self) -> numpy.ndarray:
+        return self.__world_map
+
+    def get_rooms(self) -> list[Room]:
+        return self.__rooms
+
+    def get_wall_rectangles(self) -> list[(int, int, int, int)]:
+        return self.__wall_rectangles
+
+    def get_player_spawn_position(self) -> (float, float):
+        block_size = WorldInfo.get_block_size()
+        player_room_center_x, player_room_center_y = self.__rooms[0].get_room_center()
+        return player_room_center_x * block_size, player_room_center_y * block_size
+
+
+class EnemyPlacement:
+
+    def __init__(self, random_generator: Random):
+        self.__random_generator = random_generator
+
+    def choose_weapons(self) -> list[bool]:
+        weapon = self.__random_generator.randint(1, 10)
+        if weapon in range(1, 8):
+            handgun, rifle, shotgun = True, False, False
+        elif weapon in range(8, 10):
+            handgun, rifle, shotgun = False, True, False
+        else:
+            handgun, rifle, shotgun = False, False, True
+        return [handgun, rifle, shotgun]
+
+    def __calculate_patrol_points(self, first_point_x: int, first_point_y: int, room_start_x: int, room_start_y: int, room_width: int, room_height: int, enemy_width: int, enemy_height: int, patrol_points: list[(int, int)]):
+        half_room_width = room_width // 2
+        half_room_height = room_height // 2
+        first_quarter = ((room_start_x, room_start_x + half_room_width), (room_start_y, room_start_y + half_room_height))
+        second_quarter = ((room_start_x + half_room_width, room_start_x + room_width), (room_start_y, room_start_y + half_room_height))
+        third_quarter = ((room_start_x, room_start_x + half_room_width), (room_start_y + half_room_height, room_start_y + room_height))
+        fourth_quarter = ((room_start_x + half_room_width, room_start_x + room_width), (room_start_y + half_room_height, room_start_y + room_height))
+        quarters = [first_quarter, second_quarter, third_quarter, fourth_quarter]
+        for quarter in quarters:
+            if (quarter[0][0] <= first_point_x <= quarter[0][1]) and (quarter[1][0] <= first_point_y <= quarter[1][1]):
+                quarters.remove(quarter)
+                break
+        for chosen_quarter in quarters:
+            if not ((chosen_quarter[0][0] + enemy_width >= chosen_quarter[0][1] - enemy_width) or (chosen_quarter[1][0] + enemy_height >= chosen_quarter[1][1] - enemy_height)):
+                point_x = self.__random_generator.randint(chosen_quarter[0][0] + enemy_width, chosen_quarter[0][1] - enemy_width)
+                point_y = self.__random_generator.randint(chosen_quarter[1][0] + enemy_height, chosen_quarter[1][1] - enemy_height)
+                patrol_points.append((point_x, point_y))
+                quarters.remove(chosen_quarter)
+
+    def __place_room_enemies(self, room: Room, block_size: int, sleeping_enemies: list[SleepingEnemy]):
+        room_start_x, room_start_y, room_width, room_height = room.get_room_info()
+        real_room_start_x = room_start_x * block_size
+        real_room_start_y = room_start_y * block_size
+        real_room_width = room_width * block_size
+        real_room_height = room_height * block_size
+        room_square = real_room_height * real_room_width
+        enemies_per_room_ratio = 150000
+        possible_enemies_number = room_square // enemies_per_room_ratio
+        for i in range(possible_enemies_number):
+            melee_enemy_condition = self.__random_generator.choice([True, False])
+            if melee_enemy_condition:
+                enemy_width, enemy_height = PrefabLibrary.get_melee_enemy().get_size()
+            else:
+                enemy_width, enemy_height = PrefabLibrary.get_ranged_enemy().get_size()
+            enemy_center_x = self.__random_generator.randint(real_room_start_x + enemy_width, real_room_start_x + real_room_width - enemy_width)
+            enemy_center_y = self.__random_generator.randint(real_room_start_y + enemy_height, real_room_start_y + real_room_height - enemy_height)
+            patrol_points = [[enemy_center_x, enemy_center_y]]
+            self.__calculate_patrol_points(enemy_center_x, enemy_center_y, real_room_start_x,
+                    real_room_start_y, real_room_width, real_room_height, enemy_width, enemy_height, patrol_points)
+            weapons_list = None if melee_enemy_condition else self.choose_weapons()
+            sleeping_enemies.append(SleepingEnemy(enemy_center_x, enemy_center_y, patrol_points, melee_enemy_condition, weapons_list))
+
+    def place_enemies(self, rooms: list[Room]) -> list[SleepingEnemy]:
+        block_size = WorldInfo.get_block_size()
+        sleeping_enemies = []
+        for room in rooms[1:]:
+            self.__place_room_enemies(room, block_size, sleeping_enemies)
+        return sleeping_enemies
+
+
 class BinaryTree:
 
-    def __init__(self, start_x: int, start_y: int, width: float, height: float):
+    def __init__(self, start_x: int, start_y: int, width: float, height: float, random_generator: Random):
+        self.__random_generator = random_generator
         self.__start_x = start_x
         self.__start_y = start_y
         self.__width = width
@@ -33,7 +124,7 @@ class BinaryTree:
         self.__is_separated = False
 
     def __separate_vertically(self, minimal_room_size: int) -> bool:
-        partition_size = randint(3, 7)
+        partition_size = self.__random_generator.randint(3, 7)
         first_part_start_x = self.__start_x
         first_part_start_y = self.__start_y
         first_part_width = self.__width * partition_size // 10
@@ -44,12 +135,12 @@ class BinaryTree:
         second_part_height = self.__height
         if first_part_height <= minimal_room_size or first_part_width <= minimal_room_size or second_part_width <= minimal_room_size or second_part_height <= minimal_room_size:
             return False
-        self.__first_part = BinaryTree(first_part_start_x, first_part_start_y, first_part_width, first_part_height)
-        self.__second_part = BinaryTree(second_part_start_x, second_part_start_y, second_part_width, second_part_height)
+        self.__first_part = BinaryTree(first_part_start_x, first_part_start_y, first_part_width, first_part_height, self.__random_generator)
+        self.__second_part = BinaryTree(second_part_start_x, second_part_start_y, second_part_width, second_part_height, self.__random_generator)
         return True
 
     def __separate_horizontally(self, minimal_room_size: int) -> bool:
-        partition_size = randint(3, 7)
+        partition_size = self.__random_generator.randint(3, 7)
         first_part_start_x = self.__start_x
         first_part_start_y = self.__start_y
         first_part_width = self.__width
@@ -60,13 +151,13 @@ class BinaryTree:
         second_part_height = self.__height - first_part_height
         if first_part_height <= minimal_room_size or first_part_width <= minimal_room_size or second_part_width <= minimal_room_size or second_part_height <= minimal_room_size:
             return False
-        self.__first_part = BinaryTree(first_part_start_x, first_part_start_y, first_part_width, first_part_height)
-        self.__second_part = BinaryTree(second_part_start_x, second_part_start_y, second_part_width, second_part_height)
+        self.__first_part = BinaryTree(first_part_start_x, first_part_start_y, first_part_width, first_part_height, self.__random_generator)
+        self.__second_part = BinaryTree(second_part_start_x, second_part_start_y, second_part_width, second_part_height, self.__random_generator)
         return True
 
     def __separate(self, minimal_room_size: int):
         if not self.__is_separated:
-            vertical_separation = randint(0, 1)
+            vertical_separation = self.__random_generator.randint(0, 1)
             if vertical_separation == 1:
                 if self.__separate_vertically(minimal_room_size):
                     self.__is_separated = True
@@ -86,49 +177,40 @@ class BinaryTree:
         self.__first_part.__separate(minimal_room_size)
         self.__second_part.__separate(minimal_room_size)
 
-    def __create_room_on_world_map(self, x: int, y: int, width: int, height: int, world_map: list[list[int]]) -> (int, int):
-        room_x = x + randint(2, width // 4)
-        room_y = y + randint(2, height // 4)
+    def __create_room_on_world_map(self, x: int, y: int, width: int, height: int, world_map: numpy.ndarray) -> (int, int):
+        room_x = x + self.__random_generator.randint(2, width // 4)
+        room_y = y + self.__random_generator.randint(2, height // 4)
         room_width = width - (room_x - x)
-        room_width = room_width - randint(2, room_width // 4)
+        room_width = room_width - self.__random_generator.randint(2, room_width // 4)
         room_height = height - (room_y - y)
-        room_height = room_height - randint(2, room_height // 4)
+        room_height = room_height - self.__random_generator.randint(2, room_height // 4)
         room_center = (room_x + room_width/2, room_y + room_height/2)
-        for h in range(room_height):
-            for w in range(room_width):
-                current_x = room_x + w
-                current_y = room_y + h
-                world_map[current_y][current_x] = 2
+        world_map[room_y:room_y + room_height, room_x:room_x + room_width] = 2
         room = Room(room_x, room_y, room_width, room_height, room_center)
         self.__room = room
 
-    def __create_corridor_on_world_map(self, first_center: (int, int), second_center: (int, int), world_map: list[list[int]]):
+    def __create_corridor_on_world_map(self, first_center: (int, int), second_center: (int, int), world_map: numpy.ndarray):
         corridor_width = 5
         one_side_corridor_width = corridor_width // 2
         start_x, start_y = first_center
         delta_x = second_center[0] - first_center[0]
         delta_y = second_center[1] - first_center[1]
+        corridor_start_x = start_x - one_side_corridor_width
+        corridor_start_y = start_y - one_side_corridor_width
         if delta_x != 0:
-            for w in range(corridor_width):
-                for l in range(delta_x):
-                    current_x = start_x + l
-                    current_y = start_y + w - one_side_corridor_width
-                    world_map[current_y][current_x] = 2
-        elif delta_y != 0:
-            for l in range(delta_y):
-                for w in range(corridor_width):
-                    current_x = start_x + w - one_side_corridor_width
-                    current_y = start_y + l
-                    world_map[current_y][current_x] = 2
-
-    def __create_rooms(self, world_map: list[list[int]]):
+            if delta_x > 0:
+                world_map[corridor_start_y:corridor_start_y + corridor_width, start_x:start_x + delta_x] = 2
+        elif delta_y > 0:
+            world_map[start_y:start_y + delta_y, corridor_start_x:corridor_start_x + corridor_width] = 2
+
+    def __create_rooms(self, world_map: numpy.ndarray):
         if not self.__is_separated:
             self.__create_room_on_world_map(self.__start_x, self.__start_y, self.__width, self.__height, world_map)
         else:
             self.__first_part.__create_rooms(world_map)
             self.__second_part.__create_rooms(world_map)
 
-    def __create_corridors(self, world_map: list[list[int]]) -> (int, int):
+    def __create_corridors(self, world_map: numpy.ndarray) -> (int, int):
         if not self.__is_separated:
             return self.__center
         else:
@@ -137,103 +219,63 @@ class BinaryTree:
             self.__create_corridor_on_world_map(first_center, second_center, world_map)
             return self.__center
 
-    def __create_walls(self, world_map: list[list[int]]):
-        world_map_height = len(world_map)
-        world_map_width = len(world_map[0])
-        for y in range(1, world_map_height-1):
-            for x in range(1, world_map_width-1):
-                if (world_map[y + 1][x + 1] == 2 or world_map[y + 1][x] == 2 or world_map[y + 1][x] == 2 or
-                        world_map[y][x + 1] == 2 or world_map[y][x - 1] == 2 or world_map[y - 1][x + 1] == 2 or
-                    world_map[y - 1][x] == 2 or world_map[y - 1][x - 1] == 2 or world_map[y + 1][x - 1] == 2) and world_map[y][x] == 0:
-                    world_map[y][x] = 1
-
-    def __calculate_coordinates(self, x: int, y: int) -> list[(int, int)]:
-        block_size = WorldInfo.get_block_size()
-        half_of_block_size = block_size // 2
-        current_center_x_position, current_center_y_position = (x * block_size) + half_of_block_size, (y * block_size) + half_of_block_size
-        top_left = (current_center_x_position - half_of_block_size, current_center_y_position - half_of_block_size)
-        top_right = (current_center_x_position + half_of_block_size, current_center_y_position - half_of_block_size)
-        bottom_right = (current_center_x_position + half_of_block_size, current_center_y_position + half_of_block_size)
-        bottom_left = (current_center_x_position - half_of_block_size, current_center_y_position + half_of_block_size)
-        return [current_center_x_position, current_center_y_position, top_left, top_right, bottom_right, bottom_left]
-
-    def __calculate_hit_box(self, start_x: int, start_y: int, end_x: int, end_y: int) -> list[(int, int)]:
-        block_size = WorldInfo.get_block_size()
-        top_left = (start_x * block_size, start_y * block_size)
-        top_right = (end_x * block_size + block_size, start_y * block_size)
-        bottom_left = (start_x * block_size, end_y * block_size + block_size)
-        bottom_right = (end_x * block_size + block_size, end_y * block_size + block_size)
-        center = (top_right[0] - top_left[0]) / 2 + top_left[0], (bottom_left[1] - top_left[1]) / 2 + top_left[1]
-        width = top_right[0] - top_left[0]
-        height = bottom_left[1] - top_left[1]
-        return [center, top_left, top_right, bottom_right, bottom_left, (width, height)]
-
-    def __create_wall_hit_box(self, start_x: int, start_y: int, end_x: int, end_y: int, entities_with_collision: list[Entity]):
-        center, top_left, top_right, bottom_right, bottom_left, size = self.__calculate_hit_box(start_x, start_y, end_x, end_y)
-        is_player, is_character, is_bullet, is_wall, is_enemy = False, False, False, True, False
-        wall_hit_box = Entity()
-        wall_hit_box.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy))
-        wall_hit_box.add_component(PositionComponent(center[0], center[1]))
-        wall_hit_box.add_component(CollisionComponent())
-        wall_hit_box.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
-        entities_with_collision.append(wall_hit_box)
-
-    def __process_walls(self, x: int, y: int, world_map: list[list[int]], entities_with_collision: list[Entity], background_entities: list[Entity]):
+    @staticmethod
+    def __create_walls(world_map: numpy.ndarray):
+        world_map_height, world_map_width = world_map.shape
+        floor = world_map == 2
+        floor_nearby = numpy.zeros_like(floor)
+        inner_floor_nearby = floor_nearby[1:world_map_height-1, 1:world_map_width-1]
+        for delta_y in (-1, 0, 1):
+            for delta_x in (-1, 0, 1):
+                if delta_x or delta_y:
+                    inner_floor_nearby |= floor[1+delta_y:world_map_height-1+delta_y, 1+delta_x:world_map_width-1+delta_x]
+        world_map[floor_nearby & (world_map == 0)] = 1
+
+    @staticmethod
+    def __find_wall_run(x: int, y: int, world_map: list[list[int]]) -> (int, int, int, int):
         start_x, start_y = x, y
         if world_map[y][x+1] == 1:
-            while world_map[y][x] not in [0, 2] and world_map[y][x] == 1:
-                center_x, center_y, top_left, top_right, bottom_right, bottom_left = self.__calculate_coordinates(x, y)
-                entity_image_path = 'textures/background/wall.png'
-                wall = Entity()
-                wall.add_component(PositionComponent(center_x, center_y))
-                wall.add_component(BackgroundImageComponent(entity_image_path))
-                wall.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
-                background_entities.append(wall)
+            while world_map[y][x] == 1:
                 world_map[y][x] = 0
                 x += 1
-            self.__create_wall_hit_box(start_x, start_y, x-1, y, entities_with_collision)
+            return start_x, start_y, x-1, y
         elif world_map[y+1][x] == 1:
-            while world_map[y][x] not in [0, 2] and world_map[y][x] == 1:
-                center_x, center_y, top_left, top_right, bottom_right, bottom_left = self.__calculate_coordinates(x, y)
-                entity_image_path = 'textures/background/wall.png'
-                wall = Entity()
-                wall.add_component(PositionComponent(center_x, center_y))
-                wall.add_component(BackgroundImageComponent(entity_image_path))
-                wall.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
-                background_entities.append(wall)
+            while world_map[y][x] == 1:
                 world_map[y][x] = 0
                 y += 1
-            self.__create_wall_hit_box(start_x, start_y, x, y-1, entities_with_collision)
-        else:
-            center_x, center_y, top_left, top_right, bottom_right, bottom_left = self.__calculate_coordinates(x, y)
-            entity_image_path = 'textures/background/wall.png'
-            wall = Entity()
-            wall.add_component(PositionComponent(center_x, center_y))
-            wall.add_component(BackgroundImageComponent(entity_image_path))
-            wall.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
-            background_entities.append(wall)
-            world_map[y][x] = 0
-            y += 1
-            self.__create_wall_hit_box(start_x, start_y, x, y, entities_with_collision)
-
-    def __process_world_map(self, world_map: list[list[int]], entities_with_collision: list[Entity], background_entities: list[Entity], is_hub: bool = False):
+            return start_x, start_y, x, y-1
+        world_map[y][x] = 0
+        y += 1
+        return start_x, start_y, x, y
+
+    @staticmethod
+    def __find_wall_rectangles(world_map: list[list[int]]) -> list[(int, int, int, int)]:
+        wall_rectangles = []
+        for y in range(len(world_map)):
+            for x in range(len(world_map[0])):
+                if world_map[y][x] == 1:
+                    wall_rectangles.append(BinaryTree.__find_wall_run(x, y, world_map))
+        return wall_rectangles
+
+    @staticmethod
+    def __process_world_map(world_map: list[list[int]], wall_rectangles: list[(int, int, int, int)], entities_with_collision: list[Entity], background_entities: list[Entity], is_hub: bool = False):
         world_map_height = len(world_map)
         world_map_width = len(world_map[0])
+        if is_hub:
+            floor_prefab = PrefabLibrary.get_hub_floor()
+        else:
+            floor_prefab = PrefabLibrary.get_dungeon_floor()
+        wall_tile_prefab = PrefabLibrary.get_wall_tile()
+        wall_collider_prefab = PrefabLibrary.get_wall_collider()
+        for wall_rectangle in wall_rectangles:
+            entities_with_collision.append(wall_collider_prefab.instantiate(*wall_rectangle))
         for y in range(world_map_height):
             for x in range(world_map_width):
                 if world_map[y][x] == 2:
-                    center_x, center_y, top_left, top_right, bottom_right, bottom_left = self.__calculate_coordinates(x, y)
-                    if is_hub:
-                        entity_image_path = 'textures/background/hub_floor.png'
-                    else:
-                        entity_image_path = 'textures/background/dungeon_floor.png'
-                    floor = Entity()
-                    floor.add_component(PositionComponent(center_x, center_y))
-                    floor.add_component(BackgroundImageComponent(entity_image_path))
-                    floor.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
-                    background_entities.append(floor)
+                    background_entities.append(floor_prefab.instantiate(x, y))
                 elif world_map[y][x] == 1:
-                    self.__process_walls(x, y, world_map, entities_with_collision, background_entities)
+                    background_entities.append(wall_tile_prefab.instantiate(x, y))
+            yield (y + 1) / world_map_height
 
     def __find_room_centers(self, rooms: list[Room]):
         if not self.__is_separated:
@@ -242,22 +284,55 @@ class BinaryTree:
             self.__first_part.__find_room_centers(rooms)
             self.__second_part.__find_room_centers(rooms)
 
-    def __create_hub_room_on_map(self, hub_map: list[list[int]]):
-        hub_height = len(hub_map)
-        hub_width = len(hub_map[0])
-        for h in range(2, hub_height-2):
-            for w in range(2, hub_width-2):
-                hub_map[h][w] = 2
+    @staticmethod
+    def __create_hub_room_on_map(hub_map: numpy.ndarray):
+        hub_height, hub_width = hub_map.shape
+        hub_map[2:hub_height-2, 2:hub_width-2] = 2
 
-    def create_dungeon(self, entities_with_collision: list[Entity], background_entities: list[Entity], world_map: list[list[int]], minimal_room_size: int, rooms: list[Room]):
+    def __create_dungeon_map(self, world_map: numpy.ndarray, minimal_room_size: int, stage_callback):
+        stage_callback('partition')
+        Tracer.begin('separate', 'generation')
         self.__separate(minimal_room_size)
+        Tracer.end('separate', 'generation')
+        stage_callback('rooms')
+        Tracer.begin('create_rooms', 'generation')
         self.__create_rooms(world_map)
+        Tracer.end('create_rooms', 'generation')
+        stage_callback('corridors')
+        Tracer.begin('create_corridors', 'generation')
         self.__create_corridors(world_map)
-        self.__create_walls(world_map)
-        self.__process_world_map(world_map, entities_with_collision, background_entities)
+        Tracer.end('create_corridors', 'generation')
+        stage_callback('walls')
+        Tracer.begin('create_walls', 'generation')
+        BinaryTree.__create_walls(world_map)
+        Tracer.end('create_walls', 'generation')
+
+    def create_dungeon_layout(self, world_map: numpy.ndarray, minimal_room_size: int, stage_callback=None) -> DungeonLayout:
+        self.__create_dungeon_map(world_map, minimal_room_size, stage_callback or (lambda stage: None))
+        Tracer.begin('find_wall_rectangles', 'generation')
+        wall_rectangles = BinaryTree.__find_wall_rectangles(world_map.tolist())
+        Tracer.end('find_wall_rectangles', 'generation')
+        rooms = []
         self.__find_room_centers(rooms)
+        rooms.sort(key=lambda room: room.get_room_info()[2] * room.get_room_info()[3]) # sort by square
+        return DungeonLayout(world_map, rooms, wall_rectangles)
+
+    @staticmethod
+    def create_dungeon_entities_steps(dungeon_layout: DungeonLayout, entities_with_collision: list[Entity], background_entities: list[Entity]):
+        Tracer.begin('process_world_map', 'generation')
+        yield from BinaryTree.__process_world_map(dungeon_layout.get_world_map().tolist(), dungeon_layout.get_wall_rectangles(), entities_with_collision, background_entities)
+        Tracer.end('process_world_map', 'generation')
 
-    def create_hub(self, entities_with_collision: list[Entity], background_entities: list[Entity], hub_map: list[list[int]]):
-        self.__create_hub_room_on_map(hub_map)
-        self.__create_walls(hub_map)
-        self.__process_world_map(hub_map, entities_with_collision, background_entities, True)
+    @staticmethod
+    def create_hub(entities_with_collision: list[Entity], background_entities: list[Entity], hub_map: numpy.ndarray):
+        BinaryTree.__create_hub_room_on_map(hub_map)
+        Tracer.begin('create_walls', 'generation')
+        BinaryTree.__create_walls(hub_map)
+        Tracer.end('create_walls', 'generation')
+        Tracer.begin('find_wall_rectangles', 'generation')
+        wall_rectangles = BinaryTree.__find_wall_rectangles(hub_map.tolist())
+        Tracer.end('find_wall_rectangles', 'generation')
+        Tracer.begin('process_world_map', 'generation')
+        for progress in BinaryTree.__process_world_map(hub_map.tolist(), wall_rectangles, entities_with_collision, background_entities, True):
+            pass
+        Tracer.end('process_world_map', 'generation')
@@ -0,0 +1,174 @@
+import os
+import struct
+import argparse
+import numpy
+import pygame
+from DungeonGeneration import DungeonLayout, Room, EnemyPlacement
+from DungeonPregeneration import DungeonPregenerator
+from RandomGenerators import RandomGenerators
+from WorldStreaming import SleepingEnemy
+from WorldInfo import WorldInfo
+
+
+class DungeonPoolFormat:
+    __MAGIC = b'DCDP'
+    __VERSION = 1
+    __HEADER = struct.Struct('<4sHHIIIIIIIQ')
+    __ALIGNMENT = 8
+    __INDEX = numpy.dtype([('rooms_start', '<u4'), ('rooms_number', '<u4'), ('wall_rectangles_start', '<u4'), ('wall_rectangles_number', '<u4'),
+                           ('enemies_start', '<u4'), ('enemies_number', '<u4')])
+    __ENEMY = numpy.dtype([('center_x', '<i4'), ('center_y', '<i4'), ('patrol_points_start', '<u4'), ('patrol_points_number', 'u1'),
+                           ('is_melee', 'u1'), ('weapons', 'u1')])
+
+    @staticmethod
+    def pack_header(block_size: int, map_width: int, map_height: int, counts: (int, int, int, int, int), seed: int) -> bytes:
+        return DungeonPoolFormat.__HEADER.pack(DungeonPoolFormat.__MAGIC, DungeonPoolFormat.__VERSION, block_size, map_width, map_height, *counts, seed)
+
+    @staticmethod
+    def unpack_header(data: bytes) -> (int, int, int, (int, int, int, int, int), int):
+        magic, version, block_size, map_width, map_height, *counts, seed = DungeonPoolFormat.__HEADER.unpack_from(data)
+        if magic != DungeonPoolFormat.__MAGIC or version != DungeonPoolFormat.__VERSION:
+            raise ValueError('unsupported dungeon pool')
+        return block_size, map_width, map_height, tuple(counts), seed
+
+    @staticmethod
+    def get_header_size() -> int:
+        return DungeonPoolFormat.__HEADER.size
+
+    @staticmethod
+    def get_sections(map_width: int, map_height: int, counts: (int, int, int, int, int)) -> list[(int, numpy.dtype, tuple)]:
+        dungeons_number, rooms_number, wall_rectangles_number, enemies_number, patrol_points_number = counts
+        layouts = [(DungeonPoolFormat.__INDEX, (dungeons_number,)),
+                   (numpy.dtype(numpy.uint8), (dungeons_number, map_height, map_width)),
+                   (numpy.dtype('<i4'), (rooms_number, 4)),
+                   (numpy.dtype('<i4'), (wall_rectangles_number, 4)),
+                   (DungeonPoolFormat.__ENEMY, (enemies_number,)),
+                   (numpy.dtype('<i4'), (patrol_points_number, 2))]
+        sections = []
+        offset = DungeonPoolFormat.__HEADER.size
+        for dtype, shape in layouts:
+            offset = -(-offset // DungeonPoolFormat.__ALIGNMENT) * DungeonPoolFormat.__ALIGNMENT
+            sections.append((offset, dtype, shape))
+            offset += dtype.itemsize * int(numpy.prod(shape))
+        return sections
+
+    @staticmethod
+    def encode_weapons(weapons_list: list[bool] | None) -> int:
+        weapons = 0
+        for bit, has_weapon in enumerate(weapons_list or ()):
+            if has_weapon:
+                weapons |= 1 << bit
+        return weapons
+
+    @staticmethod
+    def decode_weapons(weapons: int) -> list[bool]:
+        return [bool(weapons & (1 << bit)) for bit in range(3)]
+
+
+class DungeonPoolBuilder:
+
+    def __init__(self, map_width: int, map_height: int):
+        self.__map_width = map_width
+        self.__map_height = map_height
+        self.__world_maps: list[numpy.ndarray] = []
+        self.__index: list[(int, int, int, int, int, int)] = []
+        self.__rooms: list[(int, int, int, int)] = []
+        self.__wall_rectangles: list[(int, int, int, int)] = []
+        self.__enemies: list[(int, int, int, int, int, int)] = []
+        self.__patrol_points: list[(int, int)] = []
+
+    def get_dungeons_number(self) -> int:
+        return len(self.__world_maps)
+
+    def add_dungeon(self, dungeon_layout: DungeonLayout, sleeping_enemies: list[SleepingEnemy]):
+        world_map = dungeon_layout.get_world_map()
+        if world_map.shape != (self.__map_height, self.__map_width):
+            raise ValueError(f'dungeon map {world_map.shape} does not match the pool map {(self.__map_height, self.__map_width)}')
+        rooms_start, wall_rectangles_start, enemies_start = len(self.__rooms), len(self.__wall_rectangles), len(self.__enemies)
+        self.__world_maps.append(world_map)
+        for room in dungeon_layout.get_rooms():
+            self.__rooms.append(room.get_room_info())
+        self.__wall_rectangles += dungeon_layout.get_wall_rectangles()
+        for sleeping_enemy in sleeping_enemies:
+            center_x, center_y = sleeping_enemy.get_position()
+            patrol_points = sleeping_enemy.get_patrol_points()
+            weapons = DungeonPoolFormat.encode_weapons(sleeping_enemy.get_weapons_list())
+            self.__enemies.append((center_x, center_y, len(self.__patrol_points), len(patrol_points), sleeping_enemy.is_melee(), weapons))
+            self.__patrol_points += [tuple(patrol_point) for patrol_point in patrol_points]
+        self.__index.append((rooms_start, len(self.__rooms) - rooms_start, wall_rectangles_start, len(self.__wall_rectangles) - wall_rectangles_start,
+                             enemies_start, len(self.__enemies) - enemies_start))
+
+    def write(self, path: str, seed: int = 0):
+        counts = (len(self.__world_maps), len(self.__rooms), len(self.__wall_rectangles), len(self.__enemies), len(self.__patrol_points))
+        sections = DungeonPoolFormat.get_sections(self.__map_width, self.__map_height, counts)
+        world_maps = numpy.array(self.__world_maps, dtype=numpy.uint8).reshape(sections[1][2])
+        data = [self.__index, world_maps, self.__rooms, self.__wall_rectangles, self.__enemies, self.__patrol_points]
+        with open(path, 'wb') as file:
+            file.write(DungeonPoolFormat.pack_header(WorldInfo.get_block_size(), self.__map_width, self.__map_height, counts, seed))
+            for (offset, dtype, shape), values in zip(sections, data):
+                file.write(bytes(offset - file.tell()))
+                file.write(numpy.array(values, dtype=dtype).reshape(shape).tobytes())
+
+
+class DungeonPool:
+
+    def __init__(self, path: str):
+        self.__buffer = numpy.memmap(path, dtype=numpy.uint8, mode='r')
+        block_size, self.__map_width, self.__map_height, counts, self.__seed = DungeonPoolFormat.unpack_header(self.__buffer[:DungeonPoolFormat.get_header_size()].tobytes())
+        if block_size != WorldInfo.get_block_size():
+            raise ValueError(f'dungeon pool was built for blocks of {block_size} pixels, not {WorldInfo.get_block_size()}')
+        sections = DungeonPoolFormat.get_sections(self.__map_width, self.__map_height, counts)
+        end_offset, end_dtype, end_shape = sections[-1]
+        if self.__buffer.size < end_offset + end_dtype.itemsize * int(numpy.prod(end_shape)):
+            raise ValueError('truncated dungeon pool')
+        arrays = [numpy.ndarray(shape, dtype, buffer=self.__buffer, offset=offset) for offset, dtype, shape in sections]
+        self.__index, self.__world_maps, self.__rooms, self.__wall_rectangles, self.__enemies, self.__patrol_points = arrays
+        if not len(self.__index):
+            raise ValueError('empty dungeon pool')
+
+    def get_dungeons_number(self) -> int:
+        return len(self.__index)
+
+    def get_world_map_size(self) -> (int, int):
+        return self.__map_width, self.__map_height
+
+    def get_seed(self) -> int:
+        return self.__seed
+
+    def get_dungeon(self, index: int) -> (DungeonLayout, list[SleepingEnemy]):
+        rooms_start, rooms_number, wall_rectangles_start, wall_rectangles_number, enemies_start, enemies_number = self.__index[index].tolist()
+        rooms = []
+        for start_x, start_y, width, height in self.__rooms[rooms_start:rooms_start + rooms_number].tolist():
+            rooms.append(Room(start_x, start_y, width, height, (start_x + width/2, start_y + height/2)))
+        wall_rectangles = [tuple(wall_rectangle) for wall_rectangle in self.__wall_rectangles[wall_rectangles_start:wall_rectangles_start + wall_rectangles_number].tolist()]
+        sleeping_enemies = []
+        for center_x, center_y, patrol_points_start, patrol_points_number, is_melee, weapons in self.__enemies[enemies_start:enemies_start + enemies_number].tolist():
+            first_patrol_point, *patrol_points = self.__patrol_points[patrol_points_start:patrol_points_start + patrol_points_number].tolist()
+            patrol_points = [first_patrol_point] + [tuple(patrol_point) for patrol_point in patrol_points]
+            weapons_list = None if is_melee else DungeonPoolFormat.decode_weapons(weapons)
+            sleeping_enemies.append(SleepingEnemy(center_x, center_y, patrol_points, bool(is_melee), weapons_list))
+        return DungeonLayout(self.__world_maps[index], rooms, wall_rectangles), sleeping_enemies
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('output')
+    parser.add_argument('--count', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--map-size', type=int, default=None)
+    parser.add_argument('--minimal-room-size', type=int, default=None)
+    arguments = parser.parse_args()
+    WorldInfo.configure(world_map_size=arguments.map_size, minimal_room_size=arguments.minimal_room_size)
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    random_generators = RandomGenerators(arguments.seed)
+    enemy_placement = EnemyPlacement(random_generators.get_enemy_generator())
+    world_map_size = WorldInfo.get_world_map_size()
+    builder = DungeonPoolBuilder(world_map_size, world_map_size)
+    for i in range(arguments.count):
+        dungeon_layout = DungeonPregenerator.create_dungeon_layout(random_generators.get_dungeon_generator())
+        builder.add_dungeon(dungeon_layout, enemy_placement.place_enemies(dungeon_layout.get_rooms()))
+    builder.write(arguments.output, random_generators.get_seed())
+    print(f'{builder.get_dungeons_number()} dungeons of {world_map_size}x{world_map_size} tiles written to {arguments.output} '
+          f'({os.path.getsize(arguments.output)} bytes, seed {random_generators.get_seed()})')
@@ -0,0 +1,66 @@
+import threading
+import numpy
+from random import Random
+from DungeonGeneration import BinaryTree, DungeonLayout
+from WorldInfo import WorldInfo
+from Tracing import Tracer
+
+
+class DungeonPregenerator:
+    __POLL_INTERVAL = 0.004
+
+    def __init__(self, random_generator: Random):
+        self.__random_generator = random_generator
+        self.__thread: threading.Thread | None = None
+        self.__dungeon_layout: DungeonLayout | None = None
+        self.__error: BaseException | None = None
+        self.__stage = 'partition'
+
+    @staticmethod
+    def create_dungeon_layout(random_generator: Random, stage_callback=None) -> DungeonLayout:
+        minimal_room_size = WorldInfo.get_minimal_room_size()
+        world_map_size = WorldInfo.get_world_map_size()
+        world_map = numpy.zeros((world_map_size, world_map_size), dtype=numpy.uint8)
+        tree = BinaryTree(0, 0, world_map_size, world_map_size, random_generator)
+        return tree.create_dungeon_layout(world_map, minimal_room_size, stage_callback)
+
+    def __set_stage(self, stage: str):
+        self.__stage = stage
+
+    def __generate(self):
+        Tracer.begin('pregenerate_dungeon', 'generation')
+        try:
+            self.__dungeon_layout = DungeonPregenerator.create_dungeon_layout(self.__random_generator, self.__set_stage)
+        except BaseException as error:
+            self.__error = error
+        Tracer.end('pregenerate_dungeon', 'generation')
+
+    def is_running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def is_ready(self) -> bool:
+        return self.__thread is not None and not self.__thread.is_alive()
+
+    def get_stage(self) -> str:
+        return self.__stage
+
+    def start(self):
+        if self.__thread:
+            return
+        self.__stage = 'partition'
+        self.__thread = threading.Thread(target=self.__generate, name='dungeon-pregeneration', daemon=True)
+        self.__thread.start()
+
+    def take_dungeon_layout_steps(self):
+        self.start()
+        Tracer.begin('wait_for_pregenerated_dungeon', 'loading')
+        while self.__thread.is_alive():
+            self.__thread.join(DungeonPregenerator.__POLL_INTERVAL)
+            yield self.__stage, 0.0
+        Tracer.end('wait_for_pregenerated_dungeon', 'loading')
+        self.__thread = None
+        dungeon_layout, error = self.__dungeon_layout, self.__error
+        self.__dungeon_layout, self.__error = None, None
+        if error:
+            raise error
+        return dungeon_layout
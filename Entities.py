@@ -1,19 +1,105 @@
-import uuid
+from collections import deque
 from Components import Component
 
 
-class Entity:
+class EntityIdAllocator:
+    __INDEX_BITS = 32
+    __INDEX_MASK = (1 << __INDEX_BITS) - 1
 
     def __init__(self):
-        self.__id = uuid.uuid4()
+        self.__generations: list[int] = []
+        self.__free_indices: deque[int] = deque()
+
+    @staticmethod
+    def get_index(entity_id: int) -> int:
+        return entity_id & EntityIdAllocator.__INDEX_MASK
+
+    @staticmethod
+    def get_generation(entity_id: int) -> int:
+        return entity_id >> EntityIdAllocator.__INDEX_BITS
+
+    def allocate(self) -> int:
+        if self.__free_indices:
+            index = self.__free_indices.popleft()
+        else:
+            index = len(self.__generations)
+            self.__generations.append(0)
+        return (self.__generations[index] << EntityIdAllocator.__INDEX_BITS) | index
+
+    def release(self, entity_id: int):
+        if self.is_alive(entity_id):
+            index = EntityIdAllocator.get_index(entity_id)
+            self.__generations[index] += 1
+            self.__free_indices.append(index)
+
+    def is_alive(self, entity_id: int) -> bool:
+        index = EntityIdAllocator.get_index(entity_id)
+        return index < len(self.__generations) and self.__generations[index] == EntityIdAllocator.get_generation(entity_id)
+
+    def get_alive_number(self) -> int:
+        return len(self.__generations) - len(self.__free_indices)
+
+
+class Entity:
+    __slots__ = ('__id', '__world', '__components')
+    __id_allocator = EntityIdAllocator()
+    __current_world = None
+
+    def __init__(self, is_static: bool = False):
+        self.__id = Entity.__id_allocator.allocate()
+        self.__world = None if is_static else Entity.__current_world
         self.__components = {}
 
+    @staticmethod
+    def set_id_allocator(id_allocator: EntityIdAllocator):
+        Entity.__id_allocator = id_allocator
+
+    @staticmethod
+    def set_world(world):
+        Entity.__current_world = world
+        if world:
+            Entity.__id_allocator = world.get_id_allocator()
+
+    @staticmethod
+    def get_world():
+        return Entity.__current_world
+
+    @staticmethod
+    def get_id_allocator() -> EntityIdAllocator:
+        return Entity.__id_allocator
+
+    def get_id(self) -> int:
+        return self.__id
+
+    def is_alive(self) -> bool:
+        return Entity.__id_allocator.is_alive(self.__id)
+
+    def destroy(self):
+        Entity.__id_allocator.release(self.__id)
+        if self.__world:
+            self.__world.remove_entity(self)
+
+    def revive(self):
+        if self.is_alive():
+            return
+        self.__id = Entity.__id_allocator.allocate()
+        self.__world = Entity.__current_world
+        if self.__world:
+            self.__world.mark_changed(self)
+
     def add_component(self, component: Component):
-        self.__components[component.__class__] = component
+        self.__components[component.get_component_type()] = component
+        if self.__world:
+            self.__world.mark_changed(self)
 
     def get_component(self, component) -> Component:
         return self.__components.get(component)
 
+    def get_components(self) -> list[Component]:
+        return list(self.__components.values())
+
     def remove_component(self, component_name: str):
         if component_name in self.__components.keys():
             del self.__components[component_name]
+            if self.__world:
+                self.__world.mark_changed(self)
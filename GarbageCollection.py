@@ -0,0 +1,64 @@
+import gc
+import time
+from Profiler import FrameProfiler
+from Tracing import Tracer
+
+
+class GarbageCollectionPolicy:
+    __GAMEPLAY_THRESHOLDS = (20000, 20, 100)
+    __active_policy = None
+
+    def __init__(self, profiler: FrameProfiler):
+        self.__profiler = profiler
+        self.__default_thresholds = None
+        self.__collection_start_time = 0.0
+        self.__collections_number = 0
+        self.__is_loading = False
+        if GarbageCollectionPolicy.__on_collection not in gc.callbacks:
+            gc.callbacks.append(GarbageCollectionPolicy.__on_collection)
+        GarbageCollectionPolicy.__active_policy = self
+
+    @staticmethod
+    def __on_collection(phase: str, info: dict):
+        policy = GarbageCollectionPolicy.__active_policy
+        if policy:
+            policy.__register_collection(phase, info['generation'])
+
+    def __register_collection(self, phase: str, generation: int):
+        if phase == 'start':
+            Tracer.begin(f'gc.generation{generation}', 'gc')
+            self.__collection_start_time = time.perf_counter()
+        else:
+            self.__profiler.add_sample('gc', time.perf_counter() - self.__collection_start_time)
+            self.__collections_number += 1
+            Tracer.end(f'gc.generation{generation}', 'gc')
+
+    def get_collections_number(self) -> int:
+        return self.__collections_number
+
+    def begin_loading(self):
+        if not self.__is_loading:
+            self.__is_loading = True
+            gc.disable()
+            gc.unfreeze()
+
+    def end_loading(self):
+        if self.__is_loading:
+            self.__is_loading = False
+            gc.collect()
+            gc.freeze()
+            if self.__default_thresholds is None:
+                self.__default_thresholds = gc.get_threshold()
+                gc.set_threshold(*GarbageCollectionPolicy.__GAMEPLAY_THRESHOLDS)
+            gc.enable()
+
+    def close(self):
+        if GarbageCollectionPolicy.__active_policy is self:
+            GarbageCollectionPolicy.__active_policy = None
+            if GarbageCollectionPolicy.__on_collection in gc.callbacks:
+                gc.callbacks.remove(GarbageCollectionPolicy.__on_collection)
+            if self.__default_thresholds is not None:
+                gc.set_threshold(*self.__default_thresholds)
+                self.__default_thresholds = None
+            gc.unfreeze()
+            gc.enable()
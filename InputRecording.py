@@ -0,0 +1,105 @@
+import struct
+
+
+class InputFrame:
+
+    def __init__(self, delta_time: float, moving_keys: (bool, bool, bool, bool), mouse_position: (int, int),
+                 left_click: bool = False, reload: bool = False, interaction: bool = False, escape: bool = False):
+        self.__delta_time = delta_time
+        self.__moving_keys = moving_keys
+        self.__mouse_position = mouse_position
+        self.__left_click = left_click
+        self.__reload = reload
+        self.__interaction = interaction
+        self.__escape = escape
+
+    def get_delta_time(self) -> float:
+        return self.__delta_time
+
+    def get_moving_keys(self) -> (bool, bool, bool, bool):
+        return self.__moving_keys
+
+    def get_mouse_position(self) -> (int, int):
+        return self.__mouse_position
+
+    def get_events(self) -> (bool, bool, bool, bool):
+        return self.__left_click, self.__reload, self.__interaction, self.__escape
+
+
+class InputFrameFormat:
+    __MAGIC = b'DCIR'
+    __VERSION = 1
+    __HEADER = struct.Struct('<4sHq')
+    __FRAME = struct.Struct('<dBhh')
+
+    @staticmethod
+    def pack_header(seed: int) -> bytes:
+        return InputFrameFormat.__HEADER.pack(InputFrameFormat.__MAGIC, InputFrameFormat.__VERSION, seed)
+
+    @staticmethod
+    def unpack_header(data: bytes) -> int:
+        magic, version, seed = InputFrameFormat.__HEADER.unpack_from(data)
+        if magic != InputFrameFormat.__MAGIC or version != InputFrameFormat.__VERSION:
+            raise ValueError('unsupported input recording')
+        return seed
+
+    @staticmethod
+    def get_header_size() -> int:
+        return InputFrameFormat.__HEADER.size
+
+    @staticmethod
+    def get_frame_size() -> int:
+        return InputFrameFormat.__FRAME.size
+
+    @staticmethod
+    def pack_frame(frame: InputFrame) -> bytes:
+        flags = 0
+        for bit, value in enumerate(frame.get_moving_keys() + frame.get_events()):
+            if value:
+                flags |= 1 << bit
+        mouse_x, mouse_y = frame.get_mouse_position()
+        return InputFrameFormat.__FRAME.pack(frame.get_delta_time(), flags, mouse_x, mouse_y)
+
+    @staticmethod
+    def unpack_frame(data: bytes, offset: int) -> InputFrame:
+        delta_time, flags, mouse_x, mouse_y = InputFrameFormat.__FRAME.unpack_from(data, offset)
+        up, down, right, left, left_click, reload, interaction, escape = [bool(flags & (1 << bit)) for bit in range(8)]
+        return InputFrame(delta_time, (up, down, right, left), (mouse_x, mouse_y), left_click, reload, interaction, escape)
+
+
+class InputRecorder:
+
+    def __init__(self, path: str, seed: int):
+        self.__file = open(path, 'wb')
+        self.__file.write(InputFrameFormat.pack_header(seed))
+
+    def record(self, frame: InputFrame):
+        self.__file.write(InputFrameFormat.pack_frame(frame))
+
+    def close(self):
+        if not self.__file.closed:
+            self.__file.close()
+
+
+class InputPlayer:
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self.__data = file.read()
+        self.__seed = InputFrameFormat.unpack_header(self.__data)
+        self.__offset = InputFrameFormat.get_header_size()
+        self.__frame_size = InputFrameFormat.get_frame_size()
+
+    def get_seed(self) -> int:
+        return self.__seed
+
+    def get_frame_count(self) -> int:
+        return (len(self.__data) - InputFrameFormat.get_header_size()) // self.__frame_size
+
+    def has_next_frame(self) -> bool:
+        return self.__offset + self.__frame_size <= len(self.__data)
+
+    def get_next_frame(self) -> InputFrame:
+        frame = InputFrameFormat.unpack_frame(self.__data, self.__offset)
+        self.__offset += self.__frame_size
+        return frame
@@ -0,0 +1,121 @@
+import gc
+import sys
+import tracemalloc
+import pygame
+from Entities import Entity
+
+
+class MemoryReporter:
+    __TRACEBACK_LIMIT = 1
+    __TOP_ALLOCATION_SITES = 10
+
+    def __init__(self, path: str):
+        self.__is_tracing_owner = not tracemalloc.is_tracing()
+        if self.__is_tracing_owner:
+            tracemalloc.start(MemoryReporter.__TRACEBACK_LIMIT)
+        self.__file = open(path, 'w')
+        self.__snapshot_number = 0
+        self.__previous_snapshots: dict[str, tracemalloc.Snapshot] = {}
+        self.__previous_component_counts: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def __get_attribute_values(obj) -> list:
+        if hasattr(obj, '__dict__'):
+            return list(vars(obj).values())
+        values = []
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot.startswith('__') and not slot.endswith('__'):
+                    slot = f'_{cls.__name__.lstrip("_")}{slot}'
+                if hasattr(obj, slot):
+                    values.append(getattr(obj, slot))
+        return values
+
+    @staticmethod
+    def __collect_surfaces(obj, surfaces: dict[int, pygame.Surface], depth: int = 2):
+        if isinstance(obj, pygame.Surface):
+            surfaces[id(obj)] = obj
+        elif isinstance(obj, (list, tuple)):
+            for item in obj:
+                MemoryReporter.__collect_surfaces(item, surfaces, depth)
+        elif depth > 0 and not isinstance(obj, (int, float, str, bool, type(None))):
+            for value in MemoryReporter.__get_attribute_values(obj):
+                MemoryReporter.__collect_surfaces(value, surfaces, depth - 1)
+
+    @staticmethod
+    def __get_surface_bytes(surface: pygame.Surface) -> int:
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    @staticmethod
+    def __account_components(entity_lists: list[list[Entity]]) -> (int, dict[str, int], dict[str, int], dict[str, int], dict[str, int], int):
+        entities = {}
+        for entity_list in entity_lists:
+            for entity in entity_list:
+                entities[id(entity)] = entity
+        component_counts = {}
+        component_instance_counts = {}
+        component_bytes = {}
+        component_surface_bytes = {}
+        counted_components = set()
+        all_surfaces = {}
+        for entity in entities.values():
+            for component in entity.get_components():
+                name = type(component).__name__
+                component_counts[name] = component_counts.get(name, 0) + 1
+                if id(component) in counted_components:
+                    continue
+                counted_components.add(id(component))
+                size = sys.getsizeof(component)
+                if hasattr(component, '__dict__'):
+                    size += sys.getsizeof(vars(component))
+                surfaces = {}
+                MemoryReporter.__collect_surfaces(component, surfaces)
+                new_surfaces = [surface for surface_id, surface in surfaces.items() if surface_id not in all_surfaces]
+                all_surfaces.update(surfaces)
+                component_instance_counts[name] = component_instance_counts.get(name, 0) + 1
+                component_bytes[name] = component_bytes.get(name, 0) + size
+                component_surface_bytes[name] = component_surface_bytes.get(name, 0) + sum(MemoryReporter.__get_surface_bytes(surface) for surface in new_surfaces)
+        surface_bytes = sum(MemoryReporter.__get_surface_bytes(surface) for surface in all_surfaces.values())
+        return len(entities), component_counts, component_instance_counts, component_bytes, component_surface_bytes, surface_bytes
+
+    def take_snapshot(self, label: str, entity_lists: list[list[Entity]]):
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ])
+        traced_memory, peak_memory = tracemalloc.get_traced_memory()
+        entities_number, component_counts, component_instance_counts, component_bytes, component_surface_bytes, surface_bytes = \
+            MemoryReporter.__account_components(entity_lists)
+        self.__snapshot_number += 1
+        write = self.__file.write
+        write(f'=== snapshot {self.__snapshot_number}: {label}\n')
+        write(f'traced python memory {traced_memory / 1024:.1f} KiB (peak {peak_memory / 1024:.1f} KiB), '
+              f'surfaces {surface_bytes / 1024:.1f} KiB, entities {entities_number}, gc objects {len(gc.get_objects())}\n')
+        previous_counts = self.__previous_component_counts.get(label, {})
+        write('component type                entities    delta  instances   object KiB  surface KiB\n')
+        for name in sorted(component_counts, key=lambda component_name: -component_bytes[component_name]):
+            delta = component_counts[name] - previous_counts.get(name, 0)
+            write(f'{name:<30}{component_counts[name]:>9}{delta:>+9}{component_instance_counts[name]:>11}'
+                  f'{component_bytes[name] / 1024:>13.1f}{component_surface_bytes[name] / 1024:>13.1f}\n')
+        previous_snapshot = self.__previous_snapshots.get(label)
+        if previous_snapshot:
+            write(f'growth by allocation site since the previous {label} snapshot\n')
+            statistics = snapshot.compare_to(previous_snapshot, 'lineno')
+            for statistic in statistics[:MemoryReporter.__TOP_ALLOCATION_SITES]:
+                frame = statistic.traceback[0]
+                write(f'{statistic.size_diff / 1024:>+10.1f} KiB {statistic.count_diff:>+8} blocks  {frame.filename}:{frame.lineno}\n')
+        write('\n')
+        self.__file.flush()
+        self.__previous_snapshots[label] = snapshot
+        self.__previous_component_counts[label] = component_counts
+
+    def close(self):
+        if not self.__file.closed:
+            self.__file.close()
+        if self.__is_tracing_owner:
+            self.__is_tracing_owner = False
+            tracemalloc.stop()
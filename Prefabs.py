@@ -0,0 +1,166 @@
+from Components import (PositionComponent, HitBoxComponent, AnimationComponent, HealthComponent, MovingDistanceComponent,
+                        TypeComponent, CollisionComponent, SightComponent, EnemyConditionComponent, OwnDamageComponent,
+                        ActiveHandComponent, WeaponComponent, EnemyActionQueueComponent, SingeAnimationComponent,
+                        AnimationConditionComponent, ActionComponent, ExistenceConditionComponent, BackgroundImageComponent)
+from Entities import Entity
+from Sprites import SpriteLoader
+from Transforms import TransformHierarchy
+from WorldInfo import WorldInfo
+
+
+class EnemyPrefab:
+
+    def __init__(self, moving_right_path: str, moving_left_path: str, size: (int, int), health: int, moving_distance: int, is_melee: bool,
+                 anger_range: int, alert_range: int, left_hand_offset: (int, int) = None, right_hand_offset: (int, int) = None):
+        is_player, is_character, is_bullet, is_wall, is_enemy = False, True, False, False, True
+        self.__moving_right_frames = SpriteLoader.load_animation(moving_right_path)
+        self.__moving_left_frames = SpriteLoader.load_animation(moving_left_path)
+        self.__size = size
+        self.__health = health
+        self.__moving_distance = moving_distance
+        self.__is_melee = is_melee
+        self.__anger_range = anger_range
+        self.__alert_range = alert_range
+        self.__left_hand_offset = left_hand_offset
+        self.__right_hand_offset = right_hand_offset
+        self.__type_component = TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy)
+
+    def get_size(self) -> (int, int):
+        return self.__size
+
+    def instantiate(self, center_x: int, center_y: int, patrol_points: list[(int, int)], weapons_list: list[bool] = None) -> Entity:
+        width, height = self.__size
+        top_left = [center_x - width // 2, center_y - height // 2]
+        bottom_left = [center_x - width // 2, center_y + height // 2]
+        top_right = [center_x + width // 2, center_y - height // 2]
+        bottom_right = [center_x + width // 2, center_y + height // 2]
+        enemy = Entity()
+        if self.__is_melee:
+            enemy.add_component(OwnDamageComponent())
+        else:
+            left_active_hand = [top_left[0] + self.__left_hand_offset[0], top_left[1] + self.__left_hand_offset[1]]
+            right_active_hand = [top_left[0] + self.__right_hand_offset[0], top_left[1] + self.__right_hand_offset[1]]
+            enemy.add_component(ActiveHandComponent(left_active_hand, right_active_hand))
+            enemy.add_component(WeaponComponent(weapons_list))
+            enemy.add_component(EnemyActionQueueComponent())
+        enemy.add_component(HealthComponent(self.__health))
+        enemy.add_component(PositionComponent(center_x, center_y))
+        enemy.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
+        enemy.add_component(AnimationComponent(self.__moving_right_frames, self.__moving_left_frames))
+        enemy.add_component(MovingDistanceComponent(self.__moving_distance))
+        enemy.add_component(self.__type_component)
+        enemy.add_component(CollisionComponent())
+        enemy.add_component(SightComponent())
+        enemy.add_component(EnemyConditionComponent(patrol_points, self.__is_melee, self.__anger_range, self.__alert_range))
+        TransformHierarchy.attach_children(enemy)
+        return enemy
+
+
+class CoinPrefab:
+
+    def __init__(self, animation_path: str, frame_size: (int, int), size: (int, int)):
+        is_player, is_character, is_bullet, is_wall, is_enemy, is_interactive_object = False, False, False, False, False, True
+        self.__frames = SpriteLoader.load_sequence(animation_path, frame_size)
+        self.__size = size
+        self.__type_component = TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy, is_interactive_object)
+
+    def instantiate(self, center_x: float, center_y: float, actions: list) -> Entity:
+        width, height = self.__size
+        top_left = (center_x - width // 2, center_y - height // 2)
+        top_right = (center_x + width // 2, center_y - height // 2)
+        bottom_right = (center_x + width // 2, center_y + height // 2)
+        bottom_left = (center_x - width // 2, center_y + height // 2)
+        coin_has_animation = True
+        coin = Entity()
+        coin.add_component(self.__type_component)
+        coin.add_component(PositionComponent(center_x, center_y))
+        coin.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
+        coin.add_component(SingeAnimationComponent(self.__frames))
+        coin.add_component(CollisionComponent())
+        coin.add_component(AnimationConditionComponent(coin_has_animation))
+        coin.add_component(ActionComponent(actions))
+        coin.add_component(ExistenceConditionComponent(True))
+        return coin
+
+
+class TilePrefab:
+
+    def __init__(self, image_path: str):
+        self.__background_image_component = BackgroundImageComponent(image_path)
+
+    def instantiate(self, tile_x: int, tile_y: int) -> Entity:
+        block_size = WorldInfo.get_block_size()
+        half_of_block_size = block_size // 2
+        center_x, center_y = (tile_x * block_size) + half_of_block_size, (tile_y * block_size) + half_of_block_size
+        top_left = (center_x - half_of_block_size, center_y - half_of_block_size)
+        top_right = (center_x + half_of_block_size, center_y - half_of_block_size)
+        bottom_right = (center_x + half_of_block_size, center_y + half_of_block_size)
+        bottom_left = (center_x - half_of_block_size, center_y + half_of_block_size)
+        tile = Entity(is_static=True)
+        tile.add_component(PositionComponent(center_x, center_y))
+        tile.add_component(self.__background_image_component)
+        tile.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
+        return tile
+
+
+class WallColliderPrefab:
+
+    def __init__(self):
+        is_player, is_character, is_bullet, is_wall, is_enemy = False, False, False, True, False
+        self.__type_component = TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy)
+
+    def instantiate(self, start_x: int, start_y: int, end_x: int, end_y: int) -> Entity:
+        block_size = WorldInfo.get_block_size()
+        top_left = (start_x * block_size, start_y * block_size)
+        top_right = (end_x * block_size + block_size, start_y * block_size)
+        bottom_left = (start_x * block_size, end_y * block_size + block_size)
+        bottom_right = (end_x * block_size + block_size, end_y * block_size + block_size)
+        center = (top_right[0] - top_left[0]) / 2 + top_left[0], (bottom_left[1] - top_left[1]) / 2 + top_left[1]
+        wall_collider = Entity(is_static=True)
+        wall_collider.add_component(self.__type_component)
+        wall_collider.add_component(PositionComponent(center[0], center[1]))
+        wall_collider.add_component(CollisionComponent())
+        wall_collider.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
+        return wall_collider
+
+
+class PrefabLibrary:
+    __prefabs: dict[str, EnemyPrefab | CoinPrefab | TilePrefab | WallColliderPrefab] = {}
+
+    @staticmethod
+    def __get_prefab(name: str, factory) -> EnemyPrefab | CoinPrefab | TilePrefab | WallColliderPrefab:
+        prefab = PrefabLibrary.__prefabs.get(name)
+        if not prefab:
+            prefab = factory()
+            PrefabLibrary.__prefabs[name] = prefab
+        return prefab
+
+    @staticmethod
+    def get_melee_enemy() -> EnemyPrefab:
+        return PrefabLibrary.__get_prefab('melee_enemy', lambda: EnemyPrefab('textures/animations/grenade_enemy_R', 'textures/animations/grenade_enemy_L',
+                                                                             (32, 53), 100, 380, True, 450, 150))
+
+    @staticmethod
+    def get_ranged_enemy() -> EnemyPrefab:
+        return PrefabLibrary.__get_prefab('ranged_enemy', lambda: EnemyPrefab('textures/animations/enemy_move_R', 'textures/animations/enemy_move_L',
+                                                                              (64, 100), 150, 300, False, 400, 300, (4, 58), (60, 58)))
+
+    @staticmethod
+    def get_coin() -> CoinPrefab:
+        return PrefabLibrary.__get_prefab('coin', lambda: CoinPrefab('textures/interactive_objects/coin', (32, 32), (64, 64)))
+
+    @staticmethod
+    def get_dungeon_floor() -> TilePrefab:
+        return PrefabLibrary.__get_prefab('dungeon_floor', lambda: TilePrefab('textures/background/dungeon_floor.png'))
+
+    @staticmethod
+    def get_hub_floor() -> TilePrefab:
+        return PrefabLibrary.__get_prefab('hub_floor', lambda: TilePrefab('textures/background/hub_floor.png'))
+
+    @staticmethod
+    def get_wall_tile() -> TilePrefab:
+        return PrefabLibrary.__get_prefab('wall_tile', lambda: TilePrefab('textures/background/wall.png'))
+
+    @staticmethod
+    def get_wall_collider() -> WallColliderPrefab:
+        return PrefabLibrary.__get_prefab('wall_collider', WallColliderPrefab)
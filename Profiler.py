@@ -0,0 +1,97 @@
+import time
+from collections import deque
+from Tracing import Tracer
+
+
+class FrameProfiler:
+    __HISTORY_LENGTH = 120
+
+    def __init__(self):
+        self.__is_enabled = False
+        self.__is_overlay_active = False
+        self.__history: dict[str, deque] = {}
+        self.__is_recording = False
+        self.__section_start_times: dict[str, float] = {}
+        self.__frame_start_time = 0.0
+        self.__current_frame: dict[str, float] = {}
+        self.__recorded_frames: list[dict[str, float]] = []
+
+    def is_enabled(self) -> bool:
+        return self.__is_enabled
+
+    def set_enabled(self, condition: bool):
+        self.__is_enabled = condition
+
+    def is_overlay_active(self) -> bool:
+        return self.__is_overlay_active
+
+    def switch_overlay_condition(self):
+        self.__is_overlay_active = not self.__is_overlay_active
+        if self.__is_overlay_active:
+            self.__is_enabled = True
+        elif not self.__is_recording:
+            self.__is_enabled = False
+            self.__history.clear()
+
+    def set_recording(self, condition: bool):
+        self.__is_recording = condition
+        if condition:
+            self.__is_enabled = True
+
+    def get_recorded_frames(self) -> list[dict[str, float]]:
+        return self.__recorded_frames
+
+    def clear_recorded_frames(self):
+        self.__recorded_frames = []
+
+    def begin_frame(self):
+        Tracer.begin('frame', 'frame')
+        if self.__is_enabled:
+            self.__current_frame = {}
+            self.__frame_start_time = time.perf_counter()
+
+    def end_frame(self):
+        Tracer.end('frame', 'frame')
+        if self.__is_enabled:
+            self.__current_frame['frame'] = time.perf_counter() - self.__frame_start_time
+            if self.__is_recording:
+                self.__recorded_frames.append(self.__current_frame)
+            for name, duration in self.__current_frame.items():
+                if name not in self.__history:
+                    self.__history[name] = deque(maxlen=FrameProfiler.__HISTORY_LENGTH)
+                self.__history[name].append(duration)
+
+    def begin_section(self, name: str):
+        Tracer.begin(name)
+        if self.__is_enabled:
+            self.__section_start_times[name] = time.perf_counter()
+
+    def end_section(self, name: str):
+        if self.__is_enabled:
+            duration = time.perf_counter() - self.__section_start_times[name]
+            self.__current_frame[name] = self.__current_frame.get(name, 0.0) + duration
+        Tracer.end(name)
+
+    def add_sample(self, name: str, duration: float):
+        if self.__is_enabled:
+            self.__current_frame[name] = self.__current_frame.get(name, 0.0) + duration
+
+    def get_average(self, name: str) -> float:
+        samples = self.__history.get(name)
+        if not samples:
+            return 0.0
+        return sum(samples) / len(samples)
+
+    def get_maximum(self, name: str) -> float:
+        samples = self.__history.get(name)
+        if not samples:
+            return 0.0
+        return max(samples)
+
+    def get_report_lines(self) -> list[(str, str)]:
+        lines = []
+        for name in self.__history:
+            average_time = self.get_average(name) * 1000
+            maximum_time = self.get_maximum(name) * 1000
+            lines.append((name, f'{average_time:.2f} ms   max {maximum_time:.2f} ms'))
+        return lines
@@ -5,12 +5,13 @@ from CheckCollisionMethods import AxisAlignedBoundingBox, SeparatingAxisTheorem
 
 class Point:
 
-    def __init__(self, x: int, y: int, entity: Entity, boundary: list[(float, float)], is_rotated: bool = False):
+    def __init__(self, x: int, y: int, entity: Entity, boundary: list[(float, float)], is_rotated: bool = False, type_flags: int = 0):
         self.__x_coord = x
         self.__y_coord = y
         self.__entity = entity
         self.__entity_boundary = boundary
         self.__is_rotated = is_rotated
+        self.__type_flags = type_flags
 
     def get_coordinates(self) -> (int, int):
         return self.__x_coord, self.__y_coord
@@ -24,6 +25,9 @@ class Point:
     def get_rotation_condition(self) -> bool:
         return self.__is_rotated
 
+    def get_type_flags(self) -> int:
+        return self.__type_flags
+
 
 class Rectangle:
 
@@ -49,11 +53,13 @@ class QuadTree:
         self.__boundary = boundary
         self.__capacity = capacity
         self.__points = []
+        self.__type_flags = 0
         self.__is_divided = False
         self.__top_right = None
         self.__top_left = None
         self.__bottom_right = None
         self.__bottom_left = None
+        self.__region = self.__transform_boundary()
 
     def __subdivide(self):
         boundary_x, boundary_y, boundary_width, boundary_height = self.__boundary.get_boundary()
@@ -85,6 +91,7 @@ class QuadTree:
     def insert(self, point: Point) -> bool:
         if not self.__boundary.check_contain(point):
             return False
+        self.__type_flags |= point.get_type_flags()
         if (len(self.__points) + 1) <= self.__capacity:
             self.__points.append(point)
             return True
@@ -101,27 +108,36 @@ class QuadTree:
                 return True
         return False
 
-    def get_entities(self, region: list[[int, int]], entity_is_rotated: bool = False, entity: Entity = None) -> list[Entity]:
+    def get_nodes_number(self) -> int:
+        if not self.__is_divided:
+            return 1
+        return 1 + self.__top_left.get_nodes_number() + self.__top_right.get_nodes_number() + \
+            self.__bottom_left.get_nodes_number() + self.__bottom_right.get_nodes_number()
+
+    def get_entities(self, region: list[[int, int]], entity_is_rotated: bool = False, entity: Entity = None, layer_mask: int = 0) -> list[Entity]:
         entities = []
-        current_quadtree_region = self.__transform_boundary()
-        if not self.__check_intersection(region, current_quadtree_region, entity_is_rotated):
+        if entity and entity.get_component(CollisionComponent).get_collision_condition():
             return entities
+        self.__collect_entities(region, entity_is_rotated, entity, layer_mask, entities)
+        return entities
+
+    def __collect_entities(self, region: list[[int, int]], entity_is_rotated: bool, entity: Entity, layer_mask: int, entities: list[Entity]):
+        if layer_mask and not self.__type_flags & layer_mask:
+            return
+        if not self.__check_intersection(region, self.__region, entity_is_rotated):
+            return
         for point in self.__points:
+            if layer_mask and not point.get_type_flags() & layer_mask:
+                continue
             point_entity = point.get_entity()
-            if not entity:
-                point_is_collided = False
-            else:
-                collision_component = entity.get_component(CollisionComponent)
-                point_is_collided = collision_component.get_collision_condition()
-            if not point_is_collided and entity != point_entity:
+            if entity != point_entity:
                 entity_boundary = point.get_entity_boundary()
                 point_entity_is_rotated = point.get_rotation_condition()
                 rotation_condition = (entity_is_rotated or point_entity_is_rotated)
                 if self.__check_intersection(region, entity_boundary, rotation_condition):
                     entities.append(point_entity)
         if self.__is_divided:
-            entities += self.__top_right.get_entities(region, entity_is_rotated, entity)
-            entities += self.__top_left.get_entities(region, entity_is_rotated, entity)
-            entities += self.__bottom_right.get_entities(region, entity_is_rotated, entity)
-            entities += self.__bottom_left.get_entities(region, entity_is_rotated, entity)
-        return entities
+            self.__top_right.__collect_entities(region, entity_is_rotated, entity, layer_mask, entities)
+            self.__top_left.__collect_entities(region, entity_is_rotated, entity, layer_mask, entities)
+            self.__bottom_right.__collect_entities(region, entity_is_rotated, entity, layer_mask, entities)
+            self.__bottom_left.__collect_entities(region, entity_is_rotated, entity, layer_mask, entities)
@@ -0,0 +1,34 @@
+from random import Random, SystemRandom
+
+
+class RandomGenerators:
+
+    __MAX_SEED = 2 ** 32
+
+    def __init__(self, seed: int = None):
+        if seed is None:
+            seed = SystemRandom().randrange(RandomGenerators.__MAX_SEED)
+        self.__seed = seed
+        self.__dungeon_generator = Random(f'{seed}:dungeon')
+        self.__enemy_generator = Random(f'{seed}:enemy')
+        self.__ai_generator = Random(f'{seed}:ai')
+        self.__weapon_generator = Random(f'{seed}:weapon')
+        self.__loot_generator = Random(f'{seed}:loot')
+
+    def get_seed(self) -> int:
+        return self.__seed
+
+    def get_dungeon_generator(self) -> Random:
+        return self.__dungeon_generator
+
+    def get_enemy_generator(self) -> Random:
+        return self.__enemy_generator
+
+    def get_ai_generator(self) -> Random:
+        return self.__ai_generator
+
+    def get_weapon_generator(self) -> Random:
+        return self.__weapon_generator
+
+    def get_loot_generator(self) -> Random:
+        return self.__loot_generator
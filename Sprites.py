@@ -0,0 +1,48 @@
+import os
+import re
+import pygame
+
+
+class SpriteLoader:
+    __images: dict[(str, (int, int)), pygame.Surface] = {}
+    __animations: dict[str, tuple[pygame.Surface, ...]] = {}
+    __sequences: dict[(str, (int, int)), tuple[pygame.Surface, ...]] = {}
+
+    @staticmethod
+    def __natural_sort_key(name: str, _nsre=re.compile('([0-9]+)')) -> list:
+        return [int(text) if text.isdigit() else text.lower() for text in re.split(_nsre, name)]
+
+    @staticmethod
+    def load_image(path: str, size: (int, int) = None) -> pygame.Surface:
+        key = (path, size)
+        image = SpriteLoader.__images.get(key)
+        if not image:
+            image = pygame.image.load(path).convert_alpha()
+            if size:
+                image = pygame.transform.scale(image, size)
+            SpriteLoader.__images[key] = image
+        return image
+
+    @staticmethod
+    def load_animation(folder_path: str) -> tuple[pygame.Surface, ...]:
+        frames = SpriteLoader.__animations.get(folder_path)
+        if not frames:
+            frames = []
+            for file_name in os.listdir(folder_path):
+                file_path = os.path.join(folder_path, file_name)
+                if os.path.isfile(file_path) and file_name.lower().endswith('.png'):
+                    frames.append(pygame.image.load(file_path).convert_alpha())
+            frames = tuple(frames)
+            SpriteLoader.__animations[folder_path] = frames
+        return frames
+
+    @staticmethod
+    def load_sequence(folder_path: str, size: (int, int) = None) -> tuple[pygame.Surface, ...]:
+        key = (folder_path, size)
+        frames = SpriteLoader.__sequences.get(key)
+        if not frames:
+            image_files = [file for file in os.listdir(folder_path) if file.endswith('.png')]
+            image_files.sort(key=SpriteLoader.__natural_sort_key)
+            frames = tuple(SpriteLoader.load_image(f'{folder_path}/{image_file}', size) for image_file in image_files)
+            SpriteLoader.__sequences[key] = frames
+        return frames
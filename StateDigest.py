@@ -0,0 +1,79 @@
+import hashlib
+import struct
+import sys
+from Components import PositionComponent, HealthComponent, WeaponComponent
+from Entities import Entity
+
+
+class StateDigest:
+    __COUNTS = struct.Struct('<4Q')
+    __POSITION = struct.Struct('<dd')
+    __VALUE = struct.Struct('<q')
+
+    @staticmethod
+    def __update_entities(digest, entities: list[Entity]):
+        for entity in entities:
+            position_component = entity.get_component(PositionComponent)
+            health_component = entity.get_component(HealthComponent)
+            weapon_component = entity.get_component(WeaponComponent)
+            if position_component:
+                digest.update(StateDigest.__POSITION.pack(*position_component.get_position()))
+            if health_component:
+                digest.update(StateDigest.__VALUE.pack(health_component.get_health()))
+            if weapon_component:
+                digest.update(StateDigest.__VALUE.pack(weapon_component.get_current_magazine_size()))
+
+    @staticmethod
+    def calculate_digest(main_entities: list[Entity], enemies: list[Entity], bullets: list[Entity], entities_with_collision: list[Entity]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(StateDigest.__COUNTS.pack(len(main_entities), len(enemies), len(bullets), len(entities_with_collision)))
+        StateDigest.__update_entities(digest, main_entities)
+        StateDigest.__update_entities(digest, enemies)
+        StateDigest.__update_entities(digest, bullets)
+        StateDigest.__update_entities(digest, entities_with_collision)
+        return digest.hexdigest()
+
+
+class StateDigestLog:
+
+    def __init__(self, path: str):
+        self.__file = open(path, 'w')
+
+    def write(self, tick: int, digest: str):
+        self.__file.write(f'{tick} {digest}\n')
+
+    def close(self):
+        if not self.__file.closed:
+            self.__file.close()
+
+    @staticmethod
+    def read(path: str) -> list[(int, str)]:
+        records = []
+        with open(path, 'r') as file:
+            for line in file:
+                tick, digest = line.split()
+                records.append((int(tick), digest))
+        return records
+
+    @staticmethod
+    def find_first_difference(first_path: str, second_path: str) -> int | None:
+        first_records = StateDigestLog.read(first_path)
+        second_records = StateDigestLog.read(second_path)
+        for first_record, second_record in zip(first_records, second_records):
+            if first_record != second_record:
+                return first_record[0]
+        if len(first_records) != len(second_records):
+            shortest_records = min(first_records, second_records, key=len)
+            if not shortest_records:
+                return 0
+            return shortest_records[-1][0] + 1
+        return None
+
+
+if __name__ == '__main__':
+    first_difference = StateDigestLog.find_first_difference(sys.argv[1], sys.argv[2])
+    if first_difference is None:
+        print('simulations are identical')
+    else:
+        print(f'simulations diverge at tick {first_difference}')
+        sys.exit(1)
@@ -1,8 +1,9 @@
 import pygame
+import numpy
 import sys
 import json
 from math import degrees, atan2, sin, cos, radians, sqrt
-from random import gauss, randint, choice
+from random import Random
 from abc import ABC
 from Components import (BulletImageComponent, PositionComponent, MovingDistanceComponent, BulletDirectionComponent,
                         AnimationComponent, WeaponComponent, HitBoxComponent, TypeComponent, DamageComponent,
@@ -10,12 +11,23 @@ from Components import (BulletImageComponent, PositionComponent, MovingDistanceC
                         BulletStatusComponent, BackgroundImageComponent, EnemyConditionComponent, BelongingComponent,
                         EnemyActionQueueComponent, MenuEntityTypeComponent, ActionComponent, SingleImageComponent,
                         SingeAnimationComponent, AnimationConditionComponent, MoneyCollectionComponent,
-                        ExistenceConditionComponent)
+                        ExistenceConditionComponent, EntityTypeFlags)
 from Entities import Entity
+from CommandBuffer import EntityCommandBuffer
 from QuadTree import QuadTree, Rectangle, Point
-from DungeonGeneration import BinaryTree
+from DungeonGeneration import BinaryTree, DungeonLayout, EnemyPlacement
+from DungeonPregeneration import DungeonPregenerator
+from DungeonPool import DungeonPool
 from WorldInfo import WorldInfo
 from Actions import WaitAction, MoveAction, ShootAction
+from InputRecording import InputFrame
+from Profiler import FrameProfiler
+from Tracing import Tracer
+from World import World
+from Transforms import PositionView, HitBoxView
+from Prefabs import PrefabLibrary
+from Sprites import SpriteLoader
+from WorldStreaming import WorldStreamer, SleepingEnemy
 
 
 class IconsCoordinates:
@@ -131,6 +143,8 @@ class MenuSystem(System):
         self.__player = player
 
     def __clear_menu_entities(self):
+        for entity in self.__menu_entities:
+            entity.destroy()
         self.__menu_entities.clear()
 
     def create_main_menu(self):
@@ -149,7 +163,7 @@ class MenuSystem(System):
         background = Entity()
         background.add_component(HitBoxComponent(background_top_left, background_top_right, background_bottom_left, background_bottom_right))
         background.add_component(MenuEntityTypeComponent(background_is_background, background_is_button))
-        background.add_component(SingeAnimationComponent(background_animation, background_size))
+        background.add_component(SingeAnimationComponent(SpriteLoader.load_sequence(background_animation, background_size)))
         background.add_component(AnimationConditionComponent(background_has_animation))
 
         new_game_button_top_left = (512, 175)
@@ -488,12 +502,11 @@ class MenuSystem(System):
             return True
         return False
 
-    def check_buttons(self):
+    def check_buttons(self, mouse_position: (int, int)):
         for entity in self.__menu_entities:
             entity_type_component = entity.get_component(MenuEntityTypeComponent)
             entity_is_background, entity_is_button = entity_type_component.get_type()
             if entity_is_button:
-                mouse_position = pygame.mouse.get_pos()
                 hit_box_component = entity.get_component(HitBoxComponent)
                 if self.__check_collision(mouse_position, hit_box_component):
                     button_action_component = entity.get_component(ActionComponent)
@@ -503,8 +516,12 @@ class MenuSystem(System):
 class RenderSystem(System):
     __DISPLAY_WIDTH = 1280
     __DISPLAY_HEIGHT = 720
+    __CULLING_MARGIN = 100
+    __LOADING_ICON_TURN_PERIOD = 1000
+    __LOADING_BAR_SIZE = (400, 12)
+    __BACKGROUND_ENTITIES_PER_STEP = 1000
 
-    def __init__(self, main_entities: list[Entity], background_entities: list[Entity], enemies: list[Entity], menu_entities: list[Entity]):
+    def __init__(self, main_entities: list[Entity], background_entities: list[Entity], enemies: list[Entity], menu_entities: list[Entity], world: World, profiler: FrameProfiler):
         pygame.init()
         self.__display = pygame.display.set_mode((RenderSystem.__DISPLAY_WIDTH, RenderSystem.__DISPLAY_HEIGHT))
         self.__bullet_icon = pygame.image.load('textures/interface/interface_bullet.png').convert_alpha()
@@ -523,6 +540,11 @@ class RenderSystem(System):
         self.__background_entities = background_entities
         self.__enemies = enemies
         self.__menu_entities = menu_entities
+        self.__world = world
+        self.__profiler = profiler
+        self.__overlay_font = pygame.font.SysFont('consolas', 16)
+        self.__quadtree = None
+        self.__world_streamer = None
 
         self.__camera_top_left = pygame.math.Vector2(0, 0)
         self.__camera_top_right = pygame.math.Vector2(1280, 0)
@@ -533,21 +555,35 @@ class RenderSystem(System):
     def get_display_size() -> (int, int):
         return RenderSystem.__DISPLAY_WIDTH, RenderSystem.__DISPLAY_HEIGHT
 
-    def draw_loading_screen(self):
+    def draw_loading_screen(self, progress: float = 0.0, stage: str = None):
         display_width, display_height = RenderSystem.get_display_size()
+        white_colour = (255, 255, 255)
         self.__display.fill('black')
-        loading_icon = self.__loading_icon
+        turn_period = RenderSystem.__LOADING_ICON_TURN_PERIOD
+        turn_phase = pygame.time.get_ticks() % turn_period / turn_period
+        loading_icon = pygame.transform.rotate(self.__loading_icon, 180 * min(turn_phase * 4, 1))
         loading_icon_rect = loading_icon.get_rect(center=(display_width//2, display_height//2))
         self.__display.blit(loading_icon, loading_icon_rect)
+        bar_width, bar_height = RenderSystem.__LOADING_BAR_SIZE
+        bar_rect = pygame.Rect(0, 0, bar_width, bar_height)
+        bar_rect.midtop = (display_width//2, display_height//2 + self.__loading_icon.get_height())
+        filled_bar_rect = pygame.Rect(bar_rect.left, bar_rect.top, round(bar_width * min(max(progress, 0.0), 1.0)), bar_height)
+        pygame.draw.rect(self.__display, white_colour, filled_bar_rect)
+        pygame.draw.rect(self.__display, white_colour, bar_rect, 1)
+        if stage:
+            text = self.__overlay_font.render(stage.replace('_', ' '), True, white_colour)
+            self.__display.blit(text, text.get_rect(midtop=(display_width//2, bar_rect.bottom + bar_height)))
         pygame.display.flip()
 
-    def create_dungeon_render(self):
+    def create_dungeon_render(self, world_streamer: WorldStreamer = None):
         capacity = WorldInfo.get_render_capacity()
         world_size = WorldInfo.get_world_size()
         boundary = Rectangle(0, 0, world_size, world_size)
         self.__quadtree = QuadTree(boundary, capacity)
+        self.__world_streamer = world_streamer
 
     def create_hub_render(self):
+        self.__world_streamer = None
         capacity = WorldInfo.get_render_capacity()
         hub_width = WorldInfo.get_hub_width()
         hub_height = WorldInfo.get_hub_height()
@@ -590,6 +626,8 @@ class RenderSystem(System):
 
     def __render_enemy_icon(self, font: pygame.font, color: (int, int, int)):
         enemy_number = len(self.__enemies)
+        if self.__world_streamer:
+            enemy_number += self.__world_streamer.get_sleeping_enemies_number()
         if enemy_number != 0:
             x, y, extra_space = IconsCoordinates.get_enemy_icon_coordinates()
             text = font.render(f'{enemy_number}', True, color)
@@ -620,8 +658,9 @@ class RenderSystem(System):
         self.__render_enemy_icon(font, white_colour)
         self.__render_coin_icon(player, font, white_colour)
 
-    def insert_background_entities(self):
-        for entity in self.__background_entities:
+    def insert_background_entities_steps(self):
+        background_entities_number = len(self.__background_entities)
+        for index, entity in enumerate(self.__background_entities):
             position_component = entity.get_component(PositionComponent)
             hit_box_component = entity.get_component(HitBoxComponent)
             entity_x, entity_y = position_component.get_position()
@@ -629,13 +668,24 @@ class RenderSystem(System):
             entity_is_rotated = hit_box_component.get_rotation_condition()
             point = Point(entity_x, entity_y, entity, boundary, entity_is_rotated)
             self.__quadtree.insert(point)
+            if (index + 1) % RenderSystem.__BACKGROUND_ENTITIES_PER_STEP == 0:
+                yield (index + 1) / background_entities_number
+        yield 1.0
+
+    def insert_background_entities(self):
+        for progress in self.insert_background_entities_steps():
+            pass
 
     def __render_background(self, camera_offset: (float, float)):
         current_top_left = self.__camera_top_left + camera_offset
         current_top_right = self.__camera_top_right + camera_offset
         current_bottom_right = self.__camera_bottom_right + camera_offset
         current_bottom_left = self.__camera_bottom_left + camera_offset
-        collided_entities = self.__quadtree.get_entities([current_top_left, current_top_right, current_bottom_right, current_bottom_left])
+        camera_region = [current_top_left, current_top_right, current_bottom_right, current_bottom_left]
+        if self.__world_streamer:
+            collided_entities = self.__world_streamer.get_background_entities(camera_region)
+        else:
+            collided_entities = self.__quadtree.get_entities(camera_region)
         for entity in collided_entities:
             hit_box_component = entity.get_component(HitBoxComponent)
             background_image_component = entity.get_component(BackgroundImageComponent)
@@ -653,31 +703,38 @@ class RenderSystem(System):
         current_position = pygame.math.Vector2(weapon_rect.topleft) - pygame.math.Vector2(camera_offset)
         self.__display.blit(weapon_image, current_position)
 
+    def __update_character_animations(self, scaled_time: float):
+        for animation_component, in self.__world.query(AnimationComponent):
+            frame_duration = animation_component.get_frame_duration()
+            current_time = animation_component.get_time_accumulator() + scaled_time
+            animation_component.set_time_accumulator(current_time)
+            if current_time >= frame_duration:
+                animation_component.increase_image_index()
+                animation_component.set_time_accumulator(current_time - frame_duration)
+
     def __render_entities(self, camera_offset: (float, float), scaled_time: float):
+        culling_margin = RenderSystem.__CULLING_MARGIN
+        visible_min_x, visible_min_y = camera_offset[0] - culling_margin, camera_offset[1] - culling_margin
+        visible_max_x = camera_offset[0] + RenderSystem.__DISPLAY_WIDTH + culling_margin
+        visible_max_y = camera_offset[1] + RenderSystem.__DISPLAY_HEIGHT + culling_margin
         for entity in self.__main_entities:
             type_component = entity.get_component(TypeComponent)
             hit_box_component = entity.get_component(HitBoxComponent)
-            entity_is_character, entity_is_bullet, entity_is_wall = type_component.get_type()
-            entity_is_interactive_object = type_component.check_interactive_condition()
-            entity_position = hit_box_component.get_top_left()
-            current_entity_position = pygame.math.Vector2(entity_position) - pygame.math.Vector2(camera_offset)
-            if entity_is_character:
+            entity_type_flags = type_component.get_type_flags()
+            entity_top_left, entity_top_right, entity_bottom_right, entity_bottom_left = hit_box_component.get_hit_box()
+            entity_is_visible = (entity_bottom_right[0] >= visible_min_x and entity_top_left[0] <= visible_max_x and
+                                 entity_bottom_right[1] >= visible_min_y and entity_top_left[1] <= visible_max_y)
+            current_entity_position = pygame.math.Vector2(entity_top_left) - pygame.math.Vector2(camera_offset)
+            if entity_type_flags & EntityTypeFlags.CHARACTER:
                 animation_component = entity.get_component(AnimationComponent)
                 weapon_component = entity.get_component(WeaponComponent)
                 sight_component = entity.get_component(SightComponent)
                 left_sight, right_sight = sight_component.get_sights()
-                if weapon_component:
+                if weapon_component and entity_is_visible:
                     active_hand_component = entity.get_component(ActiveHandComponent)
                     self.__render_weapon(camera_offset, left_sight, right_sight, weapon_component, active_hand_component)
-                frame_duration = animation_component.get_frame_duration()
-                time_accumulator = animation_component.get_time_accumulator()
-                current_time = time_accumulator + scaled_time
-                animation_component.set_time_accumulator(current_time)
-                if current_time >= frame_duration:
-                    animation_component.increase_image_index()
-                    animation_component.set_time_accumulator(current_time - frame_duration)
                 image = animation_component.get_image(left_sight, right_sight)
-            elif entity_is_interactive_object:
+            elif entity_type_flags & EntityTypeFlags.INTERACTIVE_OBJECT:
                 animation_condition_component = entity.get_component(AnimationConditionComponent)
                 entity_has_animation = animation_condition_component.get_animation_condition()
                 if entity_has_animation:
@@ -693,10 +750,11 @@ class RenderSystem(System):
                 else:
                     image_component = entity.get_component(SingleImageComponent)
                     image = image_component.get_image()
-            elif entity_is_bullet:
+            elif entity_type_flags & EntityTypeFlags.BULLET:
                 bullet_image_component = entity.get_component(BulletImageComponent)
                 image = bullet_image_component.get_image()
-            self.__display.blit(image, current_entity_position)
+            if entity_is_visible:
+                self.__display.blit(image, current_entity_position)
 
 
     def render_menu(self, scaled_time: float):
@@ -730,36 +788,66 @@ class RenderSystem(System):
         self.__display.blit(self.__cursor_image, self.__cursor_image.get_rect(center=pygame.mouse.get_pos()))
         pygame.display.flip()
 
-    def render_game_world(self, player: Entity, scaled_time: float):
+    def get_quadtree_nodes_number(self) -> int:
+        if not self.__quadtree:
+            return 0
+        return self.__quadtree.get_nodes_number()
+
+    def __render_overlay(self, overlay_lines: list[(str, str)]):
+        white_colour = (255, 255, 255)
+        x, y = 10, 60
+        value_x = x + 200
+        line_height = self.__overlay_font.get_linesize()
+        overlay_width = 420
+        overlay_height = line_height * len(overlay_lines) + 10
+        overlay_background = pygame.Surface((overlay_width, overlay_height), pygame.SRCALPHA)
+        overlay_background.fill((0, 0, 0, 170))
+        self.__display.blit(overlay_background, (x - 5, y - 5))
+        for name, value in overlay_lines:
+            self.__display.blit(self.__overlay_font.render(name, True, white_colour), (x, y))
+            self.__display.blit(self.__overlay_font.render(value, True, white_colour), (value_x, y))
+            y += line_height
+
+    def render_game_world(self, player: Entity, scaled_time: float, overlay_lines: list[(str, str)] = None):
+        profiler = self.__profiler
         camera_offset = CameraOffsetCalculation.calculate_camera_offset(player)
         self.__display.fill('black')
+        profiler.begin_section('render.background')
         self.__render_background(camera_offset)
+        profiler.end_section('render.background')
+        profiler.begin_section('render.entities')
+        self.__update_character_animations(scaled_time)
         self.__render_entities(camera_offset, scaled_time)
+        profiler.end_section('render.entities')
+        profiler.begin_section('render.interface')
         self.__render_interface(player, scaled_time)
         self.__display.blit(self.__crosshair_image, self.__crosshair_image.get_rect(center = pygame.mouse.get_pos()))
+        if overlay_lines:
+            self.__render_overlay(overlay_lines)
+        profiler.end_section('render.interface')
+        profiler.begin_section('render.present')
         pygame.display.flip()
+        profiler.end_section('render.present')
 
 
 class InputSystem(System):
 
     @staticmethod
-    def __process_keyboard_input(animation_component: AnimationComponent, position_component: PositionComponent, hit_box_component: HitBoxComponent, moving_distance_component: MovingDistanceComponent, active_hand_component: ActiveHandComponent, scaled_time: float):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_w] or keys[pygame.K_s] or keys[pygame.K_d] or keys[pygame.K_a]:
+    def __process_keyboard_input(animation_component: AnimationComponent, position_component: PositionComponent, moving_distance_component: MovingDistanceComponent, input_frame: InputFrame, scaled_time: float):
+        move_up, move_down, move_right, move_left = input_frame.get_moving_keys()
+        if move_up or move_down or move_right or move_left:
             animation_component.activate_animation()
             moving_distance = moving_distance_component.get_moving_distance()
             delta_x, delta_y = 0, 0
-            if keys[pygame.K_w]:
+            if move_up:
                 delta_y -= moving_distance * scaled_time
-            if keys[pygame.K_s]:
+            if move_down:
                 delta_y += moving_distance * scaled_time
-            if keys[pygame.K_d]:
+            if move_right:
                 delta_x += moving_distance * scaled_time
-            if keys[pygame.K_a]:
+            if move_left:
                 delta_x -= moving_distance * scaled_time
             position_component.update_position(delta_x, delta_y)
-            hit_box_component.update_coordinates(delta_x, delta_y)
-            active_hand_component.update_coordinates(delta_x, delta_y)
         else:
             animation_component.deactivate_animation()
 
@@ -805,9 +893,9 @@ class InputSystem(System):
         weapon_component.set_weapon_muzzle_coord(muzzle_position.x, muzzle_position.y)
 
     @staticmethod
-    def __process_mouse_input(camera_offset: (float, float), sight_component: SightComponent, active_hand_component: ActiveHandComponent, weapon_component: WeaponComponent, position_component: PositionComponent, enemy_is_melee: bool, enemy_is_angry: bool, target_entity: Entity = None):
+    def __process_mouse_input(camera_offset: (float, float), sight_component: SightComponent, active_hand_component: ActiveHandComponent, weapon_component: WeaponComponent, position_component: PositionComponent, enemy_is_melee: bool, enemy_is_angry: bool, target_entity: Entity = None, input_frame: InputFrame = None):
         if not target_entity:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_frame.get_mouse_position()
             current_mouse_pos = pygame.math.Vector2(mouse_pos) + pygame.math.Vector2(camera_offset)
             target_x_coord, target_y_coord = current_mouse_pos
             target_entity_condition = False
@@ -820,7 +908,7 @@ class InputSystem(System):
             InputSystem.__process_angle(sight_component, active_hand_component, weapon_component, target_x_coord, target_y_coord, target_entity_condition, enemy_is_angry)
 
     @staticmethod
-    def process_input(entity: Entity, scaled_time: float, target_entity: Entity = None):
+    def process_input(entity: Entity, scaled_time: float, target_entity: Entity = None, input_frame: InputFrame = None):
         if not target_entity:
             camera_offset = CameraOffsetCalculation.calculate_camera_offset(entity)
             animation_component = entity.get_component(AnimationComponent)
@@ -828,7 +916,6 @@ class InputSystem(System):
             position_component = entity.get_component(PositionComponent)
             moving_distance_component = entity.get_component(MovingDistanceComponent)
             weapon_component = entity.get_component(WeaponComponent)
-            hit_box_component = entity.get_component(HitBoxComponent)
             active_hand_component = entity.get_component(ActiveHandComponent)
             enemy_is_melee = False
             enemy_is_angry = False
@@ -838,22 +925,23 @@ class InputSystem(System):
             position_component = entity.get_component(PositionComponent)
             moving_distance_component = entity.get_component(MovingDistanceComponent)
             weapon_component = entity.get_component(WeaponComponent)
-            hit_box_component = entity.get_component(HitBoxComponent)
             active_hand_component = entity.get_component(ActiveHandComponent)
             enemy_condition_component = entity.get_component(EnemyConditionComponent)
             enemy_is_melee = enemy_condition_component.get_melee_condition()
             enemy_is_angry = enemy_condition_component.get_status()
         if not target_entity:
-            InputSystem.__process_keyboard_input(animation_component, position_component, hit_box_component, moving_distance_component, active_hand_component, scaled_time)
-        InputSystem.__process_mouse_input(camera_offset, sight_component, active_hand_component, weapon_component, position_component, enemy_is_melee, enemy_is_angry, target_entity)
+            InputSystem.__process_keyboard_input(animation_component, position_component, moving_distance_component, input_frame, scaled_time)
+        InputSystem.__process_mouse_input(camera_offset, sight_component, active_hand_component, weapon_component, position_component, enemy_is_melee, enemy_is_angry, target_entity, input_frame)
 
 
 class BulletSystem(System):
 
-    def __init__(self, list_of_bullets: list[Entity], main_entities: list[Entity], entities_with_collision: list[Entity]):
+    def __init__(self, list_of_bullets: list[Entity], main_entities: list[Entity], entities_with_collision: list[Entity], world: World, command_buffer: EntityCommandBuffer):
         self.__bullets = list_of_bullets
+        self.__world = world
         self.__main_entities = main_entities
         self.__entities_with_collision = entities_with_collision
+        self.__command_buffer = command_buffer
 
     @staticmethod
     def __get_rotated_rect_vertices(mid_left: (float, float), bullet_size: (int, int), angle: float) -> list[[float, float]]:
@@ -886,10 +974,9 @@ class BulletSystem(System):
         return [rotated_top_left, rotated_top_right, rotated_bottom_left, rotated_bottom_right, center]
 
     @staticmethod
-    def __process_coordinates(camera_offset: (float, float), muzzle_x_coord: int, muzzle_y_coord: int, weapon_accuracy: int, multiple_bullet_condition: bool, bullet_size: (int, int), target_entity: Entity = None) -> list[(float, float, float)]:
+    def __process_coordinates(camera_offset: (float, float), muzzle_x_coord: int, muzzle_y_coord: int, weapon_accuracy: int, multiple_bullet_condition: bool, bullet_size: (int, int), random_generator: Random, target_entity: Entity = None, mouse_position: (int, int) = (0, 0)) -> list[(float, float, float)]:
         bullets = []
         if not target_entity:
-            mouse_position = pygame.mouse.get_pos()
             current_mouse_position = pygame.math.Vector2(mouse_position) + pygame.math.Vector2(camera_offset)
             target_x_coord, target_y_coord = current_mouse_position
         else:
@@ -898,7 +985,7 @@ class BulletSystem(System):
         delta_x = target_x_coord - muzzle_x_coord
         delta_y = target_y_coord - muzzle_y_coord
         angle = atan2(delta_y, delta_x)
-        spread_angle = radians(gauss(0, weapon_accuracy))
+        spread_angle = radians(random_generator.gauss(0, weapon_accuracy))
         if multiple_bullet_condition:
             extra_angle = radians(5)
             first_bullet_final_angle = angle + spread_angle
@@ -926,7 +1013,7 @@ class BulletSystem(System):
         return bullets
 
     @staticmethod
-    def create_bullet(entity: Entity, new_bullets: list[Entity], target_entity: Entity = None) -> list[Entity]:
+    def create_bullet(entity: Entity, new_bullets: list[Entity], random_generator: Random, target_entity: Entity = None, mouse_position: (int, int) = (0, 0)) -> list[Entity]:
         type_component = entity.get_component(TypeComponent)
         entity_is_player, entity_is_enemy = type_component.get_character_type()
         if not target_entity:
@@ -936,6 +1023,8 @@ class BulletSystem(System):
         weapon_component = entity.get_component(WeaponComponent)
         fire_condition = weapon_component.get_fire_condition()
         if fire_condition:
+            transform_storage = Entity.get_world().get_transform_storage()
+            bullet_pool = Entity.get_world().get_bullet_pool()
             damage = weapon_component.get_damage()
             multiple_bullet_condition = weapon_component.get_multiple_bullet_condition()
             weapon_muzzle_x_coord, weapon_muzzle_y_coord = weapon_component.get_weapon_muzzle_coord()
@@ -943,7 +1032,8 @@ class BulletSystem(System):
             bullet_image_path = weapon_component.get_bullet_image_path()
             bullet_speed = weapon_component.get_bullet_speed()
             bullet_size = weapon_component.get_bullet_size()
-            bullets = BulletSystem.__process_coordinates(camera_offset, weapon_muzzle_x_coord, weapon_muzzle_y_coord, weapon_accuracy, multiple_bullet_condition, bullet_size, target_entity)
+            bullet_lifetime = min(weapon_component.get_bullet_lifetime(), weapon_component.get_bullet_range() / bullet_speed)
+            bullets = BulletSystem.__process_coordinates(camera_offset, weapon_muzzle_x_coord, weapon_muzzle_y_coord, weapon_accuracy, multiple_bullet_condition, bullet_size, random_generator, target_entity, mouse_position)
             for bullet_info in bullets:
                 angle, x_direction, y_direction, points = bullet_info
                 top_left, top_right, bottom_left, bottom_right, center = points
@@ -953,44 +1043,50 @@ class BulletSystem(System):
                 else:
                     belong_to_player, belong_to_enemy = False, True
                 is_rotated = True
-                bullet = Entity()
-                bullet.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy))
-                bullet.add_component(DamageComponent(damage))
-                bullet.add_component(PositionComponent(center[0], center[1]))
-                bullet.add_component(MovingDistanceComponent(bullet_speed))
-                bullet.add_component(BulletImageComponent(bullet_image_path, -angle))
-                bullet.add_component(BulletDirectionComponent(x_direction, y_direction))
-                bullet.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right, is_rotated))
-                bullet.add_component(CollisionComponent())
-                bullet.add_component(BulletStatusComponent())
-                bullet.add_component(BelongingComponent(belong_to_player, belong_to_enemy))
+                velocity = (x_direction * bullet_speed, y_direction * bullet_speed)
+                bullet = bullet_pool.acquire()
+                if bullet:
+                    slot = transform_storage.allocate(bullet, center, [top_left, top_right, bottom_right, bottom_left], velocity)
+                    bullet.get_component(DamageComponent).set_damage(damage)
+                    bullet.get_component(PositionComponent).set_slot(slot)
+                    bullet.get_component(MovingDistanceComponent).set_moving_distance(bullet_speed)
+                    bullet.get_component(BulletImageComponent).set_image(bullet_image_path, -angle)
+                    bullet.get_component(BulletDirectionComponent).set_direction(x_direction, y_direction)
+                    bullet.get_component(HitBoxComponent).set_slot(slot)
+                    bullet.get_component(CollisionComponent).set_collision_condition(False)
+                    bullet.get_component(BulletStatusComponent).set_bullet_status(True)
+                    bullet.get_component(BelongingComponent).set_belonging(belong_to_player, belong_to_enemy)
+                else:
+                    bullet = Entity()
+                    slot = transform_storage.allocate(bullet, center, [top_left, top_right, bottom_right, bottom_left], velocity)
+                    bullet.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy))
+                    bullet.add_component(DamageComponent(damage))
+                    bullet.add_component(PositionView(transform_storage, slot))
+                    bullet.add_component(MovingDistanceComponent(bullet_speed))
+                    bullet.add_component(BulletImageComponent(bullet_image_path, -angle))
+                    bullet.add_component(BulletDirectionComponent(x_direction, y_direction))
+                    bullet.add_component(HitBoxView(transform_storage, slot, is_rotated))
+                    bullet.add_component(CollisionComponent())
+                    bullet.add_component(BulletStatusComponent())
+                    bullet.add_component(BelongingComponent(belong_to_player, belong_to_enemy))
+                bullet_pool.track(bullet, bullet_lifetime)
                 new_bullets.append(bullet)
 
     def insert_bullets(self, new_bullets: list[Entity]):
         for bullet in new_bullets:
-            self.__bullets.append(bullet)
-            self.__main_entities.append(bullet)
-            self.__entities_with_collision.append(bullet)
+            self.__command_buffer.spawn(bullet, self.__bullets, self.__main_entities, self.__entities_with_collision)
 
     def update_bullet(self, scaled_time: float):
-        for bullet in self.__bullets:
-            position_component = bullet.get_component(PositionComponent)
-            hit_box_component = bullet.get_component(HitBoxComponent)
-            moving_distance_component = bullet.get_component(MovingDistanceComponent)
-            direction_component = bullet.get_component(BulletDirectionComponent)
-            x_direction, y_direction = direction_component.get_direction()
-            distance = moving_distance_component.get_moving_distance()
-            delta_x = x_direction * distance * scaled_time
-            delta_y = y_direction * distance * scaled_time
-            position_component.update_position(delta_x, delta_y)
-            hit_box_component.update_coordinates(delta_x, delta_y)
+        bullet_pool = self.__world.get_bullet_pool()
+        for bullet in bullet_pool.update(scaled_time):
+            self.__command_buffer.despawn(bullet, self.__bullets, self.__main_entities, self.__entities_with_collision, release=bullet_pool.release)
+        self.__world.get_transform_storage().integrate(scaled_time)
 
 
 class WeaponSystem(System):
 
     def __init__(self):
         self.__player_weapon_component = None
-        self.__reload_start_time = 0
 
     def save_weapon_component(self, player: Entity):
         self.__player_weapon_component = player.get_component(WeaponComponent)
@@ -1002,7 +1098,7 @@ class WeaponSystem(System):
         if current_magazine_size < magazine_size and not reload_condition:
             self.__player_weapon_component.switch_reload_condition()
             self.__player_weapon_component.set_fire_condition(False)
-            self.__reload_start_time = pygame.time.get_ticks()
+            self.__player_weapon_component.set_reload_time_accumulator(0)
 
     def shoot(self):
         fire_condition = self.__player_weapon_component.get_fire_condition()
@@ -1013,12 +1109,13 @@ class WeaponSystem(System):
             else:
                 self.__player_weapon_component.set_fire_condition(False)
 
-    def update(self):
+    def update(self, scaled_time: float):
         reload_condition = self.__player_weapon_component.get_reload_condition()
         if reload_condition:
             weapon_reload_duration = self.__player_weapon_component.get_reload_duration()
-            current_time = pygame.time.get_ticks()
-            if current_time - self.__reload_start_time >= weapon_reload_duration:
+            reload_time_accumulator = self.__player_weapon_component.get_reload_time_accumulator() + scaled_time * 1000
+            self.__player_weapon_component.set_reload_time_accumulator(reload_time_accumulator)
+            if reload_time_accumulator >= weapon_reload_duration:
                 self.__player_weapon_component.reload()
                 self.__player_weapon_component.set_fire_condition(True)
                 self.__player_weapon_component.switch_reload_condition()
@@ -1029,6 +1126,7 @@ class CollisionSystem(System):
     def __init__(self, entities_with_collision: list[Entity]):
         self.__entities_with_collision = entities_with_collision
         self.__player = None
+        self.__quadtree = None
 
     def save_player(self, player: Entity):
         self.__player = player
@@ -1047,9 +1145,10 @@ class CollisionSystem(System):
     def __check_belonging(self, character: Entity, bullet: Entity) -> bool:
         type_component = character.get_component(TypeComponent)
         belonging_component = bullet.get_component(BelongingComponent)
-        character_is_player, character_is_enemy = type_component.get_character_type()
+        character_type_flags = type_component.get_type_flags()
+        character_is_enemy = character_type_flags & EntityTypeFlags.ENEMY
         bullet_belong_to_player, bullet_belong_to_enemy = belonging_component.get_belonging()
-        if (character_is_enemy and bullet_belong_to_player) or (character_is_player and bullet_belong_to_enemy):
+        if (character_is_enemy and bullet_belong_to_player) or (character_type_flags & EntityTypeFlags.PLAYER and bullet_belong_to_enemy):
             if character_is_enemy:
                 self.__set_enemy_anger(character)
             return True
@@ -1066,7 +1165,8 @@ class CollisionSystem(System):
             entity_x, entity_y = position_component.get_position()
             boundary = hit_box_component.get_hit_box()
             entity_is_rotated = hit_box_component.get_rotation_condition()
-            point = Point(entity_x, entity_y, entity, boundary, entity_is_rotated)
+            type_component = entity.get_component(TypeComponent)
+            point = Point(entity_x, entity_y, entity, boundary, entity_is_rotated, type_component.get_type_flags())
             quadtree.insert(point)
 
     def __calculate_bullet_damage(self, entity_is_character: Entity, entity_is_bullet: Entity):
@@ -1120,21 +1220,13 @@ class CollisionSystem(System):
         minimum_translation_vector_x, minimum_translation_vector_y = self.__calculate_minimum_translation_vector(entity_is_character, entity_is_wall)
         position_component = entity_is_character.get_component(PositionComponent)
         hit_box_component = entity_is_character.get_component(HitBoxComponent)
-        weapon_component = entity_is_character.get_component(WeaponComponent)
-        active_hand_component = entity_is_character.get_component(ActiveHandComponent)
         position_component.update_position(minimum_translation_vector_x, minimum_translation_vector_y)
-        hit_box_component.update_coordinates(minimum_translation_vector_x, minimum_translation_vector_y)
-        if weapon_component:
-            weapon_component.update_weapon_muzzle_coord(minimum_translation_vector_x, minimum_translation_vector_y)
-        if active_hand_component:
-            active_hand_component.update_coordinates(minimum_translation_vector_x, minimum_translation_vector_y)
+        hit_box_component.resolve_coordinates()
 
     def __check_two_characters_collision(self, first_character: Entity, second_character: Entity) -> bool:
-        first_character_type_component = first_character.get_component(TypeComponent)
-        second_character_type_component = second_character.get_component(TypeComponent)
-        first_character_is_player, first_character_is_enemy = first_character_type_component.get_character_type()
-        second_character_is_player, second_character_is_enemy = second_character_type_component.get_character_type()
-        if first_character_is_player and second_character_is_enemy:
+        first_character_type_flags = first_character.get_component(TypeComponent).get_type_flags()
+        second_character_type_flags = second_character.get_component(TypeComponent).get_type_flags()
+        if first_character_type_flags & EntityTypeFlags.PLAYER and second_character_type_flags & EntityTypeFlags.ENEMY:
             second_character_enemy_condition_component = second_character.get_component(EnemyConditionComponent)
             second_character_is_melee_enemy = second_character_enemy_condition_component.get_melee_condition()
             if second_character_is_melee_enemy:
@@ -1144,7 +1236,7 @@ class CollisionSystem(System):
                 first_character_health_component = first_character.get_component(HealthComponent)
                 first_character_health_component.update_health(melee_damage)
                 return True
-        elif first_character_is_enemy and second_character_is_player:
+        elif first_character_type_flags & EntityTypeFlags.ENEMY and second_character_type_flags & EntityTypeFlags.PLAYER:
             first_character_enemy_condition_component = first_character.get_component(EnemyConditionComponent)
             first_character_is_melee_enemy = first_character_enemy_condition_component.get_melee_condition()
             if first_character_is_melee_enemy:
@@ -1157,32 +1249,39 @@ class CollisionSystem(System):
         return False
 
     def __find_collision(self, quadtree: QuadTree):
+        character_flag = EntityTypeFlags.CHARACTER
+        bullet_flag = EntityTypeFlags.BULLET
+        wall_flag = EntityTypeFlags.WALL
+        player_flag = EntityTypeFlags.PLAYER
+        interactive_object_flag = EntityTypeFlags.INTERACTIVE_OBJECT
         for main_entity in self.__entities_with_collision:
             main_entity_hit_box_component = main_entity.get_component(HitBoxComponent)
-            main_entity_type_component = main_entity.get_component(TypeComponent)
-            main_entity_is_character, main_entity_is_bullet, main_entity_is_wall = main_entity_type_component.get_type()
+            main_entity_type_flags = main_entity.get_component(TypeComponent).get_type_flags()
+            main_entity_is_character = main_entity_type_flags & character_flag
+            main_entity_is_bullet = main_entity_type_flags & bullet_flag
+            main_entity_is_wall = main_entity_type_flags & wall_flag
+            collision_mask = EntityTypeFlags.get_collision_mask(main_entity_type_flags)
             region = main_entity_hit_box_component.get_hit_box()
             is_rotated = main_entity_hit_box_component.get_rotation_condition()
-            collided_entities = quadtree.get_entities(region, is_rotated, main_entity)
+            collided_entities = quadtree.get_entities(region, is_rotated, main_entity, collision_mask)
             for entity in collided_entities:
                 entities_is_collided = False
-                entity_type_component = entity.get_component(TypeComponent)
-                entity_is_character, entity_is_bullet, entity_is_wall = entity_type_component.get_type()
-                if main_entity_is_wall and entity_is_character:
+                entity_type_flags = entity.get_component(TypeComponent).get_type_flags()
+                if main_entity_is_wall and entity_type_flags & character_flag:
                     self.__calculate_distance(entity, main_entity)
                     entities_is_collided = True
-                elif main_entity_is_character and entity_is_wall:
+                elif main_entity_is_character and entity_type_flags & wall_flag:
                     self.__calculate_distance(main_entity, entity)
                     entities_is_collided = True
-                elif main_entity_is_character and entity_is_bullet:
+                elif main_entity_is_character and entity_type_flags & bullet_flag:
                     if self.__check_belonging(main_entity, entity):
                         self.__calculate_bullet_damage(main_entity, entity)
                     entities_is_collided = True
-                elif main_entity_is_bullet and entity_is_character:
+                elif main_entity_is_bullet and entity_type_flags & character_flag:
                     if self.__check_belonging(entity, main_entity):
                         self.__calculate_bullet_damage(entity, main_entity)
                     entities_is_collided = True
-                elif (main_entity_is_bullet and entity_is_wall) or (main_entity_is_wall and entity_is_bullet):
+                elif (main_entity_is_bullet and entity_type_flags & wall_flag) or (main_entity_is_wall and entity_type_flags & bullet_flag):
                     if main_entity_is_bullet:
                         bullet_status_component = main_entity.get_component(BulletStatusComponent)
                         bullet_status_component.switch_bullet_status()
@@ -1190,16 +1289,12 @@ class CollisionSystem(System):
                         bullet_status_component = entity.get_component(BulletStatusComponent)
                         bullet_status_component.switch_bullet_status()
                     entities_is_collided = True
-                elif main_entity_is_character and entity_is_character:
+                elif main_entity_is_character and entity_type_flags & character_flag:
                     if self.__check_two_characters_collision(main_entity, entity):
                         entities_is_collided = True
-                else:
-                    main_entity_is_interactive_object = main_entity_type_component.check_interactive_condition()
-                    entity_is_interactive_object = entity_type_component.check_interactive_condition()
-                    main_entity_is_player, main_entity_is_enemy = main_entity_type_component.get_character_type()
-                    entity_is_player, entity_is_enemy = entity_type_component.get_character_type()
-                    if (main_entity_is_player and entity_is_interactive_object) or (main_entity_is_interactive_object and entity_is_player):
-                        entities_is_collided = True
+                elif (main_entity_type_flags & player_flag and entity_type_flags & interactive_object_flag) or \
+                        (main_entity_type_flags & interactive_object_flag and entity_type_flags & player_flag):
+                    entities_is_collided = True
                 if entities_is_collided:
                     entity_collision_component = entity.get_component(CollisionComponent)
                     entity_collision_component.switch_collision_condition()
@@ -1211,6 +1306,12 @@ class CollisionSystem(System):
         quadtree = QuadTree(self.__boundary, capacity)
         self.__insert_entities(quadtree)
         self.__find_collision(quadtree)
+        self.__quadtree = quadtree
+
+    def get_quadtree_nodes_number(self) -> int:
+        if not self.__quadtree:
+            return 0
+        return self.__quadtree.get_nodes_number()
 
     def check_nearby_entities_collision(self):
 
@@ -1224,7 +1325,7 @@ class CollisionSystem(System):
         player_position = player_position_component.get_position()
         for entity in self.__entities_with_collision:
             entity_type_component = entity.get_component(TypeComponent)
-            if entity_type_component.check_interactive_condition() and entity != self.__player:
+            if entity_type_component.has_type(EntityTypeFlags.INTERACTIVE_OBJECT) and entity != self.__player:
                 entity_position_component = entity.get_component(PositionComponent)
                 entity_position = entity_position_component.get_position()
                 distance_to_player = calculate_distance(player_position, entity_position)
@@ -1239,11 +1340,14 @@ class CollisionSystem(System):
 
 class EntitySystem(System):
 
-    def __init__(self, entities_with_collision: list[Entity], bullets: list[Entity], main_entities: list[Entity], enemies: list[Entity]):
+    def __init__(self, entities_with_collision: list[Entity], bullets: list[Entity], main_entities: list[Entity], enemies: list[Entity], loot_random_generator: Random,
+                 command_buffer: EntityCommandBuffer):
         self.__entities_with_collision = entities_with_collision
         self.__bullets = bullets
         self.__main_entities = main_entities
         self.__enemies = enemies
+        self.__loot_random_generator = loot_random_generator
+        self.__command_buffer = command_buffer
         self.__player = None
 
     def save_player(self, player: Entity):
@@ -1252,52 +1356,31 @@ class EntitySystem(System):
     def __add_player_money(self):
         money_collection_component = self.__player.get_component(MoneyCollectionComponent)
         player_amount_of_money = money_collection_component.get_amount_of_money()
-        coin = randint(10, 50)
+        coin = self.__loot_random_generator.randint(10, 50)
         money_collection_component.set_amount_of_money(player_amount_of_money + coin)
 
     def __create_coin(self, enemy: Entity):
         enemy_position_component = enemy.get_component(PositionComponent)
         enemy_x_position, enemy_y_position = enemy_position_component.get_position()
-        coin_animation = 'textures/interactive_objects/coin'
-        coin_size = (32, 32)
-        coin_width = coin_height = 64
-        coin_top_left = (enemy_x_position - coin_width//2, enemy_y_position - coin_height//2)
-        coin_top_right = (enemy_x_position + coin_width//2, enemy_y_position - coin_height//2)
-        coin_bottom_right = (enemy_x_position + coin_width//2, enemy_y_position + coin_height//2)
-        coin_bottom_left = (enemy_x_position - coin_width//2, enemy_y_position + coin_height//2)
-        is_player, is_character, is_bullet, is_wall, is_enemy, is_interactive_object = False, False, False, False, False, True
-        coin_has_animation = True
-        coin = Entity()
-        coin.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy, is_interactive_object))
-        coin.add_component(PositionComponent(enemy_x_position, enemy_y_position))
-        coin.add_component(HitBoxComponent(coin_top_left, coin_top_right, coin_bottom_left, coin_bottom_right))
-        coin.add_component(SingeAnimationComponent(coin_animation, coin_size))
-        coin.add_component(CollisionComponent())
-        coin.add_component(AnimationConditionComponent(coin_has_animation))
-        coin.add_component(ActionComponent([self.__add_player_money]))
-        coin.add_component(ExistenceConditionComponent(True))
-
-        self.__main_entities.append(coin)
-        self.__entities_with_collision.append(coin)
+        coin = PrefabLibrary.get_coin().instantiate(enemy_x_position, enemy_y_position, [self.__add_player_money])
+        self.__command_buffer.spawn(coin, self.__main_entities, self.__entities_with_collision)
 
     def update_entities_condition(self):
         for entity in self.__entities_with_collision:
             type_component = entity.get_component(TypeComponent)
             collision_component = entity.get_component(CollisionComponent)
-            entity_is_character, entity_is_bullet, entity_is_wall = type_component.get_type()
-            entity_is_interactive_object = type_component.check_interactive_condition()
+            entity_type_flags = type_component.get_type_flags()
             entity_is_collided = collision_component.get_collision_condition()
-            if entity_is_bullet and entity_is_collided:
+            if entity_type_flags & EntityTypeFlags.BULLET and entity_is_collided:
                 bullet_status_component = entity.get_component(BulletStatusComponent)
                 bullet_is_exits = bullet_status_component.get_bullet_status()
                 if not bullet_is_exits:
-                    self.__entities_with_collision.remove(entity)
-                    self.__bullets.remove(entity)
-                    self.__main_entities.remove(entity)
+                    bullet_pool = Entity.get_world().get_bullet_pool()
+                    self.__command_buffer.despawn(entity, self.__entities_with_collision, self.__bullets, self.__main_entities, release=bullet_pool.release)
                 else:
                     collision_component.switch_collision_condition()
-            elif entity_is_character and entity_is_collided:
-                entity_is_player, entity_is_enemy = type_component.get_character_type()
+            elif entity_type_flags & EntityTypeFlags.CHARACTER and entity_is_collided:
+                entity_is_enemy = entity_type_flags & EntityTypeFlags.ENEMY
                 entity_is_exploded = False
                 if entity_is_enemy:
                     enemy_condition_component = entity.get_component(EnemyConditionComponent)
@@ -1308,16 +1391,17 @@ class EntitySystem(System):
                 health_component = entity.get_component(HealthComponent)
                 entity_is_alive = health_component.get_living_condition()
                 if not entity_is_alive or entity_is_exploded:
-                    self.__entities_with_collision.remove(entity)
-                    self.__main_entities.remove(entity)
+                    release = None if entity_type_flags & EntityTypeFlags.PLAYER else Entity.destroy
                     if entity_is_enemy:
-                        self.__enemies.remove(entity)
+                        self.__command_buffer.despawn(entity, self.__entities_with_collision, self.__main_entities, self.__enemies, release=release)
                         self.__create_coin(entity)
+                    else:
+                        self.__command_buffer.despawn(entity, self.__entities_with_collision, self.__main_entities, release=release)
                 else:
                     collision_component.switch_collision_condition()
-            elif entity_is_wall and entity_is_collided:
+            elif entity_type_flags & EntityTypeFlags.WALL and entity_is_collided:
                 collision_component.switch_collision_condition()
-            elif entity_is_interactive_object and entity_is_collided:
+            elif entity_type_flags & EntityTypeFlags.INTERACTIVE_OBJECT and entity_is_collided:
                 action_component = entity.get_component(ActionComponent)
                 action_is_ready = action_component.get_action_readiness()
                 if action_is_ready:
@@ -1325,15 +1409,15 @@ class EntitySystem(System):
                     existence_condition_component = entity.get_component(ExistenceConditionComponent)
                     entity_disappear_after_interaction = existence_condition_component.get_existence_condition()
                     if entity_disappear_after_interaction:
-                        self.__entities_with_collision.remove(entity)
-                        self.__main_entities.remove(entity)
+                        self.__command_buffer.despawn(entity, self.__entities_with_collision, self.__main_entities)
                     action_component.set_action_readiness(False)
                 collision_component.switch_collision_condition()
 
 
 class DungeonSystem(System):
 
-    def __init__(self, entities_with_collision: list[Entity], background_entities: list[Entity], enemies: list[Entity], main_entities: list[Entity], portal_actions: list):
+    def __init__(self, entities_with_collision: list[Entity], background_entities: list[Entity], enemies: list[Entity], main_entities: list[Entity], portal_actions: list, dungeon_random_generator: Random, enemy_random_generator: Random,
+                 world_streamer: WorldStreamer, dungeon_pool: DungeonPool = None):
         self.__is_dungeon = False
         self.__is_dungeon_end = False
         self.__entities_with_collision = entities_with_collision
@@ -1344,6 +1428,11 @@ class DungeonSystem(System):
         self.__rooms = []
         self.__player = None
         self.__portal_actions = portal_actions
+        self.__dungeon_random_generator = dungeon_random_generator
+        self.__world_streamer = world_streamer
+        self.__dungeon_pregenerator = DungeonPregenerator(dungeon_random_generator)
+        self.__enemy_placement = EnemyPlacement(enemy_random_generator)
+        self.__dungeon_pool = dungeon_pool
 
     def save_player(self, player: Entity):
         self.__player = player
@@ -1351,105 +1440,46 @@ class DungeonSystem(System):
     def get_player_spawn_position(self) -> (int, int):
         return self.__player_spawn_position
 
-    def __create_enemy_entity(self, top_left: (float, float), top_right: (float, float), bottom_right: (float, float), bottom_left: (float, float), center: (int, int), left_active_hand: list[int, int], right_active_hand: list[int, int], patrol_points: list[(int, int)], melee_enemy_condition: bool):
-        enemy = Entity()
-        is_player, is_character, is_bullet, is_wall, is_enemy = False, True, False, False, True
-        if melee_enemy_condition:
-            moving_right_images = 'textures/animations/grenade_enemy_R'
-            moving_left_images = 'textures/animations/grenade_enemy_L'
-            health = 100
-            moving_distance = 380
-            enemy.add_component(OwnDamageComponent())
-        else:
-            weapon = randint(1, 10)
-            if weapon in range(1, 8):
-                handgun, rifle, shotgun = True, False, False
-            elif weapon in range(8, 10):
-                handgun, rifle, shotgun = False, True, False
-            else:
-                handgun, rifle, shotgun = False, False, True
-            moving_right_images = 'textures/animations/enemy_move_R'
-            moving_left_images = 'textures/animations/enemy_move_L'
-            health = 150
-            moving_distance = 300
-            enemy.add_component(ActiveHandComponent(left_active_hand, right_active_hand))
-            enemy.add_component(WeaponComponent([handgun, rifle, shotgun]))
-            enemy.add_component(EnemyActionQueueComponent())
-        enemy.add_component(HealthComponent(health))
-        enemy.add_component(PositionComponent(center[0], center[1]))
-        enemy.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
-        enemy.add_component(AnimationComponent(moving_right_images, moving_left_images))
-        enemy.add_component(MovingDistanceComponent(moving_distance))
-        enemy.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy))
-        enemy.add_component(CollisionComponent())
-        enemy.add_component(SightComponent())
-        enemy.add_component(EnemyConditionComponent(patrol_points, melee_enemy_condition))
+    def __add_enemy(self, enemy: Entity):
         self.__enemies.append(enemy)
         self.__entities_with_collision.append(enemy)
         self.__main_entities.append(enemy)
 
-    def __calculate_patrol_points(self, first_point_x: int, first_point_y: int, room_start_x: int, room_start_y: int, room_width: int, room_height: int, enemy_width: int, enemy_height: int, patrol_points: list[(int, int)]) -> (bool, bool, bool, bool):
-        half_room_width = room_width // 2
-        half_room_height = room_height // 2
-        first_quarter = ((room_start_x, room_start_x + half_room_width), (room_start_y, room_start_y + half_room_height))
-        second_quarter = ((room_start_x + half_room_width, room_start_x + room_width), (room_start_y, room_start_y + half_room_height))
-        third_quarter = ((room_start_x, room_start_x + half_room_width), (room_start_y + half_room_height, room_start_y + room_height))
-        fourth_quarter = ((room_start_x + half_room_width, room_start_x + room_width), (room_start_y + half_room_height, room_start_y + room_height))
-        quarters = [first_quarter, second_quarter, third_quarter, fourth_quarter]
-        for quarter in quarters:
-            if (quarter[0][0] <= first_point_x <= quarter[0][1]) and (quarter[1][0] <= first_point_y <= quarter[1][1]):
-                quarters.remove(quarter)
-                break
-        for chosen_quarter in quarters:
-            if not ((chosen_quarter[0][0] + enemy_width >= chosen_quarter[0][1] - enemy_width) or (chosen_quarter[1][0] + enemy_height >= chosen_quarter[1][1] - enemy_height)):
-                point_x = randint(chosen_quarter[0][0] + enemy_width, chosen_quarter[0][1] - enemy_width)
-                point_y = randint(chosen_quarter[1][0] + enemy_height, chosen_quarter[1][1] - enemy_height)
-                patrol_points.append((point_x, point_y))
-                quarters.remove(chosen_quarter)
-
-    def __create_enemies(self, room_start_x: int, room_start_y: int, room_width: int, room_height: int, block_size: int):
-        real_room_start_x = room_start_x * block_size
-        real_room_start_y = room_start_y * block_size
-        real_room_width = room_width * block_size
-        real_room_height = room_height * block_size
-        room_square = real_room_height * real_room_width
-        enemies_per_room_ratio = 150000
-        possible_enemies_number = room_square // enemies_per_room_ratio
-        for i in range(possible_enemies_number):
-            melee_enemy_condition = choice([True, False])
-            if melee_enemy_condition:
-                enemy_width = 32
-                enemy_height = 53
-            else:
-                enemy_width = 64
-                enemy_height = 100
-            enemy_center_x = randint(real_room_start_x + enemy_width, real_room_start_x + real_room_width - enemy_width)
-            enemy_center_y = randint(real_room_start_y + enemy_height, real_room_start_y + real_room_height - enemy_height)
-            top_left = [enemy_center_x - enemy_width // 2, enemy_center_y - enemy_height // 2]
-            bottom_left = [enemy_center_x - enemy_width // 2, enemy_center_y + enemy_height // 2]
-            top_right = [enemy_center_x + enemy_width // 2, enemy_center_y - enemy_height // 2]
-            bottom_right = [enemy_center_x + enemy_width // 2, enemy_center_y + enemy_height // 2]
-            center = [enemy_center_x, enemy_center_y]
-            right_active_hand = [top_left[0] + 60, top_left[1] + 58]
-            left_active_hand = [top_left[0] + 4, top_left[1] + 58]
-            patrol_points = [center]
-            self.__calculate_patrol_points(enemy_center_x, enemy_center_y, real_room_start_x,
-                    real_room_start_y, real_room_width, real_room_height, enemy_width, enemy_height, patrol_points)
-            self.__create_enemy_entity(top_left, top_right, bottom_right, bottom_left, center, left_active_hand, right_active_hand, patrol_points, melee_enemy_condition)
-
-    def __process_rooms(self):
-        block_size = WorldInfo.get_block_size()
-
-        self.__rooms.sort(key=lambda room: room.get_room_info()[2] * room.get_room_info()[3]) # sort by square
-
-        player_room_center_x, player_room_center_y = self.__rooms[0].get_room_center()
-        player_room_center_x *= block_size
-        player_room_center_y *= block_size
-        self.__player_spawn_position = (player_room_center_x, player_room_center_y)
-
-        for i in range(1, len(self.__rooms)):
-            room_start_x, room_start_y, room_width, room_height = self.__rooms[i].get_room_info()
-            self.__create_enemies(room_start_x, room_start_y, room_width, room_height, block_size)
+    def __create_enemy_entity(self, center_x: int, center_y: int, patrol_points: list[(int, int)], melee_enemy_condition: bool, weapons_list: list[bool] = None):
+        if melee_enemy_condition:
+            enemy = PrefabLibrary.get_melee_enemy().instantiate(center_x, center_y, patrol_points)
+        else:
+            if not weapons_list:
+                weapons_list = self.__enemy_placement.choose_weapons()
+            enemy = PrefabLibrary.get_ranged_enemy().instantiate(center_x, center_y, patrol_points, weapons_list)
+        self.__add_enemy(enemy)
+
+    def create_enemy(self, enemy_center_x: int, enemy_center_y: int, melee_enemy_condition: bool, patrol_points: list[(int, int)] = None, weapons_list: list[bool] = None):
+        if not patrol_points:
+            patrol_points = [[enemy_center_x, enemy_center_y]]
+        self.__create_enemy_entity(enemy_center_x, enemy_center_y, patrol_points, melee_enemy_condition, weapons_list)
+
+    def __take_pooled_dungeon(self) -> (DungeonLayout, list[SleepingEnemy]):
+        dungeon_index = self.__dungeon_random_generator.randrange(self.__dungeon_pool.get_dungeons_number())
+        Tracer.begin('load_pooled_dungeon', 'loading')
+        dungeon = self.__dungeon_pool.get_dungeon(dungeon_index)
+        Tracer.end('load_pooled_dungeon', 'loading')
+        return dungeon
+
+    def __take_dungeon_steps(self):
+        if self.__dungeon_pool:
+            return self.__take_pooled_dungeon()
+        dungeon_layout = yield from self.__dungeon_pregenerator.take_dungeon_layout_steps()
+        Tracer.begin('place_enemies', 'generation')
+        sleeping_enemies = self.__enemy_placement.place_enemies(dungeon_layout.get_rooms())
+        Tracer.end('place_enemies', 'generation')
+        return dungeon_layout, sleeping_enemies
+
+    def __spawn_enemy(self, sleeping_enemy: SleepingEnemy):
+        if WorldInfo.is_streaming():
+            self.__world_streamer.add_sleeping_enemy(sleeping_enemy)
+        else:
+            self.__add_enemy(sleeping_enemy.wake())
 
     def update_dungeon(self):
 
@@ -1471,7 +1501,7 @@ class DungeonSystem(System):
             portal.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy, is_interactive_object))
             portal.add_component(PositionComponent(x_coord, y_coord))
             portal.add_component(HitBoxComponent(portal_top_left, portal_top_right, portal_bottom_left, portal_bottom_right))
-            portal.add_component(SingeAnimationComponent(portal_animation_path, (portal_width, portal_height)))
+            portal.add_component(SingeAnimationComponent(SpriteLoader.load_sequence(portal_animation_path, (portal_width, portal_height))))
             portal.add_component(ActionComponent(portal_actions))
             portal.add_component(CollisionComponent())
             portal.add_component(AnimationConditionComponent(portal_has_animation))
@@ -1488,7 +1518,7 @@ class DungeonSystem(System):
             distance = sqrt(delta_x**2 + delta_y**2)
             return distance
 
-        if not self.__enemies and not self.__is_dungeon_end:
+        if not self.__enemies and not self.__world_streamer.get_sleeping_enemies_number() and not self.__is_dungeon_end:
             player_position_component = self.__player.get_component(PositionComponent)
             player_position = player_position_component.get_position()
             nearest_room_center = self.__rooms[0].get_room_center()
@@ -1502,24 +1532,33 @@ class DungeonSystem(System):
             create_portal(nearest_room_center)
             self.__is_dungeon_end = True
 
-    def create_dungeon(self) -> (int, int):
-        self.__rooms = []
-        minimal_room_size = WorldInfo.get_minimal_room_size()
-        world_map_size = WorldInfo.get_world_map_size()
-        world_map = [[0 for i in range(world_map_size)] for j in range(world_map_size)]
-        tree = BinaryTree(0, 0, world_map_size, world_map_size)
-        tree.create_dungeon(self.__entities_with_collision, self.__background_entities, world_map, minimal_room_size, self.__rooms)
-        self.__process_rooms()
+    def create_dungeon_steps(self):
+        dungeon_layout, sleeping_enemies = yield from self.__take_dungeon_steps()
+        self.__rooms = list(dungeon_layout.get_rooms())
+        self.__player_spawn_position = dungeon_layout.get_player_spawn_position()
+        world_map = dungeon_layout.get_world_map()
+        if WorldInfo.is_streaming():
+            self.__world_streamer.create_chunks(world_map, dungeon_layout.get_wall_rectangles())
+            yield 'entities', 1.0
+        else:
+            for progress in BinaryTree.create_dungeon_entities_steps(dungeon_layout, self.__entities_with_collision, self.__background_entities):
+                yield 'entities', progress
+        Tracer.begin('spawn_enemies', 'generation')
+        for index, sleeping_enemy in enumerate(sleeping_enemies):
+            self.__spawn_enemy(sleeping_enemy)
+            yield 'enemies', (index + 1) / len(sleeping_enemies)
+        Tracer.end('spawn_enemies', 'generation')
         self.__is_dungeon = True
 
     def create_hub(self):
         self.__is_dungeon = False
         hud_width, hub_height = WorldInfo.get_hub_map_size()
-        hub_map = [[0 for i in range(hud_width)] for j in range(hub_height)]
-        tree = BinaryTree(0, 0, hud_width, hub_height)
-        tree.create_hub(self.__entities_with_collision, self.__background_entities, hub_map)
+        hub_map = numpy.zeros((hub_height, hud_width), dtype=numpy.uint8)
+        BinaryTree.create_hub(self.__entities_with_collision, self.__background_entities, hub_map)
         self.__player_spawn_position = (600, 500)
         self.__is_dungeon = False
+        if not self.__dungeon_pool:
+            self.__dungeon_pregenerator.start()
 
     def check_dungeon_condition(self) -> bool:
         return self.__is_dungeon
@@ -1527,8 +1566,10 @@ class DungeonSystem(System):
 
 class EnemyManagementSystem(System):
 
-    def __init__(self, enemies: list[Entity]):
+    def __init__(self, enemies: list[Entity], ai_random_generator: Random, weapon_random_generator: Random):
         self.__enemies = enemies
+        self.__ai_random_generator = ai_random_generator
+        self.__weapon_random_generator = weapon_random_generator
         self.__player = None
 
     def save_player(self, player: Entity):
@@ -1549,10 +1590,8 @@ class EnemyManagementSystem(System):
 
     def __patrol(self, enemy: Entity, scaled_time: float):
         enemy_position_component = enemy.get_component(PositionComponent)
-        enemy_hit_box_component = enemy.get_component(HitBoxComponent)
         enemy_moving_distance_component = enemy.get_component(MovingDistanceComponent)
         enemy_animation_component = enemy.get_component(AnimationComponent)
-        enemy_active_hand_component = enemy.get_component(ActiveHandComponent)
         enemy_condition_component = enemy.get_component(EnemyConditionComponent)
         enemy_weapon_component = enemy.get_component(WeaponComponent)
         enemy_sight_component = enemy.get_component(SightComponent)
@@ -1568,9 +1607,6 @@ class EnemyManagementSystem(System):
         delta_x = vector_x * moving_distance * scaled_time
         delta_y = vector_y * moving_distance * scaled_time
         enemy_position_component.update_position(delta_x, delta_y)
-        enemy_hit_box_component.update_coordinates(delta_x, delta_y)
-        if enemy_active_hand_component:
-            enemy_active_hand_component.update_coordinates(delta_x, delta_y)
         if distance <= 10:
             enemy_condition_component.switch_to_next_point()
         if enemy_weapon_component:
@@ -1598,17 +1634,12 @@ class EnemyManagementSystem(System):
 
     def __move_towards_player(self, enemy: Entity, vector_x: float, vector_y: float, scaled_time: float):
         enemy_position_component = enemy.get_component(PositionComponent)
-        enemy_hit_box_component = enemy.get_component(HitBoxComponent)
         enemy_moving_distance_component = enemy.get_component(MovingDistanceComponent)
         enemy_animation_component = enemy.get_component(AnimationComponent)
-        enemy_active_hand_component = enemy.get_component(ActiveHandComponent)
         moving_distance = enemy_moving_distance_component.get_moving_distance()
         delta_x = vector_x * moving_distance * scaled_time
         delta_y = vector_y * moving_distance * scaled_time
         enemy_position_component.update_position(delta_x, delta_y)
-        enemy_hit_box_component.update_coordinates(delta_x, delta_y)
-        if enemy_active_hand_component:
-            enemy_active_hand_component.update_coordinates(delta_x, delta_y)
         enemy_animation_component.activate_animation()
 
     def __make_new_actions(self, enemy: Entity, enemy_action_queue_component: EnemyActionQueueComponent):
@@ -1618,12 +1649,12 @@ class EnemyManagementSystem(System):
         player_position = player_position_component.get_position()
         delta_x, delta_y = self.__calculate_distance_and_vector_to_target(enemy_position, player_position, True)
         if abs(delta_x) > abs(delta_y):
-            first_y_direction = choice([-1, 1])
+            first_y_direction = self.__ai_random_generator.choice([-1, 1])
             second_y_direction = - first_y_direction
             first_x_direction = 0
             second_x_direction = 0
         else:
-            first_x_direction = choice([-1, 1])
+            first_x_direction = self.__ai_random_generator.choice([-1, 1])
             second_x_direction = - first_x_direction
             first_y_direction = 0
             second_y_direction = 0
@@ -1640,7 +1671,7 @@ class EnemyManagementSystem(System):
             action_is_move_action, action_is_shoot_action, action_is_wait_action = current_action.get_type()
             if action_is_shoot_action:
                 animation_component.deactivate_animation()
-                BulletSystem.create_bullet(enemy, new_bullets, self.__player)
+                BulletSystem.create_bullet(enemy, new_bullets, self.__weapon_random_generator, self.__player)
                 enemy_action_queue_component.remove_current_action()
             elif action_is_wait_action:
                 animation_component.deactivate_animation()
@@ -1654,9 +1685,6 @@ class EnemyManagementSystem(System):
                 animation_component.activate_animation()
                 moving_distance_component = enemy.get_component(MovingDistanceComponent)
                 position_component = enemy.get_component(PositionComponent)
-                hit_box_component = enemy.get_component(HitBoxComponent)
-                active_hand_component = enemy.get_component(ActiveHandComponent)
-                weapon_component = enemy.get_component(WeaponComponent)
                 move_distance = current_action.get_move_distance()
                 move_accumulator = current_action.get_move_accumulator()
                 x_direction, y_direction = current_action.get_direction()
@@ -1664,9 +1692,6 @@ class EnemyManagementSystem(System):
                 x_direction *= enemy_moving_distance * scaled_time
                 y_direction *= enemy_moving_distance * scaled_time
                 position_component.update_position(x_direction, y_direction)
-                hit_box_component.update_coordinates(x_direction, y_direction)
-                weapon_component.update_weapon_muzzle_coord(x_direction, y_direction)
-                active_hand_component.update_coordinates(x_direction, y_direction)
                 if x_direction != 0:
                     main_direction = abs(x_direction)
                 else:
@@ -0,0 +1,48 @@
+import os
+import json
+import time
+import threading
+
+
+class TraceRecorder:
+
+    def __init__(self):
+        self.__events: list[(str, str, str, int, int)] = []
+        self.__start_time = time.perf_counter_ns()
+
+    def add_event(self, name: str, category: str, phase: str):
+        timestamp = (time.perf_counter_ns() - self.__start_time) // 1000
+        self.__events.append((name, category, phase, timestamp, threading.get_native_id()))
+
+    def get_events_number(self) -> int:
+        return len(self.__events)
+
+    def write(self, path: str):
+        process_id = os.getpid()
+        trace_events = []
+        for name, category, phase, timestamp, thread_id in self.__events:
+            trace_events.append({'name': name, 'cat': category, 'ph': phase, 'ts': timestamp, 'pid': process_id, 'tid': thread_id})
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file)
+
+
+class Tracer:
+    __recorder: TraceRecorder | None = None
+
+    @staticmethod
+    def set_recorder(recorder: TraceRecorder | None):
+        Tracer.__recorder = recorder
+
+    @staticmethod
+    def get_recorder() -> TraceRecorder | None:
+        return Tracer.__recorder
+
+    @staticmethod
+    def begin(name: str, category: str = 'system'):
+        if Tracer.__recorder:
+            Tracer.__recorder.add_event(name, category, 'B')
+
+    @staticmethod
+    def end(name: str, category: str = 'system'):
+        if Tracer.__recorder:
+            Tracer.__recorder.add_event(name, category, 'E')
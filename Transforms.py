@@ -0,0 +1,135 @@
+import numpy
+from Components import PositionComponent, HitBoxComponent, ActiveHandComponent, WeaponComponent
+from Entities import Entity
+
+
+class TransformHierarchy:
+
+    @staticmethod
+    def attach_children(entity: Entity):
+        position_component = entity.get_component(PositionComponent)
+        for component_type in (HitBoxComponent, ActiveHandComponent, WeaponComponent):
+            component = entity.get_component(component_type)
+            if component:
+                component.attach_to(position_component)
+
+
+class TransformStorage:
+    __INITIAL_CAPACITY = 256
+
+    def __init__(self):
+        capacity = TransformStorage.__INITIAL_CAPACITY
+        self.__positions = numpy.zeros((capacity, 2))
+        self.__velocities = numpy.zeros((capacity, 2))
+        self.__corners = numpy.zeros((capacity, 4, 2))
+        self.__owners: list[Entity | None] = []
+        self.__free_slots: list[int] = []
+
+    def __grow(self):
+        self.__positions = numpy.concatenate((self.__positions, numpy.zeros_like(self.__positions)))
+        self.__velocities = numpy.concatenate((self.__velocities, numpy.zeros_like(self.__velocities)))
+        self.__corners = numpy.concatenate((self.__corners, numpy.zeros_like(self.__corners)))
+
+    def get_capacity(self) -> int:
+        return len(self.__positions)
+
+    def get_used_slots_number(self) -> int:
+        return len(self.__owners) - len(self.__free_slots)
+
+    def allocate(self, owner: Entity, position: (float, float), corners: list[[float, float]], velocity: (float, float)) -> int:
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+            self.__owners[slot] = owner
+        else:
+            slot = len(self.__owners)
+            if slot == len(self.__positions):
+                self.__grow()
+            self.__owners.append(owner)
+        self.__positions[slot] = position
+        self.__corners[slot] = corners
+        self.__velocities[slot] = velocity
+        return slot
+
+    def release(self, slot: int):
+        if self.__owners[slot]:
+            self.__owners[slot] = None
+            self.__velocities[slot] = 0.0
+            self.__free_slots.append(slot)
+
+    def integrate(self, scaled_time: float):
+        used_slots_number = len(self.__owners)
+        delta = self.__velocities[:used_slots_number] * scaled_time
+        self.__positions[:used_slots_number] += delta
+        self.__corners[:used_slots_number] += delta[:, numpy.newaxis, :]
+
+    def get_position(self, slot: int) -> (float, float):
+        x_position, y_position = self.__positions[slot].tolist()
+        return x_position, y_position
+
+    def update_position(self, slot: int, delta_x: float, delta_y: float):
+        self.__positions[slot] += (delta_x, delta_y)
+
+    def get_corners(self, slot: int) -> list[[float, float]]:
+        return self.__corners[slot].tolist()
+
+    def get_corner(self, slot: int, index: int) -> [float, float]:
+        return self.__corners[slot, index].tolist()
+
+    def update_corners(self, slot: int, delta_x: float, delta_y: float):
+        self.__corners[slot] += (delta_x, delta_y)
+
+
+class PositionView(PositionComponent):
+    __slots__ = ('__storage', '__slot')
+
+    def __init__(self, storage: TransformStorage, slot: int):
+        self.__storage = storage
+        self.__slot = slot
+
+    def get_component_type(self) -> type:
+        return PositionComponent
+
+    def get_slot(self) -> int:
+        return self.__slot
+
+    def set_slot(self, slot: int):
+        self.__slot = slot
+
+    def get_position(self) -> (float, float):
+        return self.__storage.get_position(self.__slot)
+
+    def update_position(self, delta_x: float, delta_y: float):
+        self.__storage.update_position(self.__slot, delta_x, delta_y)
+
+
+class HitBoxView(HitBoxComponent):
+    __slots__ = ('__storage', '__slot', '__is_rotated')
+
+    def __init__(self, storage: TransformStorage, slot: int, is_rotated: bool = False):
+        self.__storage = storage
+        self.__slot = slot
+        self.__is_rotated = is_rotated
+
+    def get_component_type(self) -> type:
+        return HitBoxComponent
+
+    def get_slot(self) -> int:
+        return self.__slot
+
+    def set_slot(self, slot: int):
+        self.__slot = slot
+
+    def get_rotation_condition(self) -> bool:
+        return self.__is_rotated
+
+    def resolve_coordinates(self):
+        pass
+
+    def get_hit_box(self) -> list[(float, float)]:
+        return self.__storage.get_corners(self.__slot)
+
+    def get_top_left(self) -> (float, float):
+        return self.__storage.get_corner(self.__slot, 0)
+
+    def update_coordinates(self, delta_x: float, delta_y: float):
+        self.__storage.update_corners(self.__slot, delta_x, delta_y)
@@ -1,29 +1,28 @@
 import pygame
+from Sprites import SpriteLoader
 
 
-class Weapon:
+class WeaponDefinition:
+    __ROTATION_STEP = 1
 
     def __init__(self, damage: int, right_img_path: str, left_img_path: str, magazine_size: int, bullet_speed: int,
                  bullet_image_path: str, bullet_size: (int, int), reload_duration: int, gauss_accuracy: float,
-                 multiple_bullet_condition: bool):
+                 multiple_bullet_condition: bool, bullet_lifetime: float, bullet_range: int):
         self.__damage = damage
-        self.__image_R: pygame.image = pygame.image.load(right_img_path).convert_alpha()
-        self.__image_L: pygame.image = pygame.image.load(left_img_path).convert_alpha()
-        self.__weapon_muzzle_x_coord: float = self.__image_R.get_width()
-        self.__weapon_muzzle_y_coord: float = self.__image_R.get_height() / 2
+        self.__image_R: pygame.image = SpriteLoader.load_image(right_img_path)
+        self.__image_L: pygame.image = SpriteLoader.load_image(left_img_path)
         self.__image_width: int = self.__image_R.get_width()
         self.__image_height: int = self.__image_R.get_height()
-        self.__angle: float = 0.0
         self.__magazine_size: int = magazine_size
-        self.__current_magazine_size: int = magazine_size
-        self.__is_able_to_fire: bool = True
         self.__bullet_speed: int = bullet_speed
         self.__bullet_image_path: str = bullet_image_path
         self.__bullet_size = bullet_size
         self.__reload_duration: int = reload_duration
         self.__gauss_accuracy: float = gauss_accuracy
-        self.__is_reloading: bool = False
         self.__multiple_bullet_condition: bool = multiple_bullet_condition
+        self.__bullet_lifetime: float = bullet_lifetime
+        self.__bullet_range: int = bullet_range
+        self.__rotated_images: dict[(bool, int), pygame.Surface] = {}
 
     def get_damage(self) -> int:
         return self.__damage
@@ -34,11 +33,153 @@ class Weapon:
     def get_image_height(self) -> int:
         return self.__image_height
 
+    def get_rotated_image(self, right: bool, angle: float) -> pygame.image:
+        rotation_step = WeaponDefinition.__ROTATION_STEP
+        rounded_angle = round(angle / rotation_step) * rotation_step
+        key = (right, rounded_angle)
+        image = self.__rotated_images.get(key)
+        if not image:
+            if right:
+                image = pygame.transform.rotate(self.__image_R, -rounded_angle)
+            else:
+                image = pygame.transform.rotate(self.__image_L, -rounded_angle - 180)
+            self.__rotated_images[key] = image
+        return image
+
+    def get_magazine_size(self) -> int:
+        return self.__magazine_size
+
+    def get_bullet_speed(self) -> int:
+        return self.__bullet_speed
+
+    def get_bullet_image_path(self) -> str:
+        return self.__bullet_image_path
+
+    def get_bullet_size(self) -> (int, int):
+        return self.__bullet_size
+
+    def get_reload_duration(self) -> int:
+        return self.__reload_duration
+
+    def get_gauss_accuracy(self) -> float:
+        return self.__gauss_accuracy
+
+    def get_multiple_bullet_condition(self) -> bool:
+        return self.__multiple_bullet_condition
+
+    def get_bullet_lifetime(self) -> float:
+        return self.__bullet_lifetime
+
+    def get_bullet_range(self) -> int:
+        return self.__bullet_range
+
+
+class WeaponDefinitions:
+    __definitions: dict[str, WeaponDefinition] = {}
+
+    @staticmethod
+    def __get_definition(name: str, factory) -> WeaponDefinition:
+        definition = WeaponDefinitions.__definitions.get(name)
+        if not definition:
+            definition = factory()
+            WeaponDefinitions.__definitions[name] = definition
+        return definition
+
+    @staticmethod
+    def __create_handgun() -> WeaponDefinition:
+        damage = 35
+        right_image_path = 'textures/weapons/handgun_R.png'
+        left_image_path = 'textures/weapons/handgun_L.png'
+        magazine_size = 12
+        bullet_speed = 700
+        bullet_image_path = 'textures/weapons/handgun_bullet.png'
+        bullet_size = (22, 11)
+        reload_duration = 1000
+        gauss_accuracy = 2
+        multiple_bullet_condition = False
+        bullet_lifetime = 2.0
+        bullet_range = 1200
+        return WeaponDefinition(damage, right_image_path, left_image_path, magazine_size, bullet_speed, bullet_image_path,
+                                bullet_size, reload_duration, gauss_accuracy, multiple_bullet_condition, bullet_lifetime, bullet_range)
+
+    @staticmethod
+    def __create_rifle() -> WeaponDefinition:
+        damage = 80
+        right_image_path = 'textures/weapons/rifle_R.png'
+        left_image_path = 'textures/weapons/rifle_L.png'
+        magazine_size = 7
+        bullet_speed = 1200
+        bullet_image_path = 'textures/weapons/rifle_bullet.png'
+        bullet_size = (35, 8)
+        reload_duration = 2000
+        gauss_accuracy = 0.7
+        multiple_bullet_condition = False
+        bullet_lifetime = 2.0
+        bullet_range = 2000
+        return WeaponDefinition(damage, right_image_path, left_image_path, magazine_size, bullet_speed, bullet_image_path,
+                                bullet_size, reload_duration, gauss_accuracy, multiple_bullet_condition, bullet_lifetime, bullet_range)
+
+    @staticmethod
+    def __create_shotgun() -> WeaponDefinition:
+        damage = 30
+        right_image_path = 'textures/weapons/shotgun_R.png'
+        left_image_path = 'textures/weapons/shotgun_L.png'
+        magazine_size = 5
+        bullet_speed = 800
+        bullet_image_path = 'textures/weapons/shotgun_bullet.png'
+        bullet_size = (25, 25)
+        reload_duration = 1300
+        gauss_accuracy = 1
+        multiple_bullet_condition = True
+        bullet_lifetime = 1.0
+        bullet_range = 700
+        return WeaponDefinition(damage, right_image_path, left_image_path, magazine_size, bullet_speed, bullet_image_path,
+                                bullet_size, reload_duration, gauss_accuracy, multiple_bullet_condition, bullet_lifetime, bullet_range)
+
+    @staticmethod
+    def get_handgun() -> WeaponDefinition:
+        return WeaponDefinitions.__get_definition('handgun', WeaponDefinitions.__create_handgun)
+
+    @staticmethod
+    def get_rifle() -> WeaponDefinition:
+        return WeaponDefinitions.__get_definition('rifle', WeaponDefinitions.__create_rifle)
+
+    @staticmethod
+    def get_shotgun() -> WeaponDefinition:
+        return WeaponDefinitions.__get_definition('shotgun', WeaponDefinitions.__create_shotgun)
+
+
+class Weapon:
+    __slots__ = ('__definition', '__weapon_muzzle_x_coord', '__weapon_muzzle_y_coord', '__angle', '__current_magazine_size',
+                 '__is_able_to_fire', '__is_reloading', '__reload_time_accumulator')
+
+    def __init__(self, definition: WeaponDefinition):
+        self.__definition = definition
+        self.__weapon_muzzle_x_coord: float = definition.get_image_width()
+        self.__weapon_muzzle_y_coord: float = definition.get_image_height() / 2
+        self.__angle: float = 0.0
+        self.__current_magazine_size: int = definition.get_magazine_size()
+        self.__is_able_to_fire: bool = True
+        self.__is_reloading: bool = False
+        self.__reload_time_accumulator: float = 0
+
+    def get_definition(self) -> WeaponDefinition:
+        return self.__definition
+
+    def get_damage(self) -> int:
+        return self.__definition.get_damage()
+
+    def get_image_width(self) -> int:
+        return self.__definition.get_image_width()
+
+    def get_image_height(self) -> int:
+        return self.__definition.get_image_height()
+
     def get_image(self, left: bool, right: bool) -> pygame.image:
         if right:
-            return pygame.transform.rotate(self.__image_R, -self.__angle)
+            return self.__definition.get_rotated_image(True, self.__angle)
         elif left:
-            return pygame.transform.rotate(self.__image_L, -self.__angle - 180)
+            return self.__definition.get_rotated_image(False, self.__angle)
 
     def get_weapon_muzzle_coord(self) -> (float, float):
         return self.__weapon_muzzle_x_coord, self.__weapon_muzzle_y_coord
@@ -58,7 +199,7 @@ class Weapon:
         self.__angle = angel
 
     def reload(self):
-        self.__current_magazine_size = self.__magazine_size
+        self.__current_magazine_size = self.__definition.get_magazine_size()
 
     def get_fire_condition(self) -> bool:
         return self.__is_able_to_fire
@@ -70,25 +211,25 @@ class Weapon:
         return self.__current_magazine_size
 
     def get_magazine_size(self) -> int:
-        return self.__magazine_size
+        return self.__definition.get_magazine_size()
 
     def reduce_current_magazine_size(self):
         self.__current_magazine_size -= 1
 
     def get_bullet_speed(self) -> int:
-        return self.__bullet_speed
+        return self.__definition.get_bullet_speed()
 
     def get_bullet_image_path(self) -> str:
-        return self.__bullet_image_path
+        return self.__definition.get_bullet_image_path()
 
     def get_bullet_size(self) -> (int, int):
-        return self.__bullet_size
+        return self.__definition.get_bullet_size()
 
     def get_reload_duration(self) -> int:
-        return self.__reload_duration
+        return self.__definition.get_reload_duration()
 
     def get_gauss_accuracy(self) -> float:
-        return self.__gauss_accuracy
+        return self.__definition.get_gauss_accuracy()
 
     def get_reload_condition(self) -> bool:
         return self.__is_reloading
@@ -96,56 +237,38 @@ class Weapon:
     def switch_reload_condition(self):
         self.__is_reloading = not self.__is_reloading
 
+    def get_reload_time_accumulator(self) -> float:
+        return self.__reload_time_accumulator
+
+    def set_reload_time_accumulator(self, time: float):
+        self.__reload_time_accumulator = time
+
     def get_multiple_bullet_condition(self) -> bool:
-        return self.__multiple_bullet_condition
+        return self.__definition.get_multiple_bullet_condition()
+
+    def get_bullet_lifetime(self) -> float:
+        return self.__definition.get_bullet_lifetime()
+
+    def get_bullet_range(self) -> int:
+        return self.__definition.get_bullet_range()
 
 
 class Handgun(Weapon):
+    __slots__ = ()
 
     def __init__(self):
-        damage = 35
-        right_image_path = 'textures/weapons/handgun_R.png'
-        left_image_path = 'textures/weapons/handgun_L.png'
-        magazine_size = 12
-        bullet_speed = 700
-        bullet_image_path = 'textures/weapons/handgun_bullet.png'
-        bullet_size = (22, 11)
-        reload_duration = 1000
-        gauss_accuracy = 2
-        multiple_bullet_condition = False
-        super().__init__(damage, right_image_path, left_image_path, magazine_size, bullet_speed, bullet_image_path,
-                         bullet_size, reload_duration, gauss_accuracy, multiple_bullet_condition)
+        super().__init__(WeaponDefinitions.get_handgun())
 
 
 class Rifle(Weapon):
+    __slots__ = ()
 
     def __init__(self):
-        damage = 80
-        right_image_path = 'textures/weapons/rifle_R.png'
-        left_image_path = 'textures/weapons/rifle_L.png'
-        magazine_size = 7
-        bullet_speed = 1200
-        bullet_image_path = 'textures/weapons/rifle_bullet.png'
-        bullet_size = (35, 8)
-        reload_duration = 2000
-        gauss_accuracy = 0.7
-        multiple_bullet_condition = False
-        super().__init__(damage, right_image_path, left_image_path, magazine_size, bullet_speed, bullet_image_path,
-                         bullet_size, reload_duration, gauss_accuracy, multiple_bullet_condition)
+        super().__init__(WeaponDefinitions.get_rifle())
 
 
 class Shotgun(Weapon):
+    __slots__ = ()
 
     def __init__(self):
-        damage = 30
-        right_image_path = 'textures/weapons/shotgun_R.png'
-        left_image_path = 'textures/weapons/shotgun_L.png'
-        magazine_size = 5
-        bullet_speed = 800
-        bullet_image_path = 'textures/weapons/shotgun_bullet.png'
-        bullet_size = (25, 25)
-        reload_duration = 1300
-        gauss_accuracy = 1
-        multiple_bullet_condition = True
-        super().__init__(damage, right_image_path, left_image_path, magazine_size, bullet_speed, bullet_image_path,
-                         bullet_size, reload_duration, gauss_accuracy, multiple_bullet_condition)
+        super().__init__(WeaponDefinitions.get_shotgun())
@@ -0,0 +1,137 @@
+from typing import Iterator
+from Components import Component
+from Entities import Entity, EntityIdAllocator
+from Transforms import TransformStorage
+from BulletPool import BulletPool
+
+
+class Archetype:
+
+    def __init__(self, signature: frozenset[type]):
+        self.__signature = signature
+        self.__entities: list[Entity] = []
+        self.__columns: dict[type, list[Component]] = {component_type: [] for component_type in signature}
+
+    def get_signature(self) -> frozenset[type]:
+        return self.__signature
+
+    def get_size(self) -> int:
+        return len(self.__entities)
+
+    def get_entities(self) -> list[Entity]:
+        return self.__entities
+
+    def get_column(self, component_type: type) -> list[Component]:
+        return self.__columns[component_type]
+
+    def matches(self, component_types: tuple[type, ...]) -> bool:
+        return all(component_type in self.__signature for component_type in component_types)
+
+    def insert(self, entity: Entity) -> int:
+        self.__entities.append(entity)
+        for component in entity.get_components():
+            self.__columns[component.get_component_type()].append(component)
+        return len(self.__entities) - 1
+
+    def update(self, row: int, entity: Entity):
+        for component in entity.get_components():
+            self.__columns[component.get_component_type()][row] = component
+
+    def remove(self, row: int) -> Entity | None:
+        last_entity = self.__entities.pop()
+        for column in self.__columns.values():
+            last_component = column.pop()
+            if row < len(column):
+                column[row] = last_component
+        if row < len(self.__entities):
+            self.__entities[row] = last_entity
+            return last_entity
+        return None
+
+
+class World:
+
+    def __init__(self):
+        self.__id_allocator = EntityIdAllocator()
+        self.__transform_storage = TransformStorage()
+        self.__bullet_pool = BulletPool(self.__transform_storage)
+        self.__archetypes: dict[frozenset[type], Archetype] = {}
+        self.__locations: dict[int, (Archetype, int)] = {}
+        self.__changed_entities: dict[int, Entity] = {}
+        self.__query_cache: dict[tuple[type, ...], list[Archetype]] = {}
+
+    def get_id_allocator(self) -> EntityIdAllocator:
+        return self.__id_allocator
+
+    def get_transform_storage(self) -> TransformStorage:
+        return self.__transform_storage
+
+    def get_bullet_pool(self) -> BulletPool:
+        return self.__bullet_pool
+
+    def get_archetypes_number(self) -> int:
+        return len(self.__archetypes)
+
+    def get_entities_number(self) -> int:
+        self.__apply_changes()
+        return len(self.__locations)
+
+    def mark_changed(self, entity: Entity):
+        self.__changed_entities[entity.get_id()] = entity
+
+    def remove_entity(self, entity: Entity):
+        entity_id = entity.get_id()
+        self.__changed_entities.pop(entity_id, None)
+        self.__detach(entity_id)
+
+    def __detach(self, entity_id: int):
+        location = self.__locations.pop(entity_id, None)
+        if location:
+            archetype, row = location
+            moved_entity = archetype.remove(row)
+            if moved_entity:
+                self.__locations[moved_entity.get_id()] = (archetype, row)
+
+    def __get_archetype(self, signature: frozenset[type]) -> Archetype:
+        archetype = self.__archetypes.get(signature)
+        if not archetype:
+            archetype = Archetype(signature)
+            self.__archetypes[signature] = archetype
+            for component_types, archetypes in self.__query_cache.items():
+                if archetype.matches(component_types):
+                    archetypes.append(archetype)
+        return archetype
+
+    def __apply_changes(self):
+        if not self.__changed_entities:
+            return
+        for entity_id, entity in self.__changed_entities.items():
+            signature = frozenset(component.get_component_type() for component in entity.get_components())
+            location = self.__locations.get(entity_id)
+            if location and location[0].get_signature() == signature:
+                archetype, row = location
+                archetype.update(row, entity)
+            else:
+                self.__detach(entity_id)
+                if signature:
+                    archetype = self.__get_archetype(signature)
+                    self.__locations[entity_id] = (archetype, archetype.insert(entity))
+        self.__changed_entities.clear()
+
+    def __get_matching_archetypes(self, component_types: tuple[type, ...]) -> list[Archetype]:
+        self.__apply_changes()
+        archetypes = self.__query_cache.get(component_types)
+        if archetypes is None:
+            archetypes = [archetype for archetype in self.__archetypes.values() if archetype.matches(component_types)]
+            self.__query_cache[component_types] = archetypes
+        return archetypes
+
+    def query(self, *component_types: type) -> Iterator[tuple[Component, ...]]:
+        for archetype in self.__get_matching_archetypes(component_types):
+            if archetype.get_size():
+                yield from zip(*(archetype.get_column(component_type) for component_type in component_types))
+
+    def query_entities(self, *component_types: type) -> Iterator[tuple[Entity, ...]]:
+        for archetype in self.__get_matching_archetypes(component_types):
+            if archetype.get_size():
+                yield from zip(archetype.get_entities(), *(archetype.get_column(component_type) for component_type in component_types))
@@ -7,6 +7,29 @@ class WorldInfo:
     __MINIMAL_ROOM_SIZE = 25
     __RENDER_CAPACITY = 40
     __COLLISION_CAPACITY = 6
+    __CHUNK_SIZE = 32
+    __STREAMING_RADIUS = 1
+    __IS_STREAMING = False
+
+    @staticmethod
+    def configure(world_map_size: int = None, minimal_room_size: int = None, render_capacity: int = None, collision_capacity: int = None,
+                  is_streaming: bool = None, chunk_size: int = None, streaming_radius: int = None):
+        if minimal_room_size is not None:
+            WorldInfo.__MINIMAL_ROOM_SIZE = minimal_room_size
+        if world_map_size is not None:
+            WorldInfo.__WORLD_MAP_SIZE = world_map_size
+        if WorldInfo.__WORLD_MAP_SIZE < 2 * WorldInfo.__MINIMAL_ROOM_SIZE:
+            raise ValueError(f'world map size {WorldInfo.__WORLD_MAP_SIZE} cannot fit two rooms of {WorldInfo.__MINIMAL_ROOM_SIZE} tiles')
+        if render_capacity is not None:
+            WorldInfo.__RENDER_CAPACITY = render_capacity
+        if collision_capacity is not None:
+            WorldInfo.__COLLISION_CAPACITY = collision_capacity
+        if is_streaming is not None:
+            WorldInfo.__IS_STREAMING = is_streaming
+        if chunk_size is not None:
+            WorldInfo.__CHUNK_SIZE = chunk_size
+        if streaming_radius is not None:
+            WorldInfo.__STREAMING_RADIUS = streaming_radius
 
     @staticmethod
     def get_hub_map_size() -> (int, int):
@@ -43,3 +66,15 @@ class WorldInfo:
     @staticmethod
     def get_block_size() -> int:
         return WorldInfo.__BLOCK_SIZE
+
+    @staticmethod
+    def is_streaming() -> bool:
+        return WorldInfo.__IS_STREAMING
+
+    @staticmethod
+    def get_chunk_size() -> int:
+        return WorldInfo.__CHUNK_SIZE
+
+    @staticmethod
+    def get_streaming_radius() -> int:
+        return WorldInfo.__STREAMING_RADIUS
@@ -0,0 +1,290 @@
+import numpy
+from Entities import Entity
+from Components import PositionComponent, HitBoxComponent, HealthComponent, EnemyConditionComponent, WeaponComponent
+from CommandBuffer import EntityCollection
+from Prefabs import PrefabLibrary
+from QuadTree import QuadTree, Point, Rectangle
+from WorldInfo import WorldInfo
+from Tracing import Tracer
+
+
+class SleepingEnemy:
+
+    def __init__(self, center_x: float, center_y: float, patrol_points: list[(int, int)], is_melee: bool, weapons_list: list[bool] = None, damage: int = 0):
+        self.__center_x = center_x
+        self.__center_y = center_y
+        self.__patrol_points = patrol_points
+        self.__is_melee = is_melee
+        self.__weapons_list = weapons_list
+        self.__damage = damage
+
+    @staticmethod
+    def put_to_sleep(enemy: Entity) -> 'SleepingEnemy':
+        center_x, center_y = enemy.get_component(PositionComponent).get_position()
+        enemy_condition_component = enemy.get_component(EnemyConditionComponent)
+        health_component = enemy.get_component(HealthComponent)
+        weapon_component = enemy.get_component(WeaponComponent)
+        weapons_list = list(weapon_component.get_current_weapon()) if weapon_component else None
+        damage = health_component.get_max_health() - health_component.get_health()
+        return SleepingEnemy(center_x, center_y, enemy_condition_component.get_patrol_points(), enemy_condition_component.get_melee_condition(),
+                             weapons_list, damage)
+
+    def get_position(self) -> (float, float):
+        return self.__center_x, self.__center_y
+
+    def get_patrol_points(self) -> list[(int, int)]:
+        return self.__patrol_points
+
+    def is_melee(self) -> bool:
+        return self.__is_melee
+
+    def get_weapons_list(self) -> list[bool] | None:
+        return self.__weapons_list
+
+    def wake(self) -> Entity:
+        if self.__is_melee:
+            enemy = PrefabLibrary.get_melee_enemy().instantiate(self.__center_x, self.__center_y, self.__patrol_points)
+        else:
+            enemy = PrefabLibrary.get_ranged_enemy().instantiate(self.__center_x, self.__center_y, self.__patrol_points, self.__weapons_list)
+        if self.__damage:
+            enemy.get_component(HealthComponent).update_health(self.__damage)
+        return enemy
+
+
+class Chunk:
+
+    def __init__(self, chunk_x: int, chunk_y: int, start_x: int, start_y: int, tiles: numpy.ndarray):
+        self.__chunk_x = chunk_x
+        self.__chunk_y = chunk_y
+        self.__start_x = start_x
+        self.__start_y = start_y
+        self.__tiles = tiles
+        self.__wall_rectangle_indices: list[int] = []
+        self.__sleeping_enemies: list[SleepingEnemy] = []
+        self.__tile_entities: list[Entity] = []
+        self.__background_quadtree = None
+
+    def get_coordinates(self) -> (int, int):
+        return self.__chunk_x, self.__chunk_y
+
+    def is_loaded(self) -> bool:
+        return self.__background_quadtree is not None
+
+    def add_wall_rectangle(self, index: int):
+        self.__wall_rectangle_indices.append(index)
+
+    def get_wall_rectangle_indices(self) -> list[int]:
+        return self.__wall_rectangle_indices
+
+    def add_sleeping_enemy(self, sleeping_enemy: SleepingEnemy):
+        self.__sleeping_enemies.append(sleeping_enemy)
+
+    def take_sleeping_enemies(self) -> list[SleepingEnemy]:
+        sleeping_enemies = self.__sleeping_enemies
+        self.__sleeping_enemies = []
+        return sleeping_enemies
+
+    def load(self) -> list[Entity]:
+        block_size = WorldInfo.get_block_size()
+        tiles_height, tiles_width = self.__tiles.shape
+        boundary = Rectangle(self.__start_x * block_size, self.__start_y * block_size, tiles_width * block_size, tiles_height * block_size)
+        self.__background_quadtree = QuadTree(boundary, WorldInfo.get_render_capacity())
+        floor_prefab = PrefabLibrary.get_dungeon_floor()
+        wall_tile_prefab = PrefabLibrary.get_wall_tile()
+        tiles = self.__tiles.tolist()
+        for y in range(tiles_height):
+            for x in range(tiles_width):
+                if tiles[y][x] == 2:
+                    tile = floor_prefab.instantiate(self.__start_x + x, self.__start_y + y)
+                elif tiles[y][x] == 1:
+                    tile = wall_tile_prefab.instantiate(self.__start_x + x, self.__start_y + y)
+                else:
+                    continue
+                tile_x, tile_y = tile.get_component(PositionComponent).get_position()
+                self.__background_quadtree.insert(Point(tile_x, tile_y, tile, tile.get_component(HitBoxComponent).get_hit_box()))
+                self.__tile_entities.append(tile)
+        return self.__tile_entities
+
+    def unload(self) -> list[Entity]:
+        tile_entities = self.__tile_entities
+        self.__tile_entities = []
+        self.__background_quadtree = None
+        return tile_entities
+
+    def get_background_entities(self, region: list[(float, float)]) -> list[Entity]:
+        return self.__background_quadtree.get_entities(region)
+
+
+class WorldStreamer:
+    __CHUNKS_LOADED_PER_FRAME = 1
+
+    def __init__(self, entities_with_collision: EntityCollection, background_entities: EntityCollection, enemies: EntityCollection, main_entities: EntityCollection):
+        self.__entities_with_collision = entities_with_collision
+        self.__background_entities = background_entities
+        self.__enemies = enemies
+        self.__main_entities = main_entities
+        self.__chunks: dict[(int, int), Chunk] = {}
+        self.__loaded_chunks: dict[(int, int), Chunk] = {}
+        self.__pending_chunks: list[Chunk] = []
+        self.__chunks_number_x = 0
+        self.__chunks_number_y = 0
+        self.__player_chunk = None
+        self.__wall_rectangles: list[(int, int, int, int)] = []
+        self.__wall_colliders: dict[int, Entity] = {}
+        self.__wall_references: dict[int, int] = {}
+        self.__sleeping_enemies_number = 0
+
+    def get_chunks_number(self) -> int:
+        return len(self.__chunks)
+
+    def get_loaded_chunks_number(self) -> int:
+        return len(self.__loaded_chunks)
+
+    def get_sleeping_enemies_number(self) -> int:
+        return self.__sleeping_enemies_number
+
+    def clear(self):
+        self.__chunks.clear()
+        self.__loaded_chunks.clear()
+        self.__pending_chunks.clear()
+        self.__chunks_number_x = 0
+        self.__chunks_number_y = 0
+        self.__player_chunk = None
+        self.__wall_rectangles = []
+        self.__wall_colliders.clear()
+        self.__wall_references.clear()
+        self.__sleeping_enemies_number = 0
+
+    def create_chunks(self, world_map: numpy.ndarray, wall_rectangles: list[(int, int, int, int)]):
+        self.clear()
+        chunk_size = WorldInfo.get_chunk_size()
+        world_map_height, world_map_width = world_map.shape
+        self.__chunks_number_x = -(-world_map_width // chunk_size)
+        self.__chunks_number_y = -(-world_map_height // chunk_size)
+        for chunk_y in range(self.__chunks_number_y):
+            for chunk_x in range(self.__chunks_number_x):
+                start_x, start_y = chunk_x * chunk_size, chunk_y * chunk_size
+                tiles = world_map[start_y:start_y + chunk_size, start_x:start_x + chunk_size]
+                self.__chunks[(chunk_x, chunk_y)] = Chunk(chunk_x, chunk_y, start_x, start_y, tiles)
+        self.__wall_rectangles = wall_rectangles
+        for index, (start_x, start_y, end_x, end_y) in enumerate(wall_rectangles):
+            for chunk_y in range(start_y // chunk_size, min(end_y // chunk_size, self.__chunks_number_y - 1) + 1):
+                for chunk_x in range(start_x // chunk_size, min(end_x // chunk_size, self.__chunks_number_x - 1) + 1):
+                    self.__chunks[(chunk_x, chunk_y)].add_wall_rectangle(index)
+
+    def __get_chunk_coordinates(self, x: float, y: float) -> (int, int):
+        chunk_pixel_size = WorldInfo.get_chunk_size() * WorldInfo.get_block_size()
+        chunk_x = min(max(int(x // chunk_pixel_size), 0), self.__chunks_number_x - 1)
+        chunk_y = min(max(int(y // chunk_pixel_size), 0), self.__chunks_number_y - 1)
+        return chunk_x, chunk_y
+
+    def add_sleeping_enemy(self, sleeping_enemy: SleepingEnemy):
+        self.__chunks[self.__get_chunk_coordinates(*sleeping_enemy.get_position())].add_sleeping_enemy(sleeping_enemy)
+        self.__sleeping_enemies_number += 1
+
+    def __load_chunk(self, chunk: Chunk):
+        Tracer.begin('load_chunk', 'streaming')
+        for tile in chunk.load():
+            self.__background_entities.append(tile)
+        wall_collider_prefab = PrefabLibrary.get_wall_collider()
+        for index in chunk.get_wall_rectangle_indices():
+            references = self.__wall_references.get(index, 0)
+            if not references:
+                wall_collider = wall_collider_prefab.instantiate(*self.__wall_rectangles[index])
+                self.__wall_colliders[index] = wall_collider
+                self.__entities_with_collision.append(wall_collider)
+            self.__wall_references[index] = references + 1
+        for sleeping_enemy in chunk.take_sleeping_enemies():
+            enemy = sleeping_enemy.wake()
+            self.__enemies.append(enemy)
+            self.__entities_with_collision.append(enemy)
+            self.__main_entities.append(enemy)
+            self.__sleeping_enemies_number -= 1
+        self.__loaded_chunks[chunk.get_coordinates()] = chunk
+        Tracer.end('load_chunk', 'streaming')
+
+    def __unload_chunk(self, chunk: Chunk):
+        Tracer.begin('unload_chunk', 'streaming')
+        for tile in chunk.unload():
+            self.__background_entities.remove(tile)
+            tile.destroy()
+        for index in chunk.get_wall_rectangle_indices():
+            references = self.__wall_references[index] - 1
+            if references:
+                self.__wall_references[index] = references
+            else:
+                del self.__wall_references[index]
+                wall_collider = self.__wall_colliders.pop(index)
+                self.__entities_with_collision.remove(wall_collider)
+                wall_collider.destroy()
+        del self.__loaded_chunks[chunk.get_coordinates()]
+        Tracer.end('unload_chunk', 'streaming')
+
+    def __sleep_distant_enemies(self):
+        distant_enemies = []
+        for enemy in self.__enemies:
+            position = enemy.get_component(PositionComponent).get_position()
+            if self.__get_chunk_coordinates(*position) not in self.__loaded_chunks:
+                distant_enemies.append(enemy)
+        for enemy in distant_enemies:
+            self.add_sleeping_enemy(SleepingEnemy.put_to_sleep(enemy))
+            self.__enemies.remove(enemy)
+            self.__entities_with_collision.remove(enemy)
+            self.__main_entities.remove(enemy)
+            enemy.destroy()
+
+    def __change_player_chunk(self, player_chunk: (int, int)):
+        self.__player_chunk = player_chunk
+        streaming_radius = WorldInfo.get_streaming_radius()
+        player_chunk_x, player_chunk_y = player_chunk
+
+        def calculate_distance(chunk: Chunk) -> int:
+            chunk_x, chunk_y = chunk.get_coordinates()
+            return max(abs(chunk_x - player_chunk_x), abs(chunk_y - player_chunk_y))
+
+        for chunk in list(self.__loaded_chunks.values()):
+            if calculate_distance(chunk) > streaming_radius + 1:
+                self.__unload_chunk(chunk)
+        pending_chunks = []
+        for chunk_y in range(max(player_chunk_y - streaming_radius, 0), min(player_chunk_y + streaming_radius, self.__chunks_number_y - 1) + 1):
+            for chunk_x in range(max(player_chunk_x - streaming_radius, 0), min(player_chunk_x + streaming_radius, self.__chunks_number_x - 1) + 1):
+                chunk = self.__chunks[(chunk_x, chunk_y)]
+                if not chunk.is_loaded():
+                    pending_chunks.append(chunk)
+        pending_chunks.sort(key=calculate_distance)
+        self.__pending_chunks = pending_chunks
+
+    def __follow_player(self, player_position: (float, float)):
+        player_chunk = self.__get_chunk_coordinates(*player_position)
+        if player_chunk != self.__player_chunk:
+            self.__change_player_chunk(player_chunk)
+
+    def update(self, player_position: (float, float)):
+        if not self.__chunks:
+            return
+        self.__follow_player(player_position)
+        loaded_chunks_number = 0
+        while self.__pending_chunks and loaded_chunks_number < WorldStreamer.__CHUNKS_LOADED_PER_FRAME:
+            chunk = self.__pending_chunks.pop(0)
+            if not chunk.is_loaded():
+                self.__load_chunk(chunk)
+                loaded_chunks_number += 1
+        self.__sleep_distant_enemies()
+
+    def load_chunks_steps(self, player_position: (float, float)):
+        if self.__chunks:
+            self.__follow_player(player_position)
+            pending_chunks_number = len(self.__pending_chunks)
+            while self.__pending_chunks:
+                chunk = self.__pending_chunks.pop(0)
+                if not chunk.is_loaded():
+                    self.__load_chunk(chunk)
+                yield 1 - len(self.__pending_chunks) / pending_chunks_number
+            self.__sleep_distant_enemies()
+        yield 1.0
+
+    def get_background_entities(self, region: list[(float, float)]) -> list[Entity]:
+        entities = []
+        for chunk in self.__loaded_chunks.values():
+            entities += chunk.get_background_entities(region)
+        return entities
@@ -0,0 +1,187 @@
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import statistics
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INITIAL_DIRECTORY = os.getcwd()
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.chdir(ROOT_DIRECTORY)
+if ROOT_DIRECTORY not in sys.path:
+    sys.path.insert(0, ROOT_DIRECTORY)
+
+import pygame
+
+
+def initialize_display():
+    pygame.init()
+    if not pygame.display.get_surface():
+        pygame.display.set_mode((1, 1))
+
+
+class BenchmarkResult:
+
+    def __init__(self, name: str, timings: list[float]):
+        self.__name = name
+        self.__timings = timings
+
+    def get_name(self) -> str:
+        return self.__name
+
+    def set_timings(self, timings: list[float]):
+        self.__timings = timings
+
+    def get_median(self) -> float:
+        return statistics.median(self.__timings)
+
+    def get_minimum(self) -> float:
+        return min(self.__timings)
+
+    def get_noise(self) -> float:
+        minimum = self.get_minimum()
+        return (self.get_median() - minimum) / minimum if minimum else 0.0
+
+    def get_percentile(self, percent: float) -> float:
+        sorted_timings = sorted(self.__timings)
+        index = min(len(sorted_timings) - 1, int(len(sorted_timings) * percent / 100))
+        return sorted_timings[index]
+
+    def to_dict(self) -> dict:
+        return {'median': self.get_median(), 'min': self.get_minimum(), 'p95': self.get_percentile(95),
+                'p99': self.get_percentile(99), 'noise': self.get_noise(), 'repeat': len(self.__timings)}
+
+
+class BenchmarkRunner:
+
+    def __init__(self, repeat: int = 15, name_filter: str = None, warmup: int = 2):
+        self.__repeat = repeat
+        self.__warmup = warmup
+        self.__name_filter = name_filter
+        self.__results: list[BenchmarkResult] = []
+        self.__measured_functions: dict[str, tuple] = {}
+
+    def __time_function(self, function, setup) -> list[float]:
+        timings = []
+        for i in range(self.__warmup + self.__repeat):
+            argument = setup() if setup else None
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            start_time = time.perf_counter()
+            if setup:
+                function(argument)
+            else:
+                function()
+            duration = time.perf_counter() - start_time
+            if gc_was_enabled:
+                gc.enable()
+            if i >= self.__warmup:
+                timings.append(duration)
+        return timings
+
+    def measure(self, name: str, function, setup=None) -> BenchmarkResult | None:
+        if not self.is_selected(name):
+            return None
+        self.__measured_functions[name] = (function, setup)
+        return self.add_result(BenchmarkResult(name, self.__time_function(function, setup)))
+
+    def measure_again(self, names: list[str], delay: float = 0.0) -> list[str]:
+        if not any(name in self.__measured_functions for name in names):
+            return []
+        time.sleep(delay)
+        measured_names = []
+        for result in self.__results:
+            name = result.get_name()
+            if name in names and name in self.__measured_functions:
+                result.set_timings(self.__time_function(*self.__measured_functions[name]))
+                measured_names.append(name)
+        return measured_names
+
+    def add_result(self, result: BenchmarkResult) -> BenchmarkResult:
+        self.__results.append(result)
+        print(f'{result.get_name():<80} median {result.get_median() * 1000:10.3f} ms   min {result.get_minimum() * 1000:10.3f} ms')
+        return result
+
+    def is_selected(self, name: str) -> bool:
+        return not self.__name_filter or self.__name_filter in name
+
+    def get_results(self) -> list[BenchmarkResult]:
+        return self.__results
+
+    def save_results(self, path: str, extra_data: dict = None):
+        data = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': {result.get_name(): result.to_dict() for result in self.__results},
+        }
+        if extra_data:
+            data.update(extra_data)
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=4)
+
+
+def compare_with_baseline(results_path: str, baseline_path: str, threshold: float, names: list[str] = None) -> list[str]:
+    with open(results_path, 'r') as file:
+        results = json.load(file)['results']
+    with open(baseline_path, 'r') as file:
+        baseline = json.load(file)['results']
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline or (names is not None and name not in names):
+            continue
+        if baseline[name]['repeat'] != result['repeat']:
+            raise ValueError(f'{name}: the baseline has {baseline[name]["repeat"]} timed runs and the current run has {result["repeat"]}, '
+                             f'measure both with the same --repeat')
+        baseline_minimum = baseline[name]['min']
+        current_minimum = result['min']
+        change = (current_minimum - baseline_minimum) / baseline_minimum if baseline_minimum else 0.0
+        noise = max(baseline[name].get('noise', 0.0), result.get('noise', 0.0))
+        allowed_change = threshold + min(noise, threshold)
+        status = 'REGRESSION' if change > allowed_change else 'ok'
+        print(f'{name:<80} {baseline_minimum * 1000:10.3f} -> {current_minimum * 1000:10.3f} ms  {change:+7.1%}  '
+              f'(allowed {allowed_change:+.1%})  {status}')
+        if change > allowed_change:
+            regressions.append(name)
+    return regressions
+
+
+def add_common_arguments(parser):
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default=None)
+    parser.add_argument('--threshold', type=float, default=0.10)
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--retries', type=int, default=5)
+    parser.add_argument('--retry-delay', type=float, default=5.0)
+    parser.add_argument('--filter', default=None)
+
+
+def finish(runner: BenchmarkRunner, arguments, extra_data: dict = None):
+    output_path = os.path.join(INITIAL_DIRECTORY, arguments.output)
+    runner.save_results(output_path, extra_data)
+    if arguments.baseline:
+        baseline_path = os.path.join(INITIAL_DIRECTORY, arguments.baseline)
+        if not os.path.exists(baseline_path):
+            runner.save_results(baseline_path, extra_data)
+            print(f'baseline saved to {arguments.baseline}')
+            return
+        regressions = compare_with_baseline(output_path, baseline_path, arguments.threshold)
+        for i in range(arguments.retries):
+            if not regressions:
+                break
+            measured_names = runner.measure_again(regressions, arguments.retry_delay)
+            if not measured_names:
+                break
+            print(f'{len(measured_names)} regressed benchmark(s) measured again')
+            runner.save_results(output_path, extra_data)
+            unmeasured_regressions = [name for name in regressions if name not in measured_names]
+            regressions = unmeasured_regressions + compare_with_baseline(output_path, baseline_path, arguments.threshold, measured_names)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) regressed by more than {arguments.threshold:.0%} plus measurement noise')
+            sys.exit(1)
@@ -0,0 +1,100 @@
+import sys
+import argparse
+
+import BenchmarkTools
+from BenchmarkTools import BenchmarkRunner
+
+from main import Game
+from Entities import Entity
+from Components import PositionComponent, HitBoxComponent, TypeComponent
+
+SEED = 2024
+
+
+def get_object_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(vars(obj))
+    return size
+
+
+def collect_entities(game: Game) -> list[Entity]:
+    entities = {}
+    for entity_collection in game.get_entity_collections():
+        for entity in entity_collection:
+            entities[entity.get_id()] = entity
+    return list(entities.values())
+
+
+def measure_memory(entities: list[Entity]) -> dict:
+    entity_bytes = 0
+    component_bytes = 0
+    components_number = 0
+    bytes_by_type = {}
+    for entity in entities:
+        entity_bytes += get_object_size(entity)
+        for component in entity.get_components():
+            size = get_object_size(component)
+            name = type(component).__name__
+            component_bytes += size
+            components_number += 1
+            bytes_by_type[name] = bytes_by_type.get(name, 0) + size
+    return {
+        'entities': len(entities),
+        'components': components_number,
+        'entity_bytes': entity_bytes,
+        'component_bytes': component_bytes,
+        'bytes_per_entity': (entity_bytes + component_bytes) / len(entities),
+        'component_bytes_by_type': bytes_by_type,
+    }
+
+
+def benchmark_component_access(runner: BenchmarkRunner, entities: list[Entity]):
+    position_components = [entity.get_component(PositionComponent) for entity in entities if entity.get_component(PositionComponent)]
+    hit_box_components = [entity.get_component(HitBoxComponent) for entity in entities if entity.get_component(HitBoxComponent)]
+    type_components = [entity.get_component(TypeComponent) for entity in entities if entity.get_component(TypeComponent)]
+    entities_number = len(entities)
+
+    def get_components():
+        for entity in entities:
+            entity.get_component(PositionComponent)
+
+    def get_positions():
+        for position_component in position_components:
+            position_component.get_position()
+
+    def get_hit_boxes():
+        for hit_box_component in hit_box_components:
+            hit_box_component.get_hit_box()
+
+    def get_types():
+        for type_component in type_components:
+            type_component.get_type()
+
+    runner.measure(f'entity.get_component[entities={entities_number}]', get_components)
+    runner.measure(f'position.get_position[components={len(position_components)}]', get_positions)
+    runner.measure(f'hit_box.get_hit_box[components={len(hit_box_components)}]', get_hit_boxes)
+    runner.measure(f'type.get_type[components={len(type_components)}]', get_types)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    BenchmarkTools.add_common_arguments(parser)
+    arguments = parser.parse_args()
+    runner = BenchmarkRunner(arguments.repeat, arguments.filter, arguments.warmup)
+    game = Game(SEED)
+    game.start_new_game()
+    runner.measure('game.enter_dungeon', game.enter_dungeon)
+    entities = collect_entities(game)
+    memory = measure_memory(entities)
+    print(f'{memory["entities"]} entities, {memory["components"]} components: '
+          f'entities {memory["entity_bytes"] / 1024:.1f} KiB, components {memory["component_bytes"] / 1024:.1f} KiB, '
+          f'{memory["bytes_per_entity"]:.1f} bytes per entity')
+    for name, size in sorted(memory['component_bytes_by_type'].items(), key=lambda item: -item[1]):
+        print(f'    {name:<30} {size / 1024:10.1f} KiB')
+    benchmark_component_access(runner, entities)
+    BenchmarkTools.finish(runner, arguments, {'memory': memory})
+
+
+if __name__ == '__main__':
+    main()
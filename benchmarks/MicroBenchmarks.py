@@ -0,0 +1,170 @@
+import argparse
+import numpy
+from random import Random
+
+import BenchmarkTools
+from BenchmarkTools import BenchmarkRunner
+
+from Entities import Entity
+from Components import (PositionComponent, HitBoxComponent, TypeComponent, CollisionComponent, BulletStatusComponent,
+                        BelongingComponent)
+from QuadTree import QuadTree, Rectangle, Point
+from CheckCollisionMethods import AxisAlignedBoundingBox, SeparatingAxisTheorem
+from DungeonGeneration import BinaryTree
+from Systems import CollisionSystem
+from WorldInfo import WorldInfo
+
+SEED = 2024
+QUADTREE_CAPACITIES = [4, 6, 16, 40]
+QUADTREE_ENTITY_COUNTS = [100, 1000, 5000]
+DUNGEON_MAP_SIZES = [50, 100, 200]
+COLLISION_SCENES = [(50, 20, 50), (200, 50, 200), (400, 100, 500)]
+
+
+def create_box_entity(center_x: float, center_y: float, width: float, height: float, is_character: bool, is_bullet: bool, is_wall: bool) -> Entity:
+    top_left = [center_x - width / 2, center_y - height / 2]
+    top_right = [center_x + width / 2, center_y - height / 2]
+    bottom_left = [center_x - width / 2, center_y + height / 2]
+    bottom_right = [center_x + width / 2, center_y + height / 2]
+    entity = Entity()
+    entity.add_component(TypeComponent(False, is_character, is_bullet, is_wall, False))
+    entity.add_component(PositionComponent(center_x, center_y))
+    entity.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right, is_bullet))
+    entity.add_component(CollisionComponent())
+    if is_bullet:
+        entity.add_component(BulletStatusComponent())
+        entity.add_component(BelongingComponent(True, False))
+    return entity
+
+
+def create_points(entity_count: int, world_size: int) -> list[Point]:
+    random_generator = Random(SEED)
+    points = []
+    for i in range(entity_count):
+        center_x = random_generator.uniform(0, world_size)
+        center_y = random_generator.uniform(0, world_size)
+        entity = create_box_entity(center_x, center_y, 30, 30, False, False, True)
+        hit_box_component = entity.get_component(HitBoxComponent)
+        points.append(Point(center_x, center_y, entity, hit_box_component.get_hit_box()))
+    return points
+
+
+def create_collision_scene(wall_count: int, character_count: int, bullet_count: int, world_size: int) -> list[Entity]:
+    random_generator = Random(SEED)
+    entities = []
+    for i in range(wall_count):
+        entities.append(create_box_entity(random_generator.uniform(0, world_size), random_generator.uniform(0, world_size),
+                                          random_generator.choice([30, 300]), random_generator.choice([30, 300]), False, False, True))
+    for i in range(character_count):
+        entities.append(create_box_entity(random_generator.uniform(0, world_size), random_generator.uniform(0, world_size),
+                                          64, 100, True, False, False))
+    for i in range(bullet_count):
+        entities.append(create_box_entity(random_generator.uniform(0, world_size), random_generator.uniform(0, world_size),
+                                          22, 11, False, True, False))
+    return entities
+
+
+def benchmark_quadtree_capacity(runner: BenchmarkRunner, boundary: Rectangle, points: list[Point], capacity: int):
+
+    def insert_points():
+        quadtree = QuadTree(boundary, capacity)
+        for point in points:
+            quadtree.insert(point)
+
+    def build_quadtree() -> QuadTree:
+        quadtree = QuadTree(boundary, capacity)
+        for point in points:
+            quadtree.insert(point)
+        return quadtree
+
+    def query_points(quadtree: QuadTree):
+        for point in points:
+            quadtree.get_entities(point.get_entity_boundary())
+
+    runner.measure(f'quadtree.insert[capacity={capacity},entities={len(points)}]', insert_points)
+    runner.measure(f'quadtree.get_entities[capacity={capacity},entities={len(points)}]', query_points, build_quadtree)
+
+
+def benchmark_quadtree(runner: BenchmarkRunner):
+    world_size = WorldInfo.get_world_size()
+    boundary = Rectangle(0, 0, world_size, world_size)
+    for entity_count in QUADTREE_ENTITY_COUNTS:
+        points = create_points(entity_count, world_size)
+        for capacity in QUADTREE_CAPACITIES:
+            benchmark_quadtree_capacity(runner, boundary, points, capacity)
+
+
+def benchmark_collision_checks(runner: BenchmarkRunner):
+    checks_number = 10000
+    random_generator = Random(SEED)
+    regions = []
+    for i in range(checks_number):
+        x, y = random_generator.uniform(0, 100), random_generator.uniform(0, 100)
+        regions.append([(x, y), (x + 30, y), (x + 30, y + 30), (x, y + 30)])
+    pairs = list(zip(regions, reversed(regions)))
+
+    def check_aabb():
+        for first_region, second_region in pairs:
+            AxisAlignedBoundingBox.check_collision(first_region, second_region)
+
+    def check_sat():
+        for first_region, second_region in pairs:
+            SeparatingAxisTheorem.check_collision(first_region, second_region)
+
+    runner.measure(f'aabb.check_collision[pairs={checks_number}]', check_aabb)
+    runner.measure(f'sat.check_collision[pairs={checks_number}]', check_sat)
+
+
+def benchmark_dungeon_map_size(runner: BenchmarkRunner, map_size: int):
+    minimal_room_size = WorldInfo.get_minimal_room_size()
+
+    def create_dungeon():
+        world_map = numpy.zeros((map_size, map_size), dtype=numpy.uint8)
+        tree = BinaryTree(0, 0, map_size, map_size, Random(SEED))
+        dungeon_layout = tree.create_dungeon_layout(world_map, minimal_room_size)
+        for progress in BinaryTree.create_dungeon_entities_steps(dungeon_layout, [], []):
+            pass
+
+    runner.measure(f'binary_tree.create_dungeon[map_size={map_size}]', create_dungeon)
+
+
+def benchmark_dungeon_generation(runner: BenchmarkRunner):
+    for map_size in DUNGEON_MAP_SIZES:
+        benchmark_dungeon_map_size(runner, map_size)
+
+
+def benchmark_collision_scene(runner: BenchmarkRunner, wall_count: int, character_count: int, bullet_count: int):
+    world_size = WorldInfo.get_world_size()
+
+    def create_collision_system() -> CollisionSystem:
+        collision_system = CollisionSystem(create_collision_scene(wall_count, character_count, bullet_count, world_size))
+        collision_system.create_dungeon_collision()
+        return collision_system
+
+    def process_collision(collision_system: CollisionSystem):
+        collision_system.process_collision()
+
+    runner.measure(f'collision_system.process_collision[walls={wall_count},characters={character_count},bullets={bullet_count}]',
+                   process_collision, create_collision_system)
+
+
+def benchmark_collision_system(runner: BenchmarkRunner):
+    for wall_count, character_count, bullet_count in COLLISION_SCENES:
+        benchmark_collision_scene(runner, wall_count, character_count, bullet_count)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    BenchmarkTools.add_common_arguments(parser)
+    arguments = parser.parse_args()
+    BenchmarkTools.initialize_display()
+    runner = BenchmarkRunner(arguments.repeat, arguments.filter, arguments.warmup)
+    benchmark_quadtree(runner)
+    benchmark_collision_checks(runner)
+    benchmark_dungeon_generation(runner)
+    benchmark_collision_system(runner)
+    BenchmarkTools.finish(runner, arguments)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import statistics
+import time
+
+import BenchmarkTools
+from BenchmarkTools import BenchmarkRunner, BenchmarkResult
+
+from main import Game
+from WorldInfo import WorldInfo
+from Components import HealthComponent
+from InputRecording import InputFrame
+
+SEED = 2024
+FRAME_DELTA_TIME = 1 / 60
+SCREEN_CENTER = (640, 360)
+IDLE_KEYS = (False, False, False, False)
+DEFAULT_MAP_SIZES = (100, 200, 500, 1000)
+
+
+def measure_generation(game: Game, repeat: int, warmup: int) -> list[float]:
+    timings = []
+    for i in range(warmup + repeat):
+        start_time = time.perf_counter()
+        game.enter_dungeon()
+        if i >= warmup:
+            timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def measure_frames(game: Game, frames_number: int, warmup_frames_number: int) -> (list[float], dict[str, float]):
+    game.get_player().add_component(HealthComponent(10 ** 9))
+    profiler = game.get_profiler()
+    profiler.set_recording(True)
+    for frame_index in range(warmup_frames_number + frames_number):
+        if frame_index == warmup_frames_number:
+            profiler.clear_recorded_frames()
+        game.run_frame(InputFrame(FRAME_DELTA_TIME, IDLE_KEYS, SCREEN_CENTER))
+    frames = profiler.get_recorded_frames()
+    profiler.set_recording(False)
+    frame_times = [frame['frame'] for frame in frames]
+    sections = sorted({section for frame in frames for section in frame if section != 'frame'})
+    breakdown = {section: statistics.fmean(frame.get(section, 0.0) for frame in frames) for section in sections}
+    return frame_times, breakdown
+
+
+def run_map_size(runner: BenchmarkRunner, map_size: int, repeat: int, warmup: int, frames_number: int, warmup_frames_number: int) -> dict:
+    WorldInfo.configure(world_map_size=map_size)
+    game = Game(SEED)
+    game.start_new_game()
+    generation_result = runner.add_result(BenchmarkResult(f'scaling.generation.{map_size}', measure_generation(game, repeat, warmup)))
+    entity_counts = game.get_entity_counts()
+    frame_times, breakdown = measure_frames(game, frames_number, warmup_frames_number)
+    frame_result = runner.add_result(BenchmarkResult(f'scaling.frame.{map_size}', frame_times))
+    print(f'    p95 {frame_result.get_percentile(95) * 1000:8.3f} ms   p99 {frame_result.get_percentile(99) * 1000:8.3f} ms')
+    for name, number in entity_counts.items():
+        print(f'    {name:<24} {number:8d}')
+    for section, duration in sorted(breakdown.items(), key=lambda item: -item[1]):
+        print(f'    {section:<24} {duration * 1000:8.3f} ms')
+    return {'generation_median': generation_result.get_median(), 'frame_median': frame_result.get_median(),
+            'entity_counts': entity_counts, 'breakdown': breakdown}
+
+
+def print_summary(scaling: dict[int, dict]):
+    print(f'{"map size":>10} {"generation ms":>14} {"frame ms":>10} {"collidables":>12} {"background":>12} {"enemies":>8}')
+    for map_size, data in scaling.items():
+        entity_counts = data['entity_counts']
+        print(f'{map_size:>10} {data["generation_median"] * 1000:>14.1f} {data["frame_median"] * 1000:>10.3f} '
+              f'{entity_counts["entities_with_collision"]:>12} {entity_counts["background_entities"]:>12} {entity_counts["enemies"]:>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    BenchmarkTools.add_common_arguments(parser)
+    parser.add_argument('--map-sizes', type=int, nargs='+', default=list(DEFAULT_MAP_SIZES))
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup-frames', type=int, default=30)
+    parser.add_argument('--streaming', action='store_true')
+    parser.set_defaults(repeat=5)
+    arguments = parser.parse_args()
+    WorldInfo.configure(is_streaming=arguments.streaming)
+    runner = BenchmarkRunner(name_filter=arguments.filter)
+    scaling = {}
+    for map_size in arguments.map_sizes:
+        if not runner.is_selected(f'scaling.generation.{map_size}') and not runner.is_selected(f'scaling.frame.{map_size}'):
+            continue
+        scaling[map_size] = run_map_size(runner, map_size, arguments.repeat, arguments.warmup, arguments.frames, arguments.warmup_frames)
+    print_summary(scaling)
+    BenchmarkTools.finish(runner, arguments, {'scaling': scaling})
+
+
+if __name__ == '__main__':
+    main()
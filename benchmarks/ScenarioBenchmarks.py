@@ -0,0 +1,118 @@
+import argparse
+import statistics
+from math import cos, sin, radians
+from random import Random
+
+import BenchmarkTools
+from BenchmarkTools import BenchmarkRunner, BenchmarkResult
+
+from main import Game
+from Components import PositionComponent, HealthComponent, EnemyConditionComponent
+from InputRecording import InputFrame
+
+SEED = 2024
+FRAME_DELTA_TIME = 1 / 60
+SCREEN_CENTER = (640, 360)
+IDLE_KEYS = (False, False, False, False)
+
+
+def make_player_invulnerable(game: Game):
+    game.get_player().add_component(HealthComponent(10 ** 9))
+
+
+def setup_idle(game: Game):
+    make_player_invulnerable(game)
+
+
+def setup_ranged_enemies(game: Game):
+    enemies_number = 20
+    spawn_radius = 300
+    make_player_invulnerable(game)
+    dungeon_system = game.get_dungeon_system()
+    player_x, player_y = game.get_player().get_component(PositionComponent).get_position()
+    for i in range(enemies_number):
+        angle = radians(360 * i / enemies_number)
+        enemy_x = int(player_x + spawn_radius * cos(angle))
+        enemy_y = int(player_y + spawn_radius * sin(angle))
+        dungeon_system.create_enemy(enemy_x, enemy_y, False, weapons_list=[False, False, True])
+    for enemy in list(game.get_enemies())[-enemies_number:]:
+        enemy.get_component(EnemyConditionComponent).set_anger()
+
+
+def keep_bullets_in_flight(game: Game, frame_index: int, random_generator: Random):
+    bullets_number = 200
+    missing_bullets = bullets_number - game.get_entity_counts()['bullets']
+    if missing_bullets <= 0:
+        return
+    new_bullets = []
+    bullet_system = game.get_bullet_system()
+    for i in range(missing_bullets):
+        mouse_position = (random_generator.randint(0, 1280), random_generator.randint(0, 720))
+        bullet_system.create_bullet(game.get_player(), new_bullets, random_generator, mouse_position=mouse_position)
+    bullet_system.insert_bullets(new_bullets)
+
+
+def create_idle_frame(frame_index: int) -> InputFrame:
+    return InputFrame(FRAME_DELTA_TIME, IDLE_KEYS, SCREEN_CENTER)
+
+
+def create_sprint_frame(frame_index: int) -> InputFrame:
+    leg_length = 120
+    leg = (frame_index // leg_length) % 4
+    moving_keys = [(False, False, True, False), (False, True, False, False),
+                   (False, False, False, True), (True, False, False, False)][leg]
+    return InputFrame(FRAME_DELTA_TIME, moving_keys, SCREEN_CENTER)
+
+
+SCENARIOS = {
+    'idle_dungeon': (setup_idle, None, create_idle_frame),
+    '20_angry_ranged_enemies_with_shotguns': (setup_ranged_enemies, None, create_idle_frame),
+    '200_bullets_in_flight': (setup_idle, keep_bullets_in_flight, create_idle_frame),
+    'player_sprinting_across_the_map': (setup_idle, None, create_sprint_frame),
+}
+
+
+def run_scenario(name: str, frames_number: int, warmup_frames_number: int) -> (BenchmarkResult, dict[str, float]):
+    setup, before_frame, create_input_frame = SCENARIOS[name]
+    random_generator = Random(SEED)
+    game = Game(SEED)
+    game.start_new_game()
+    game.enter_dungeon()
+    setup(game)
+    profiler = game.get_profiler()
+    profiler.set_recording(True)
+    for frame_index in range(warmup_frames_number + frames_number):
+        if frame_index == warmup_frames_number:
+            profiler.clear_recorded_frames()
+        if before_frame:
+            before_frame(game, frame_index, random_generator)
+        game.run_frame(create_input_frame(frame_index))
+    frames = profiler.get_recorded_frames()
+    frame_times = [frame['frame'] for frame in frames]
+    sections = sorted({section for frame in frames for section in frame if section != 'frame'})
+    breakdown = {section: statistics.fmean(frame.get(section, 0.0) for frame in frames) for section in sections}
+    return BenchmarkResult(f'scenario.{name}', frame_times), breakdown
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    BenchmarkTools.add_common_arguments(parser)
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--warmup-frames', type=int, default=60)
+    arguments = parser.parse_args()
+    runner = BenchmarkRunner(name_filter=arguments.filter)
+    breakdowns = {}
+    for name in SCENARIOS:
+        if not runner.is_selected(f'scenario.{name}'):
+            continue
+        result, breakdown = run_scenario(name, arguments.frames, arguments.warmup_frames)
+        runner.add_result(result)
+        print(f'    p95 {result.get_percentile(95) * 1000:8.3f} ms   p99 {result.get_percentile(99) * 1000:8.3f} ms')
+        for section, duration in sorted(breakdown.items(), key=lambda item: -item[1]):
+            print(f'    {section:<24} {duration * 1000:8.3f} ms')
+        breakdowns[result.get_name()] = breakdown
+    BenchmarkTools.finish(runner, arguments, {'breakdown': breakdowns})
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 import pygame
 import sys
+import os
+import time
+import argparse
 
 from Systems import (RenderSystem, InputSystem, BulletSystem, MenuSystem, WeaponSystem, EntitySystem,
                           CollisionSystem, DungeonSystem, EnemyManagementSystem, UpgradeSystem, SavingSystem)
@@ -8,34 +11,87 @@ from Components import (PositionComponent, AnimationComponent, HealthComponent,
                         SingleImageComponent, SingeAnimationComponent, ActionComponent, AnimationConditionComponent,
                         MoneyCollectionComponent, ExistenceConditionComponent)
 from Entities import Entity
+from World import World
+from WorldInfo import WorldInfo
+from CommandBuffer import EntityCollection, EntityCommandBuffer
+from WorldStreaming import WorldStreamer
+from DungeonPool import DungeonPool
+from Transforms import TransformHierarchy
+from Sprites import SpriteLoader
+from RandomGenerators import RandomGenerators
+from InputRecording import InputFrame, InputRecorder, InputPlayer
+from StateDigest import StateDigest, StateDigestLog
+from Profiler import FrameProfiler
+from Tracing import Tracer, TraceRecorder
+from MemoryReport import MemoryReporter
+from GarbageCollection import GarbageCollectionPolicy
 
 
 class Game:
+    __LOADING_FRAME_BUDGET = 0.012
+    __DUNGEON_LOADING_STAGES = ('partition', 'rooms', 'corridors', 'walls', 'entities', 'enemies', 'spatial_index', 'chunks')
 
-    def __init__(self):
+    def __init__(self, seed: int = None, record_path: str = None, replay_path: str = None, digest_log_path: str = None, show_profiler: bool = False, trace_path: str = None,
+                 memory_report_path: str = None, dungeon_pool_path: str = None):
+        self.__input_recorder = None
+        self.__input_player = None
+        self.__state_digest_log = None
+        self.__memory_reporter = None
+        self.__tick = 0
+        self.__dungeon_pool = None
+        self.__trace_path = trace_path
+        if trace_path:
+            Tracer.set_recorder(TraceRecorder())
+        if memory_report_path:
+            self.__memory_reporter = MemoryReporter(memory_report_path)
+        self.__profiler = FrameProfiler()
+        self.__garbage_collection_policy = GarbageCollectionPolicy(self.__profiler)
+        if show_profiler:
+            self.__profiler.switch_overlay_condition()
+        if digest_log_path:
+            self.__state_digest_log = StateDigestLog(digest_log_path)
+        if replay_path:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            self.__input_player = InputPlayer(replay_path)
+            seed = self.__input_player.get_seed()
+        if dungeon_pool_path:
+            self.__dungeon_pool = DungeonPool(dungeon_pool_path)
+            map_width, map_height = self.__dungeon_pool.get_world_map_size()
+            WorldInfo.configure(world_map_size=map_width)
         pygame.init()
         pygame.display.set_caption('Game')
         pygame.mouse.set_visible(False)
         self.__new_game = True
         self.__clock = pygame.time.Clock()
-        self.__main_entities: list[Entity] = []
-        self.__entities_with_collision: list[Entity] = []
-        self.__bullets: list[Entity] = []
-        self.__background_entities: list[Entity] = []
-        self.__enemies: list[Entity] = []
+        self.__main_entities = EntityCollection()
+        self.__entities_with_collision = EntityCollection()
+        self.__bullets = EntityCollection()
+        self.__background_entities = EntityCollection()
+        self.__enemies = EntityCollection()
         self.__menu_entities: list[Entity] = []
         self.__game_speed: float = 1.0
         self.__delta_time: float = 0
+        self.__random_generators = RandomGenerators(seed)
+        self.__world = World()
+        Entity.set_world(self.__world)
+        self.__command_buffer = EntityCommandBuffer()
+        self.__world_streamer = WorldStreamer(self.__entities_with_collision, self.__background_entities, self.__enemies, self.__main_entities)
+        if record_path:
+            self.__input_recorder = InputRecorder(record_path, self.__random_generators.get_seed())
         self.__upgrade_system = UpgradeSystem()
         self.__saving_system = SavingSystem()
-        self.__render_system: RenderSystem = RenderSystem(self.__main_entities, self.__background_entities, self.__enemies, self.__menu_entities)
+        self.__render_system: RenderSystem = RenderSystem(self.__main_entities, self.__background_entities, self.__enemies, self.__menu_entities, self.__world,
+                                                          self.__profiler)
         self.__input_system: InputSystem = InputSystem()
         self.__weapon_system: WeaponSystem = WeaponSystem()
-        self.__bullet_system: BulletSystem = BulletSystem(self.__bullets, self.__main_entities, self.__entities_with_collision)
-        self.__entity_system: EntitySystem = EntitySystem(self.__entities_with_collision, self.__bullets, self.__main_entities, self.__enemies)
+        self.__bullet_system: BulletSystem = BulletSystem(self.__bullets, self.__main_entities, self.__entities_with_collision, self.__world, self.__command_buffer)
+        self.__entity_system: EntitySystem = EntitySystem(self.__entities_with_collision, self.__bullets, self.__main_entities, self.__enemies, self.__random_generators.get_loot_generator(),
+                                                          self.__command_buffer)
         self.__collision_system: CollisionSystem = CollisionSystem(self.__entities_with_collision)
-        self.__dungeon_system: DungeonSystem = DungeonSystem(self.__entities_with_collision, self.__background_entities, self.__enemies, self.__main_entities, [self.__create_hub])
-        self.__enemy_management_system: EnemyManagementSystem = EnemyManagementSystem(self.__enemies)
+        self.__dungeon_system: DungeonSystem = DungeonSystem(self.__entities_with_collision, self.__background_entities, self.__enemies, self.__main_entities, [self.__create_hub],
+                                                             self.__random_generators.get_dungeon_generator(), self.__random_generators.get_enemy_generator(), self.__world_streamer,
+                                                             self.__dungeon_pool)
+        self.__enemy_management_system: EnemyManagementSystem = EnemyManagementSystem(self.__enemies, self.__random_generators.get_ai_generator(), self.__random_generators.get_weapon_generator())
 
         save_action = self.__saving_system.save_data
         new_game_button_actions = [self.__render_system.draw_loading_screen, self.__set_new_game_true, self.__initialize_player, self.__create_hub]
@@ -51,6 +107,13 @@ class Game:
         self.__new_game = True
 
     def __clear_game_entities(self):
+        self.__command_buffer.discard()
+        self.__world_streamer.clear()
+        self.__world.get_bullet_pool().release_all()
+        for entity_list in (self.__main_entities, self.__background_entities, self.__entities_with_collision):
+            for entity in entity_list:
+                if entity is not self.__player:
+                    entity.destroy()
         self.__enemies.clear()
         self.__main_entities.clear()
         self.__background_entities.clear()
@@ -58,6 +121,8 @@ class Game:
         self.__bullets.clear()
 
     def __clear_menu_entities(self):
+        for entity in self.__menu_entities:
+            entity.destroy()
         self.__menu_entities.clear()
 
     def __create_player(self):
@@ -88,12 +153,13 @@ class Game:
         self.__player.add_component(HitBoxComponent(top_left, top_right, bottom_left, bottom_right))
         self.__player.add_component(ActiveHandComponent(player_left_active_hand, player_right_active_hand))
         self.__player.add_component(WeaponComponent([handgun, rifle, shotgun]))
-        self.__player.add_component(AnimationComponent(moving_right_images, moving_left_images))
+        self.__player.add_component(AnimationComponent(SpriteLoader.load_animation(moving_right_images), SpriteLoader.load_animation(moving_left_images)))
         self.__player.add_component(HealthComponent(player_health))
         self.__player.add_component(MovingDistanceComponent(moving_distance))
         self.__player.add_component(SightComponent())
         self.__player.add_component(CollisionComponent())
         self.__player.add_component(MoneyCollectionComponent(amount_of_money))
+        TransformHierarchy.attach_children(self.__player)
 
     def __update_player(self):
         health_component = self.__player.get_component(HealthComponent)
@@ -106,16 +172,10 @@ class Game:
         health_component.resurrect()
 
         position_component = self.__player.get_component(PositionComponent)
-        hit_box_component = self.__player.get_component(HitBoxComponent)
-        active_hand_component = self.__player.get_component(ActiveHandComponent)
-        weapon_component = self.__player.get_component(WeaponComponent)
         current_x, current_y = position_component.get_position()
         spawn_x, spawn_y = self.__dungeon_system.get_player_spawn_position()
         delta_x, delta_y = spawn_x - current_x, spawn_y - current_y
         position_component.update_position(delta_x, delta_y)
-        hit_box_component.update_coordinates(delta_x, delta_y)
-        active_hand_component.update_coordinates(delta_x, delta_y)
-        weapon_component.update_weapon_muzzle_coord(delta_x, delta_y)
 
         self.__weapon_system.reload()
 
@@ -133,7 +193,7 @@ class Game:
         portal.add_component(TypeComponent(is_player, is_character, is_bullet, is_wall, is_enemy, is_interactive_object))
         portal.add_component(PositionComponent(portal_position[0], portal_position[1]))
         portal.add_component(HitBoxComponent(portal_top_left, portal_top_right, portal_bottom_left, portal_bottom_right))
-        portal.add_component(SingeAnimationComponent(portal_animation_path, portal_size))
+        portal.add_component(SingeAnimationComponent(SpriteLoader.load_sequence(portal_animation_path, portal_size)))
         portal.add_component(ActionComponent([self.__render_system.draw_loading_screen, self.__create_dungeon]))
         portal.add_component(CollisionComponent())
         portal.add_component(AnimationConditionComponent(portal_has_animation))
@@ -164,21 +224,53 @@ class Game:
         self.__main_entities.append(weapon_column)
         self.__entities_with_collision.append(weapon_column)
 
-    def __create_dungeon(self):
+    def __create_dungeon_steps(self):
+        Tracer.begin('create_dungeon', 'loading')
+        self.__garbage_collection_policy.begin_loading()
         self.__menu_system.set_menu_condition(False)
         self.__menu_system.set_main_menu_condition(False)
         self.__clear_menu_entities()
         self.__clear_game_entities()
         self.__menu_system.create_in_game_menu()
-        self.__dungeon_system.create_dungeon()
-        self.__render_system.create_dungeon_render()
-        self.__render_system.insert_background_entities()
+        yield from self.__dungeon_system.create_dungeon_steps()
+        world_streamer = self.__world_streamer if WorldInfo.is_streaming() else None
+        Tracer.begin('insert_background_entities', 'loading')
+        self.__render_system.create_dungeon_render(world_streamer)
+        for progress in self.__render_system.insert_background_entities_steps():
+            yield 'spatial_index', progress
+        Tracer.end('insert_background_entities', 'loading')
         self.__collision_system.create_dungeon_collision()
         self.__update_player()
+        if world_streamer:
+            Tracer.begin('load_chunks', 'loading')
+            for progress in world_streamer.load_chunks_steps(self.__player.get_component(PositionComponent).get_position()):
+                yield 'chunks', progress
+            Tracer.end('load_chunks', 'loading')
         self.__main_entities.append(self.__player)
         self.__entities_with_collision.append(self.__player)
+        self.__garbage_collection_policy.end_loading()
+        Tracer.end('create_dungeon', 'loading')
+        self.__take_memory_snapshot('dungeon')
+
+    def __draw_loading_frame(self, stage: str, progress: float):
+        for event in pygame.event.get(pygame.QUIT):
+            self.__quit()
+        stages = Game.__DUNGEON_LOADING_STAGES if WorldInfo.is_streaming() else Game.__DUNGEON_LOADING_STAGES[:-1]
+        self.__render_system.draw_loading_screen((stages.index(stage) + progress) / len(stages), stage)
+
+    def __run_loading(self, loading_steps):
+        frame_start_time = time.perf_counter()
+        for stage, progress in loading_steps:
+            if time.perf_counter() - frame_start_time >= Game.__LOADING_FRAME_BUDGET:
+                self.__draw_loading_frame(stage, progress)
+                frame_start_time = time.perf_counter()
+
+    def __create_dungeon(self):
+        self.__run_loading(self.__create_dungeon_steps())
 
     def __create_hub(self):
+        Tracer.begin('create_hub', 'loading')
+        self.__garbage_collection_policy.begin_loading()
         self.__menu_system.set_menu_condition(False)
         self.__menu_system.set_main_menu_condition(False)
         self.__clear_menu_entities()
@@ -186,12 +278,21 @@ class Game:
         self.__create_hub_entities()
         self.__menu_system.create_in_game_menu()
         self.__dungeon_system.create_hub()
+        Tracer.begin('insert_background_entities', 'loading')
         self.__render_system.create_hub_render()
         self.__render_system.insert_background_entities()
+        Tracer.end('insert_background_entities', 'loading')
         self.__collision_system.create_hub_collision()
         self.__update_player()
         self.__main_entities.append(self.__player)
         self.__entities_with_collision.append(self.__player)
+        self.__garbage_collection_policy.end_loading()
+        Tracer.end('create_hub', 'loading')
+        self.__take_memory_snapshot('hub')
+
+    def __take_memory_snapshot(self, label: str):
+        if self.__memory_reporter:
+            self.__memory_reporter.take_snapshot(label, self.get_entity_collections())
 
     def __check_players_life(self):
         player_health_component = self.__player.get_component(HealthComponent)
@@ -200,66 +301,152 @@ class Game:
             self.__render_system.draw_loading_screen()
             self.__create_hub()
 
-    def __update_menu(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and not self.__menu_system.is_main_menu_active():
-                if event.key == pygame.K_ESCAPE:
-                    self.__menu_system.resume_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    self.__menu_system.check_buttons()
+    def __close_logs(self):
+        if self.__input_recorder:
+            self.__input_recorder.close()
+        if self.__state_digest_log:
+            self.__state_digest_log.close()
+        if self.__trace_path and Tracer.get_recorder():
+            Tracer.get_recorder().write(self.__trace_path)
+            Tracer.set_recorder(None)
+        if self.__memory_reporter:
+            self.__memory_reporter.close()
+            self.__memory_reporter = None
 
-    def __update_game_world(self):
-        self.__check_players_life()
-        new_bullets = []
+    def __quit(self):
+        self.__close_logs()
+        pygame.quit()
+        sys.exit()
+
+    def __read_input_frame(self) -> InputFrame:
+        if self.__input_player:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.__quit()
+            if not self.__input_player.has_next_frame():
+                self.__quit()
+            return self.__input_player.get_next_frame()
+        left_click, reload, interaction, escape = False, False, False, False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.__quit()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    self.__weapon_system.reload()
+                    reload = True
                 if event.key == pygame.K_ESCAPE:
-                    self.__menu_system.set_menu_condition(True)
-                if event.key == pygame.K_e and not self.__dungeon_system.check_dungeon_condition():
-                    self.__collision_system.check_nearby_entities_collision()
+                    escape = True
+                if event.key == pygame.K_e:
+                    interaction = True
+                if event.key == pygame.K_F3:
+                    self.__profiler.switch_overlay_condition()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
-                    self.__weapon_system.shoot()
-                    self.__bullet_system.create_bullet(self.__player, new_bullets)
+                    left_click = True
+        keys = pygame.key.get_pressed()
+        moving_keys = (keys[pygame.K_w], keys[pygame.K_s], keys[pygame.K_d], keys[pygame.K_a])
+        input_frame = InputFrame(self.__delta_time, moving_keys, pygame.mouse.get_pos(), left_click, reload, interaction, escape)
+        if self.__input_recorder:
+            self.__input_recorder.record(input_frame)
+        return input_frame
+
+    def __update_menu(self, input_frame: InputFrame):
+        left_click, reload, interaction, escape = input_frame.get_events()
+        if escape and not self.__menu_system.is_main_menu_active():
+            self.__menu_system.resume_game()
+        if left_click:
+            self.__menu_system.check_buttons(input_frame.get_mouse_position())
+
+    def __update_game_world(self, input_frame: InputFrame):
+        self.__check_players_life()
+        new_bullets = []
+        left_click, reload, interaction, escape = input_frame.get_events()
+        if reload:
+            self.__weapon_system.reload()
+        if escape:
+            self.__menu_system.set_menu_condition(True)
+        if interaction and not self.__dungeon_system.check_dungeon_condition():
+            self.__collision_system.check_nearby_entities_collision()
+        if left_click:
+            self.__weapon_system.shoot()
+            self.__bullet_system.create_bullet(self.__player, new_bullets, self.__random_generators.get_weapon_generator(), mouse_position=input_frame.get_mouse_position())
 
         scaled_time = self.__delta_time * self.__game_speed
-        self.__input_system.process_input(self.__player, scaled_time)
+        profiler = self.__profiler
+        if WorldInfo.is_streaming() and self.__dungeon_system.check_dungeon_condition():
+            profiler.begin_section('streaming')
+            self.__world_streamer.update(self.__player.get_component(PositionComponent).get_position())
+            profiler.end_section('streaming')
+        profiler.begin_section('input')
+        self.__input_system.process_input(self.__player, scaled_time, input_frame=input_frame)
+        profiler.end_section('input')
+        profiler.begin_section('enemy_management')
         self.__enemy_management_system.update_enemy_condition(new_bullets, scaled_time)
+        profiler.end_section('enemy_management')
+        profiler.begin_section('bullets')
         self.__bullet_system.insert_bullets(new_bullets)
         self.__bullet_system.update_bullet(scaled_time)
-        self.__weapon_system.update()
+        profiler.end_section('bullets')
+        profiler.begin_section('weapons')
+        self.__weapon_system.update(scaled_time)
+        profiler.end_section('weapons')
+        profiler.begin_section('collision')
         self.__collision_system.process_collision()
+        profiler.end_section('collision')
+        profiler.begin_section('entities')
         self.__entity_system.update_entities_condition()
+        profiler.end_section('entities')
         if self.__dungeon_system.check_dungeon_condition():
+            profiler.begin_section('dungeon')
             self.__dungeon_system.update_dungeon()
+            profiler.end_section('dungeon')
+        self.__command_buffer.apply()
 
-    def __update(self):
+    def __update(self, input_frame: InputFrame):
+        self.__delta_time = input_frame.get_delta_time()
         if self.__menu_system.is_menu_active():
-            self.__update_menu()
+            self.__update_menu(input_frame)
         else:
-            self.__update_game_world()
+            self.__update_game_world(input_frame)
+            if self.__state_digest_log:
+                digest = StateDigest.calculate_digest(self.__main_entities, self.__enemies, self.__bullets, self.__entities_with_collision)
+                self.__state_digest_log.write(self.__tick, digest)
+        self.__tick += 1
+
+    def __create_profiler_overlay_lines(self) -> list[(str, str)]:
+        lines = self.__profiler.get_report_lines()
+        for name, number in self.get_entity_counts().items():
+            lines.append((name, str(number)))
+        lines.append(('render quadtree nodes', str(self.__render_system.get_quadtree_nodes_number())))
+        lines.append(('collision quadtree nodes', str(self.__collision_system.get_quadtree_nodes_number())))
+        lines.append(('archetypes', str(self.__world.get_archetypes_number())))
+        lines.append(('gc collections', str(self.__garbage_collection_policy.get_collections_number())))
+        return lines
 
     def __render(self):
         scaled_time = self.__delta_time * self.__game_speed
+        self.__profiler.begin_section('render')
         if self.__menu_system.is_menu_active():
             self.__render_system.render_menu(scaled_time)
         else:
-            self.__render_system.render_game_world(self.__player, scaled_time)
+            overlay_lines = None
+            if self.__profiler.is_overlay_active():
+                overlay_lines = self.__create_profiler_overlay_lines()
+            self.__render_system.render_game_world(self.__player, scaled_time, overlay_lines)
+        self.__profiler.end_section('render')
+
+    def run_frame(self, input_frame: InputFrame):
+        self.__profiler.begin_frame()
+        self.__update(input_frame)
+        self.__render()
+        self.__profiler.end_frame()
 
     def __turn_on_main_cycle(self):
         while True:
-            self.__update()
-            self.__render()
-            self.__delta_time = self.__clock.tick(60)/1000
+            self.run_frame(self.__read_input_frame())
+            if self.__input_player:
+                self.__clock.tick()
+            else:
+                self.__delta_time = self.__clock.tick(60)/1000
 
     def __initialize_player(self):
         self.__create_player()
@@ -272,11 +459,74 @@ class Game:
         self.__upgrade_system.save_player(self.__player)
         self.__saving_system.save_player(self.__player)
 
+    def start_new_game(self):
+        self.__set_new_game_true()
+        self.__initialize_player()
+        self.__create_hub()
+
+    def enter_dungeon(self):
+        self.__create_dungeon()
+
+    def get_player(self) -> Entity:
+        return self.__player
+
+    def get_enemies(self) -> EntityCollection:
+        return self.__enemies
+
+    def get_profiler(self) -> FrameProfiler:
+        return self.__profiler
+
+    def get_dungeon_system(self) -> DungeonSystem:
+        return self.__dungeon_system
+
+    def get_world(self) -> World:
+        return self.__world
+
+    def get_bullet_system(self) -> BulletSystem:
+        return self.__bullet_system
+
+    def get_entity_collections(self) -> list[EntityCollection]:
+        return [self.__main_entities, self.__entities_with_collision, self.__bullets, self.__background_entities, self.__enemies, self.__menu_entities]
+
+    def get_entity_counts(self) -> dict[str, int]:
+        return {
+            'main_entities': len(self.__main_entities),
+            'entities_with_collision': len(self.__entities_with_collision),
+            'bullets': len(self.__bullets),
+            'background_entities': len(self.__background_entities),
+            'enemies': len(self.__enemies),
+            'live_bullets': self.__world.get_bullet_pool().get_live_number(),
+            'pooled_bullets': self.__world.get_bullet_pool().get_pooled_number(),
+            'alive_entity_ids': Entity.get_id_allocator().get_alive_number(),
+            'world_entities': self.__world.get_entities_number(),
+            'loaded_chunks': self.__world_streamer.get_loaded_chunks_number(),
+            'sleeping_enemies': self.__world_streamer.get_sleeping_enemies_number(),
+        }
+
     def run(self):
         self.__menu_system.create_main_menu()
-        self.__turn_on_main_cycle()
+        try:
+            self.__turn_on_main_cycle()
+        finally:
+            self.__close_logs()
+            self.__garbage_collection_policy.close()
 
 
 if __name__ == '__main__':
-    game = Game()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--record', default=None)
+    parser.add_argument('--replay', default=None)
+    parser.add_argument('--digest-log', default=None)
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--trace', default=None)
+    parser.add_argument('--memory-report', default=None)
+    parser.add_argument('--map-size', type=int, default=None)
+    parser.add_argument('--minimal-room-size', type=int, default=None)
+    parser.add_argument('--streaming', action='store_true')
+    parser.add_argument('--dungeon-pool', default=None)
+    arguments = parser.parse_args()
+    WorldInfo.configure(world_map_size=arguments.map_size, minimal_room_size=arguments.minimal_room_size, is_streaming=arguments.streaming)
+    game = Game(arguments.seed, arguments.record, arguments.replay, arguments.digest_log, arguments.profile, arguments.trace,
+                arguments.memory_report, arguments.dungeon_pool)
     game.run()